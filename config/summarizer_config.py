@@ -1,4 +1,4 @@
-from .base_config import MODEL_NAME, USE_LOCAL_LLM, DEFAULT_SYSTEM_PROMPT
+from .base_config import ROOT_DIR, MODEL_NAME, USE_LOCAL_LLM, DEFAULT_SYSTEM_PROMPT
 
 # 요약 템플릿
 SUMMARY_TEMPLATE = """
@@ -9,4 +9,31 @@ SUMMARY_TEMPLATE = """
 # LLM 요약 설정
 SUMMARY_MODEL_NAME = MODEL_NAME
 USE_LOCAL_LLM_FOR_SUMMARY = USE_LOCAL_LLM
-SUMMARY_SYSTEM_PROMPT = DEFAULT_SYSTEM_PROMPT 
\ No newline at end of file
+SUMMARY_SYSTEM_PROMPT = DEFAULT_SYSTEM_PROMPT 
+
+# 백엔드별 동시 요약 수 (로컬 서버는 동시 요청을 배치로 묶어 생성)
+SUMMARY_CONCURRENCY = {
+    'local': 8,
+    'openai': 4,
+}
+
+# 로컬 LLM 추론 서버 설정 (모델을 한 번만 로드하여 재사용)
+LLM_SERVER_HOST = '127.0.0.1'
+LLM_SERVER_PORT = 8765
+LLM_SERVER_AUTO_START = True  # 서버가 없으면 요약 시 자동으로 시작
+LLM_SERVER_START_TIMEOUT = 600  # 서버 시작(모델 로드) 대기 시간 (초)
+LLM_SERVER_REQUEST_TIMEOUT = 600  # 요약 요청 한 건의 응답 대기 시간 (초)
+LLM_SERVER_IDLE_TIMEOUT = 30 * 60  # 요청이 없으면 서버 종료 (초, 0이면 종료하지 않음)
+LLM_SERVER_BATCH_WAIT = 0.05  # 동시에 들어온 요청을 한 배치로 모으는 대기 시간 (초)
+LLM_MEMORY_BUDGET_MB = 0  # 배치 크기를 정하는 KV 캐시 메모리 예산 (MB, 0이면 GPU 남은 메모리의 80% / CPU 4GB)
+LLM_PREFIX_CACHE = True  # 시스템 프롬프트 부분의 KV 캐시를 한 번만 계산하여 모든 요청에 재사용
+LLM_MAX_NEW_TOKENS = 512  # 요약 최대 생성 토큰 수
+LLM_CONTEXT_TOKENS = 4096  # 모델 컨텍스트 크기 (BitNet 모델은 2048)
+SUMMARY_PROMPT_MARGIN_TOKENS = 128  # 채팅 템플릿, 조각 안내문 등을 위한 여유 토큰
+LOCAL_LLM_MODEL_NAME = 'deepseek-ai/deepseek-coder-6.7b-instruct'  # 로컬 서버가 로드할 모델
+
+# 요약 캐시 설정 (같은 입력이면 LLM을 다시 호출하지 않음)
+SUMMARY_CACHE_ENABLED = True
+SUMMARY_CACHE_DIR = ROOT_DIR / 'storage' / 'summary_cache'
+SUMMARY_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB, 넘으면 오래 쓰이지 않은 요약부터 제거
+SUMMARY_PROMPT_VERSION = 1  # 프롬프트 구성 방식을 바꾸면 올려서 이전 캐시를 무효화
@@ -6,6 +6,10 @@ STORAGE_DIR = ROOT_DIR / 'storage'
 WATCH_DIR = ROOT_DIR  # 감시할 디렉토리 (프로젝트 루트)
 BACKUP_DIR = STORAGE_DIR / 'backups'
 
+# 저장 방식 (tracker/config.py와 같게 설정)
+STORAGE_BACKEND = 'files'  # 'files': 날짜별 파일, 'sqlite': STORAGE_DIR/SQLITE_DB_NAME
+SQLITE_DB_NAME = 'tracker.db'  # SQLite 데이터베이스 파일명
+
 # 파일 필터 설정
 FILE_EXTENSIONS = ['.py', '.md']
 EXCLUDE_DIRS = ['__pycache__', '.git', 'venv', 'env', 'storage', 'logs', 'diffs']
@@ -1,11 +1,8 @@
 import sys
+import json
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-from storage.core.activity_logger import ActivityLogger
-from storage.core.diff_storage import DiffStorage
-from summarizer.core.summary_generator import main as generate_summary
-from tracker.core.diff_tracker import main as track_diff
 import config
 
 def parse_args():
@@ -29,19 +26,103 @@ def parse_args():
     # 활동 조회 명령어
     view_parser = subparsers.add_parser('view', help='활동 기록 조회')
     view_parser.add_argument('--date', help='조회할 날짜 (YYYY-MM-DD)')
+    view_parser.add_argument('--since', help='시작 시각 (YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM:SS)')
+    view_parser.add_argument('--until', help='끝 시각 (YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM:SS)')
+    view_parser.add_argument('--path', '--file', dest='path', help='파일 경로 접두')
+    view_parser.add_argument('--type', dest='activity_type', help='활동 유형 (예: file_modified)')
+    view_parser.add_argument('--repo', help='저장소 이름 또는 경로')
+    view_parser.add_argument('--limit', type=int, help='최대 출력 수')
+    view_parser.add_argument('--page-size', type=int, help='한 페이지만 출력하고 다음 페이지 커서 표시')
+    view_parser.add_argument('--cursor', help='이전 페이지가 출력한 커서')
+    view_parser.add_argument('--json', action='store_true', help='JSON Lines로 출력')
+    view_parser.add_argument('--storage-dir', help='저장소 디렉토리 (기본값: 설정의 STORAGE_DIR)')
 
     return parser.parse_args()
 
+def _parse_time(value, end_of_day=False):
+    """YYYY-MM-DD 또는 ISO 시각을 datetime으로 변환합니다. (날짜만 있으면 하루의 시작/끝)"""
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1, microseconds=-1)
+    return parsed
+
+def _format_activity(activity):
+    """활동 기록 한 줄 표시"""
+    data = activity.get('data') or {}
+    line = f"{activity.get('timestamp', '')[:19]}  {activity.get('type', ''):<16} {data.get('file_path', '')}"
+    summary = data.get('diff_summary')
+    if summary:
+        line += f"  (+{summary.get('added_lines', 0)} -{summary.get('removed_lines', 0)})"
+    return line
+
+def view_command(args):
+    """활동 기록 조회 명령어 처리"""
+    # tracker 모듈은 tracker 디렉토리를 기준으로 import함
+    sys.path.insert(0, str(Path(__file__).parent / 'tracker'))
+    from core.activity_query import ActivityQuery, ActivityFilter
+
+    since = _parse_time(args.since) if args.since else None
+    until = _parse_time(args.until, end_of_day=True) if args.until else None
+    if args.date:
+        since = _parse_time(args.date)
+        until = _parse_time(args.date, end_of_day=True)
+
+    storage_dir = Path(args.storage_dir) if args.storage_dir else config.tracker_config.STORAGE_DIR
+    query = ActivityFilter(since=since, until=until, path_prefix=args.path,
+                           activity_type=args.activity_type, repo=args.repo)
+
+    # 저장소 방식에 따라 활동을 기록한 곳이 다름
+    storage = None
+    if config.tracker_config.STORAGE_BACKEND == 'sqlite':
+        from core.sqlite_storage import SQLiteStorage
+        db_path = storage_dir / config.tracker_config.SQLITE_DB_NAME
+        if not db_path.exists():
+            print(f"⚠️ 활동 데이터베이스가 없습니다: {db_path}", file=sys.stderr)
+            return
+        storage = SQLiteStorage(db_path, flush_interval=0)
+        search, page = storage.query_activities, storage.page_activities
+    else:
+        engine = ActivityQuery(storage_dir / 'activities')
+        search, page = engine.search, engine.page
+
+    def emit(activity):
+        print(json.dumps(activity, ensure_ascii=False) if args.json else _format_activity(activity), flush=True)
+
+    try:
+        if args.page_size:
+            activities, next_cursor = page(query, args.page_size, args.cursor)
+            for activity in activities:
+                emit(activity)
+            if next_cursor:
+                print(f"\n다음 페이지: --cursor '{next_cursor}'", file=sys.stderr)
+            return
+
+        count = 0
+        for activity in search(query):
+            if args.limit is not None and count >= args.limit:
+                break
+            emit(activity)
+            count += 1
+        if not count:
+            print("조회된 활동이 없습니다.", file=sys.stderr)
+    finally:
+        if storage is not None:
+            storage.close()
+
 def main():
     args = parse_args()
-    
+
     if args.command == 'summarize':
+        from summarizer.core.summary_generator import main as generate_summary
         date = args.date
         if args.today:
             date = datetime.now().strftime('%Y-%m-%d')
         generate_summary(date, args.system_prompt)
     elif args.command == 'track':
+        from tracker.core.diff_tracker import main as track_diff
         track_diff()
+    elif args.command == 'view':
+        view_command(args)
     # 다른 명령어들에 대한 처리 추가 예정
 
 if __name__ == "__main__":
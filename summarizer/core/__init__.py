@@ -7,6 +7,6 @@
 
 from .summary_generator import main as generate_summary
 from .diff_merger import DiffMerger
-from .llm_inference import call_llm_for_summary
+from .llm_inference import call_llm_for_summary, call_llm_for_summaries
 
-__all__ = ['generate_summary', 'DiffMerger', 'call_llm_for_summary'] 
\ No newline at end of file
+__all__ = ['generate_summary', 'DiffMerger', 'call_llm_for_summary', 'call_llm_for_summaries'] 
\ No newline at end of file
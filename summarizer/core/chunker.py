@@ -0,0 +1,221 @@
+"""diff 분할 관련 모듈
+
+모델 컨텍스트에 들어가지 않는 큰 diff를 토큰 예산에 맞게 나눕니다.
+파일/hunk 경계에서 먼저 나누고, 그래도 큰 hunk만 줄 단위로 나눕니다.
+"""
+
+import re
+import threading
+from typing import List, Optional
+
+# 파일 헤더 시작 줄 (git diff / unified diff)
+FILE_HEADER_PATTERN = re.compile(r"^(diff --git |--- |\+\+\+ |index |new file mode |deleted file mode )")
+HUNK_HEADER_PATTERN = re.compile(r"^@@ ")
+
+# 토크나이저를 쓸 수 없을 때의 추정치 (코드 기준 토큰당 약 3바이트)
+BYTES_PER_TOKEN_ESTIMATE = 3
+
+
+class TokenCounter:
+    """
+    토큰 수 계산기
+    - 모델 토크나이저가 로컬에 있으면 사용 (모델 가중치는 로드하지 않음)
+    - 없으면 UTF-8 바이트 수로 추정
+    """
+
+    def __init__(self, model_name: str):
+        """
+        Args:
+            model_name: 토크나이저를 불러올 모델 이름
+        """
+        self.model_name = model_name
+        self._tokenizer = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _get_tokenizer(self):
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                try:
+                    from transformers import AutoTokenizer
+                    self._tokenizer = AutoTokenizer.from_pretrained(
+                        self.model_name, trust_remote_code=True, local_files_only=True
+                    )
+                except Exception as e:
+                    print(f"⚠️ 토크나이저를 불러올 수 없어 토큰 수를 추정합니다: {self.model_name} ({e})")
+            return self._tokenizer
+
+    def count(self, text: str) -> int:
+        """
+        텍스트의 토큰 수를 반환합니다.
+
+        Args:
+            text: 텍스트
+
+        Returns:
+            int: 토큰 수
+        """
+        tokenizer = self._get_tokenizer()
+        if tokenizer is not None:
+            return len(tokenizer.encode(text, add_special_tokens=False))
+        return -(-len(text.encode('utf-8')) // BYTES_PER_TOKEN_ESTIMATE)
+
+    def fits(self, text: str, budget: int) -> bool:
+        """
+        텍스트가 토큰 예산 안에 들어가는지 확인합니다.
+        (바이트 단위 BPE 토큰은 1바이트 이상이므로 바이트 수가 예산 이하면 토크나이저 없이 통과)
+
+        Args:
+            text: 텍스트
+            budget: 토큰 예산
+
+        Returns:
+            bool: 예산 이내 여부
+        """
+        if len(text.encode('utf-8')) <= budget:
+            return True
+        return self.count(text) <= budget
+
+
+class DiffChunker:
+    """토큰 예산에 맞게 diff를 나누는 분할기"""
+
+    def __init__(self, counter: TokenCounter, budget: int):
+        """
+        Args:
+            counter: 토큰 수 계산기
+            budget: 조각 하나의 최대 토큰 수
+        """
+        self.counter = counter
+        self.budget = max(16, budget)
+
+    def split(self, diff_text: str) -> List[str]:
+        """
+        diff를 예산 이하의 조각으로 나눕니다. (순서 유지)
+
+        Args:
+            diff_text: diff 내용
+
+        Returns:
+            List[str]: 조각 목록 (이어진 조각에는 파일 헤더를 반복)
+        """
+        pieces = []
+        for header, hunks in self._parse(diff_text):
+            for hunk in hunks:
+                pieces.extend(self._fit_hunk(header, hunk))
+        return self._pack(pieces)
+
+    def pack_texts(self, texts: List[str], separator: str = "\n\n") -> List[List[int]]:
+        """
+        텍스트들을 순서대로 예산 이하의 묶음으로 나눕니다.
+
+        Args:
+            texts: 텍스트 목록
+            separator: 묶을 때 사이에 넣을 구분자
+
+        Returns:
+            List[List[int]]: 묶음별 텍스트 인덱스
+        """
+        separator_tokens = self.counter.count(separator)
+        groups: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for index, text in enumerate(texts):
+            tokens = self.counter.count(text) + separator_tokens
+            if current and used + tokens > self.budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append(index)
+            used += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    # ------------------------------------------------------------------
+    # 파싱
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _parse(diff_text: str):
+        """diff를 (파일 헤더 줄 목록, [hunk 줄 목록]) 목록으로 나눕니다. (헤더가 없는 diff는 hunk 하나)"""
+        lines = diff_text.splitlines()
+        files = []
+        header: List[str] = []
+        hunks: List[List[str]] = []
+        index = 0
+        while index < len(lines):
+            line = lines[index]
+            # '--- '는 다음 줄이 '+++ '일 때만 파일 시작으로 봄 (삭제된 '-- ...' 줄과 구분)
+            is_unified_start = line.startswith('--- ') and index + 1 < len(lines) and lines[index + 1].startswith('+++ ')
+            starts_file = line.startswith('diff --git ') or is_unified_start
+            if starts_file and hunks:
+                files.append((header, hunks))
+                header, hunks = [], []
+            if not hunks and (starts_file or (header and FILE_HEADER_PATTERN.match(line))):
+                header.append(line)
+                if is_unified_start:
+                    header.append(lines[index + 1])
+                    index += 1
+            elif HUNK_HEADER_PATTERN.match(line) or not hunks:
+                hunks.append([line])
+            else:
+                hunks[-1].append(line)
+            index += 1
+        if header or hunks:
+            files.append((header, hunks or [[]]))
+        return files
+
+    # ------------------------------------------------------------------
+    # 예산 맞추기
+    # ------------------------------------------------------------------
+    def _fit_hunk(self, header: List[str], hunk: List[str]) -> List[str]:
+        """hunk 하나를 예산 이하의 조각들로 만듭니다. (헤더 포함)"""
+        text = "\n".join(header + hunk)
+        if self.counter.fits(text, self.budget):
+            return [text]
+
+        header_text = "\n".join(header)
+        line_budget = self.budget - (self.counter.count(header_text) if header else 0)
+        if line_budget < self.budget // 2:
+            # 헤더가 너무 길면 반복하지 않음
+            header, line_budget = [], self.budget
+
+        pieces = []
+        current: List[str] = []
+        used = 0
+        for line in hunk:
+            for part in self._split_long_line(line, line_budget):
+                tokens = self.counter.count(part) + 1
+                if current and used + tokens > line_budget:
+                    pieces.append("\n".join(header + current))
+                    current, used = [], 0
+                current.append(part)
+                used += tokens
+        if current:
+            pieces.append("\n".join(header + current))
+        return pieces
+
+    def _split_long_line(self, line: str, budget: int) -> List[str]:
+        """한 줄이 예산보다 크면 글자 수 기준으로 자릅니다."""
+        if self.counter.fits(line, budget):
+            return [line]
+        tokens = self.counter.count(line)
+        step = max(1, int(len(line) * budget / tokens * 0.9))
+        return [line[i:i + step] for i in range(0, len(line), step)]
+
+    def _pack(self, pieces: List[str]) -> List[str]:
+        """작은 조각들을 예산 안에서 이어 붙입니다."""
+        return ["\n".join(pieces[i] for i in group) for group in self.pack_texts(pieces, separator="\n")]
+
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(model_name: str) -> TokenCounter:
+    """모델별 토큰 수 계산기를 반환합니다. (프로세스에서 한 번만 생성)"""
+    with _counters_lock:
+        counter: Optional[TokenCounter] = _counters.get(model_name)
+        if counter is None:
+            counter = _counters[model_name] = TokenCounter(model_name)
+        return counter
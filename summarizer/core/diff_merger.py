@@ -28,6 +28,17 @@ class DiffMerger:
                 removed.add(line[1:].strip())
         return added, removed
 
+    def find_source_path(self, diff_content):
+        """diff 헤더(+++ / ---)에서 원본 파일 경로를 찾습니다. (없으면 None)"""
+        for line in diff_content.splitlines():
+            if line.startswith('+++ ') or line.startswith('--- '):
+                path = line[4:].strip()
+                if path and path != '/dev/null':
+                    return path
+            elif line.startswith('@@') or line.startswith('+') or line.startswith('-'):
+                break
+        return None
+
     def should_regenerate_final(self, file_key, filenames):
         """final 파일을 재생성해야 하는지 확인"""
         final_path = os.path.join(self.diff_dir, f"{file_key}_final.diff")
@@ -66,19 +77,24 @@ class DiffMerger:
 
             all_added = set()
             all_removed = set()
+            source_path = None
 
             for filename in sorted(filenames):
                 file_path = os.path.join(self.diff_dir, filename)
                 with open(file_path, 'r', encoding='utf-8') as f:
                     diff_content = f.read()
+                source_path = source_path or self.find_source_path(diff_content)
                 added, removed = self.parse_diff_content(diff_content)
                 all_added.update(added)
                 all_removed.update(removed)
 
-            # 최종 결과 만들기
+            # 최종 결과 만들기 (원본 경로를 알면 헤더로 남겨 요약을 디렉토리별로 묶을 수 있게 함)
             merged_diff_lines = []
 
             if self.remove_duplicates:
+                if source_path:
+                    merged_diff_lines.append(f"--- {source_path}")
+                    merged_diff_lines.append(f"+++ {source_path}")
                 # 중복 제거해서 저장
                 for line in sorted(all_added):
                     merged_diff_lines.append(f"+{line}")
@@ -1,19 +1,258 @@
-"""LLM 추론 관련 모듈"""
+"""LLM 추론 관련 모듈
 
+모델을 한 번만 로드하는 로컬 추론 서버(model/deepkseek/server.py)에 요청합니다.
+서버가 실행 중이 아니면 자동으로 시작하고, 모델 로드가 끝날 때까지 기다립니다.
+같은 입력의 요약은 요약 캐시에서 바로 반환합니다. (서버를 시작하지 않음)
+"""
+
+import json
 import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
 from pathlib import Path
+from typing import Dict, List, Optional
+from config import (
+    LOG_DIR,
+    LLM_SERVER_HOST,
+    LLM_SERVER_PORT,
+    LLM_SERVER_AUTO_START,
+    LLM_SERVER_START_TIMEOUT,
+    LLM_SERVER_REQUEST_TIMEOUT,
+    LLM_SERVER_IDLE_TIMEOUT,
+    LLM_SERVER_BATCH_WAIT,
+    LLM_MEMORY_BUDGET_MB,
+    LLM_PREFIX_CACHE,
+    LLM_MAX_NEW_TOKENS,
+    LOCAL_LLM_MODEL_NAME,
+    SUMMARY_CACHE_ENABLED,
+    SUMMARY_CACHE_DIR,
+    SUMMARY_CACHE_MAX_BYTES,
+    SUMMARY_PROMPT_VERSION,
+)
+from summarizer.utils.summary_cache import SummaryCache
 
-def call_llm_for_summary(prompt: str, system_prompt: str) -> str:
-    """로컬 LLM을 호출하여 요약을 생성합니다."""
-    inference_script = Path(__file__).parent.parent / "model" / "deepkseek" / "inference.py"
+SERVER_SCRIPT = Path(__file__).parent.parent / "model" / "deepkseek" / "server.py"
+SERVER_URL = f"http://{LLM_SERVER_HOST}:{LLM_SERVER_PORT}"
+
+SUMMARY_FAILED = "요약 생성 실패"
+
+_start_lock = threading.Lock()
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """요약 캐시를 반환합니다. (사용하지 않도록 설정했으면 None)"""
+    global _summary_cache
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+    if _summary_cache is None:
+        _summary_cache = SummaryCache(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_BYTES)
+    return _summary_cache
+
+
+def _cache_key(prompt: str, system_prompt: Optional[str], **extra) -> str:
+    """요약 결과에 영향을 주는 모든 값으로 캐시 키를 만듭니다."""
+    return SummaryCache.make_key(
+        prompt, system_prompt,
+        model=LOCAL_LLM_MODEL_NAME,
+        prompt_version=SUMMARY_PROMPT_VERSION,
+        max_new_tokens=LLM_MAX_NEW_TOKENS,
+        do_sample=False,
+        **extra
+    )
+
+
+def lookup_summary(prompt: str, system_prompt: Optional[str], **extra) -> Optional[str]:
+    """
+    여러 번의 LLM 호출로 만든 요약(조각 요약 후 합치기 등)을 캐시에서 찾습니다.
+
+    Args:
+        prompt: 원래 입력
+        system_prompt: 시스템 프롬프트
+        **extra: 요약 방식을 구분하는 값
+
+    Returns:
+        Optional[str]: 캐시된 요약 (없으면 None)
+    """
+    cache = get_summary_cache()
+    return cache.get(_cache_key(prompt, system_prompt, **extra)) if cache else None
+
+
+def store_summary(prompt: str, system_prompt: Optional[str], summary: str, **extra):
+    """lookup_summary()로 찾을 수 있도록 요약을 캐시에 저장합니다. (실패한 요약은 저장하지 않음)"""
+    cache = get_summary_cache()
+    if cache and summary != SUMMARY_FAILED:
+        cache.put(_cache_key(prompt, system_prompt, **extra), summary)
+
+
+def check_server_health(timeout: float = 2.0) -> Optional[Dict]:
+    """
+    추론 서버 상태를 확인합니다.
+
+    Args:
+        timeout: 응답 대기 시간 (초)
+
+    Returns:
+        Optional[Dict]: 서버 상태 ('status': 'loading' / 'ready' / 'failed'), 응답이 없으면 None
+    """
+    try:
+        with urllib.request.urlopen(f"{SERVER_URL}/health", timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+def _start_server() -> subprocess.Popen:
+    """추론 서버를 백그라운드 프로세스로 시작합니다. (요약이 끝나도 계속 실행)"""
+    log_path = LOG_DIR / "llm_server.log"
+    log_file = open(log_path, 'ab')
     command = [
-        "python", str(inference_script),
-        "--system-prompt", system_prompt,
-        "--user-prompt", prompt,
+        sys.executable, str(SERVER_SCRIPT),
+        "--host", LLM_SERVER_HOST,
+        "--port", str(LLM_SERVER_PORT),
+        "--model", LOCAL_LLM_MODEL_NAME,
+        "--idle-timeout", str(LLM_SERVER_IDLE_TIMEOUT),
+        "--batch-wait", str(LLM_SERVER_BATCH_WAIT),
+        "--memory-budget-mb", str(LLM_MEMORY_BUDGET_MB),
     ]
+    if not LLM_PREFIX_CACHE:
+        command.append("--no-prefix-cache")
+    print(f"🚀 로컬 LLM 서버 시작 중... (로그: {log_path})")
+    kwargs = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+    else:
+        kwargs['start_new_session'] = True
+    try:
+        return subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT,
+                                stdin=subprocess.DEVNULL, **kwargs)
+    finally:
+        log_file.close()
+
+
+def ensure_server() -> bool:
+    """
+    추론 서버가 요청을 받을 수 있는 상태인지 확인하고, 필요하면 시작합니다.
+
+    Returns:
+        bool: 서버 준비 여부
+    """
+    health = check_server_health()
+    if health and health.get('status') == 'ready':
+        return True
+
+    # 여러 스레드가 동시에 서버를 띄우지 않도록 한 스레드만 시작
+    with _start_lock:
+        health = check_server_health()
+        if health and health.get('status') == 'ready':
+            return True
+
+        process = None
+        if health is None:
+            if not LLM_SERVER_AUTO_START:
+                print(f"⚠️ 로컬 LLM 서버가 실행 중이 아닙니다: {SERVER_URL}")
+                return False
+            process = _start_server()
+
+        deadline = time.monotonic() + LLM_SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            health = check_server_health()
+            if health:
+                if health.get('status') == 'ready':
+                    print(f"✅ 로컬 LLM 서버 준비 완료 (pid {health.get('pid')})")
+                    return True
+                if health.get('status') == 'failed':
+                    print(f"⚠️ 로컬 LLM 서버 모델 로드 실패: {health.get('error')}")
+                    return False
+            elif process is not None and process.poll() is not None:
+                # 다른 프로세스가 먼저 포트를 잡았다면 그 서버를 계속 기다림
+                returncode = process.returncode
+                process = None
+                if check_server_health() is None:
+                    print(f"⚠️ 로컬 LLM 서버가 종료되었습니다. (종료 코드 {returncode})")
+                    return False
+            time.sleep(1.0)
+
+        print(f"⚠️ 로컬 LLM 서버 시작 시간이 초과되었습니다: {LLM_SERVER_START_TIMEOUT}초")
+        return False
+
+
+def _post(path: str, payload: Dict) -> Optional[Dict]:
+    """추론 서버에 요청을 보내고 응답을 반환합니다. (실패하면 None)"""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    request = urllib.request.Request(
+        f"{SERVER_URL}{path}",
+        data=body,
+        headers={'Content-Type': 'application/json; charset=utf-8'},
+        method='POST'
+    )
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️ 로컬 모델 호출 실패: {e.stderr}")
-        return "요약 생성 실패" 
\ No newline at end of file
+        with urllib.request.urlopen(request, timeout=LLM_SERVER_REQUEST_TIMEOUT) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        print(f"⚠️ 로컬 모델 호출 실패: {e.code} {e.read().decode('utf-8', 'replace')}")
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"⚠️ 로컬 모델 호출 실패: {e}")
+    return None
+
+
+def call_llm_for_summary(prompt: str, system_prompt: str) -> str:
+    """로컬 LLM을 호출하여 요약을 생성합니다. (캐시에 있으면 캐시 사용)"""
+    cache = get_summary_cache()
+    key = _cache_key(prompt, system_prompt) if cache else None
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if not ensure_server():
+        return SUMMARY_FAILED
+    response = _post("/summarize", {
+        'prompt': prompt,
+        'system_prompt': system_prompt,
+        'max_new_tokens': LLM_MAX_NEW_TOKENS,
+    })
+    if not response or 'summary' not in response:
+        return SUMMARY_FAILED
+    summary = response['summary'].strip()
+    if cache:
+        cache.put(key, summary)
+    return summary
+
+
+def call_llm_for_summaries(prompts: List[str], system_prompt: str) -> List[str]:
+    """
+    여러 프롬프트를 한 번에 요청합니다. 서버가 길이별 배치로 묶어 생성합니다.
+
+    Args:
+        prompts: 프롬프트 목록
+        system_prompt: 공통 시스템 프롬프트
+
+    Returns:
+        List[str]: 프롬프트 순서와 같은 순서의 요약 목록
+    """
+    cache = get_summary_cache()
+    keys = [_cache_key(prompt, system_prompt) for prompt in prompts] if cache else []
+    results: List[Optional[str]] = [cache.get(key) for key in keys] if cache else [None] * len(prompts)
+    missing = [index for index, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+    if not ensure_server():
+        return [SUMMARY_FAILED if result is None else result for result in results]
+
+    response = _post("/summarize_batch", {
+        'prompts': [prompts[index] for index in missing],
+        'system_prompt': system_prompt,
+        'max_new_tokens': LLM_MAX_NEW_TOKENS,
+    })
+    summaries = (response or {}).get('summaries') or []
+    if len(summaries) != len(missing):
+        return [SUMMARY_FAILED if result is None else result for result in results]
+    for index, summary in zip(missing, summaries):
+        results[index] = summary.strip()
+        if cache:
+            cache.put(keys[index], results[index])
+    return results
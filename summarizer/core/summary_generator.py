@@ -1,59 +1,248 @@
 """요약 생성 모듈"""
 
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional, Tuple
 from summarizer.core.diff_merger import DiffMerger
+from summarizer.core.chunker import DiffChunker, get_token_counter
 from summarizer.utils.prompt_loader import load_prompt
 from summarizer.utils.date_utils import resolve_date
 from summarizer.utils.file_utils import validate_storage_dirs
-from summarizer.llm.inference import call_llm_for_summary
-from config import STORAGE_DIR, DEFAULT_SYSTEM_PROMPT
+from summarizer.core.llm_inference import (
+    call_llm_for_summary, call_llm_for_summaries, get_summary_cache,
+    lookup_summary, store_summary, SUMMARY_FAILED,
+)
+from config import (
+    STORAGE_DIR, DEFAULT_SYSTEM_PROMPT, USE_LOCAL_LLM_FOR_SUMMARY, SUMMARY_CONCURRENCY,
+    LOCAL_LLM_MODEL_NAME, LLM_CONTEXT_TOKENS, LLM_MAX_NEW_TOKENS, SUMMARY_PROMPT_MARGIN_TOKENS,
+)
 
 def merge_diffs_for_date(target_dir: Path):
     """해당 날짜의 diff 파일들을 병합합니다."""
     print(f"🔍 diff 디렉토리: {target_dir}")
     merger = DiffMerger(diff_dir=str(target_dir))
     merger.run()
-    final_diffs = list(target_dir.glob("*_final.diff"))
+    # 요약 목록 순서가 실행마다 같도록 파일명 순으로 정렬
+    final_diffs = sorted(target_dir.glob("*_final.diff"))
     if not final_diffs:
         print("⚠️ 통합된 diff 파일이 없습니다.")
         sys.exit(0)
     print(f"🔍 발견된 통합 diff 파일 수: {len(final_diffs)}")
     return final_diffs
 
+def get_summary_workers() -> int:
+    """사용 중인 LLM 백엔드의 동시 요약 수를 반환합니다."""
+    backend = 'local' if USE_LOCAL_LLM_FOR_SUMMARY else 'openai'
+    return max(1, SUMMARY_CONCURRENCY.get(backend, 1))
+
+@lru_cache(maxsize=8)
+def get_prompt_budget(system_prompt: str) -> int:
+    """시스템 프롬프트와 생성 토큰을 뺀, 프롬프트 하나에 쓸 수 있는 토큰 수를 반환합니다."""
+    counter = get_token_counter(LOCAL_LLM_MODEL_NAME)
+    system_tokens = counter.count(system_prompt) if system_prompt else 0
+    return LLM_CONTEXT_TOKENS - LLM_MAX_NEW_TOKENS - system_tokens - SUMMARY_PROMPT_MARGIN_TOKENS
+
+def reduce_partial_summaries(partials: List[str], system_prompt: str, label: str) -> str:
+    """
+    부분 요약들을 예산 크기 묶음으로 합쳐 요약하기를 하나가 남을 때까지 반복합니다.
+
+    Args:
+        partials: 부분 요약 목록 (순서대로)
+        system_prompt: 시스템 프롬프트
+        label: 요약 대상 이름 (파일명 등)
+
+    Returns:
+        str: 전체 요약
+    """
+    counter = get_token_counter(LOCAL_LLM_MODEL_NAME)
+    reduce_prompt = load_prompt("chunk_reduce") + f"\n대상: {label}\n"
+    chunker = DiffChunker(counter, get_prompt_budget(system_prompt) - counter.count(reduce_prompt))
+    while True:
+        groups = chunker.pack_texts(partials)
+        if len(groups) > 1 and len(groups) == len(partials):
+            # 요약 하나가 예산을 다 쓰더라도 단계마다 개수가 줄도록 두 개씩 묶음
+            groups = [list(range(i, min(i + 2, len(partials)))) for i in range(0, len(partials), 2)]
+        prompts = [
+            reduce_prompt + "".join(f"\n### 부분 {i + 1}\n{partials[i]}\n" for i in group)
+            for group in groups
+        ]
+        if len(prompts) == 1:
+            return call_llm_for_summary(prompts[0], system_prompt)
+        partials = [p for p in call_llm_for_summaries(prompts, system_prompt) if p != SUMMARY_FAILED]
+        if not partials:
+            return SUMMARY_FAILED
+
+def summarize_text(text: str, system_prompt: str, label: str) -> str:
+    """
+    텍스트를 요약합니다. 컨텍스트에 들어가지 않으면 조각으로 나누어 요약한 뒤 합칩니다. (map-reduce)
+
+    Args:
+        text: 요약할 내용 (diff 등)
+        system_prompt: 시스템 프롬프트
+        label: 요약 대상 이름 (파일명 등)
+
+    Returns:
+        str: 요약
+    """
+    # 토큰 수는 바이트 수 이하이므로, 바이트 수로도 들어가면 토크나이저 없이 바로 요약
+    min_budget = LLM_CONTEXT_TOKENS - LLM_MAX_NEW_TOKENS - SUMMARY_PROMPT_MARGIN_TOKENS - len((system_prompt or '').encode('utf-8'))
+    if len(text.encode('utf-8')) <= min_budget:
+        return call_llm_for_summary(text, system_prompt)
+    # 나누어 요약한 결과는 원래 입력 전체를 키로 캐시 (다시 실행할 때 분할하지 않음)
+    cache_params = {'mode': 'map_reduce', 'context_tokens': LLM_CONTEXT_TOKENS}
+    cached = lookup_summary(text, system_prompt, **cache_params)
+    if cached is not None:
+        return cached
+
+    counter = get_token_counter(LOCAL_LLM_MODEL_NAME)
+    budget = get_prompt_budget(system_prompt)
+    if counter.fits(text, budget):
+        return call_llm_for_summary(text, system_prompt)
+
+    chunks = DiffChunker(counter, budget).split(text)
+    print(f"✂️ {label}: 컨텍스트를 넘어 {len(chunks)}개 조각으로 나누어 요약합니다.")
+    prompts = [
+        f"다음은 {label} 변경사항의 일부입니다. ({index}/{len(chunks)})\n\n{chunk}"
+        for index, chunk in enumerate(chunks, start=1)
+    ]
+    # 조각들은 한 번에 요청하여 서버가 배치로 생성
+    partials = [p for p in call_llm_for_summaries(prompts, system_prompt) if p != SUMMARY_FAILED]
+    if not partials:
+        return SUMMARY_FAILED
+    summary = partials[0] if len(partials) == 1 else reduce_partial_summaries(partials, system_prompt, label)
+    store_summary(text, system_prompt, summary, **cache_params)
+    return summary
+
+def summarize_diff(final_diff: Path, system_prompt: str, target_date: str):
+    """diff 파일 하나를 요약하고 바로 저장합니다."""
+    with open(final_diff, 'r', encoding='utf-8') as f:
+        diff_content = f.read()
+    summary_filename = final_diff.stem.replace('_final', '')
+    summary = summarize_text(diff_content, system_prompt, summary_filename)
+    source_path = DiffMerger(diff_dir=str(final_diff.parent)).find_source_path(diff_content)
+
+    summary_path = STORAGE_DIR / target_date / 'summaries' / f'{summary_filename}.md'
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write(f"# Summary - {summary_filename}\n\n")
+        f.write(summary)
+    return summary_filename, summary, summary_path, source_path
+
 def summarize_each_diff(final_diffs, system_prompt, target_date):
-    """각 diff 파일을 요약합니다."""
-    summaries = []
+    """각 diff 파일을 동시에 요약합니다. (반환 순서는 final_diffs 순서와 같음)"""
     system_prompt = system_prompt or load_prompt("system_summary")
-    
-    for final_diff in final_diffs:
-        print(f"📝 처리 중인 파일: {final_diff.name}")
-        with open(final_diff, 'r', encoding='utf-8') as f:
-            diff_content = f.read()
-        summary = call_llm_for_summary(diff_content, system_prompt)
-
-        summary_filename = final_diff.stem.replace('_final', '')
-        summary_path = STORAGE_DIR / target_date / 'summaries' / f'{summary_filename}.md'
-        summary_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Summary - {summary_filename}\n\n")
-            f.write(summary)
-
-        summaries.append((summary_filename, summary))
-        print(f"✅ 요약이 저장되었습니다: {summary_path}")
+    summaries = [None] * len(final_diffs)
+    workers = min(get_summary_workers(), len(final_diffs)) or 1
+    print(f"📝 {len(final_diffs)}개 파일 요약 중... (동시 {workers}개)")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(summarize_diff, final_diff, system_prompt, target_date): index
+            for index, final_diff in enumerate(final_diffs)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                summary_filename, summary, summary_path, source_path = future.result()
+            except Exception as e:
+                summary_filename = final_diffs[index].stem.replace('_final', '')
+                summary, source_path = SUMMARY_FAILED, None
+                print(f"⚠️ 요약 실패: {final_diffs[index].name} ({e})")
+            else:
+                print(f"✅ 요약이 저장되었습니다: {summary_path}")
+            summaries[index] = (summary_filename, summary, source_path)
     return summaries
 
-def generate_overall_summary(summaries, target_date, system_prompt):
-    """전체 요약을 생성합니다."""
+def render_summaries(entries) -> str:
+    """(이름, 요약) 목록을 프롬프트에 넣을 형식으로 만듭니다."""
     combined = ""
-    for name, content in summaries:
+    for name, content in entries:
         combined += f"\n\n## {name}\n\n{content}"
+    return combined
+
+def split_dirs(source_path: Optional[str]) -> Tuple[str, ...]:
+    """원본 경로의 디렉토리 부분을 나눕니다. (경로를 모르면 빈 튜플)"""
+    if not source_path:
+        return ()
+    parts = [part for part in re.split(r"[\\/]+", source_path) if part]
+    return tuple(parts[:-1])
 
+def generate_overall_summary(summaries, target_date, system_prompt):
+    """
+    전체 요약을 생성합니다.
+    모든 요약이 한 프롬프트에 들어가면 바로 총평을 만들고, 넘치면 디렉토리 트리를 따라
+    아래에서부터 묶음별로 요약하여 올라갑니다. (중간 요약은 요약 캐시에 저장됨)
+    """
     total_prompt = load_prompt("total_summary")
-    total_prompt += f"\n\n{combined}"  # 프롬프트 내용 뒤에 combined 추가
-    
-    return call_llm_for_summary(total_prompt, system_prompt)
+    counter = get_token_counter(LOCAL_LLM_MODEL_NAME)
+    budget = get_prompt_budget(system_prompt)
+
+    # 항목: [디렉토리 경로, 이름, 요약] (모든 경로에 공통인 앞부분은 제거)
+    entries = [[split_dirs(source_path), name, content]
+               for name, content, source_path in summaries if content != SUMMARY_FAILED]
+    if not entries:
+        return SUMMARY_FAILED
+    known = [dirs for dirs, _, _ in entries if dirs]
+    common = known[0] if known else ()
+    for dirs in known[1:]:
+        length = 0
+        while length < min(len(common), len(dirs)) and common[length] == dirs[length]:
+            length += 1
+        common = common[:length]
+    for entry in entries:
+        if entry[0][:len(common)] == common:
+            entry[0] = entry[0][len(common):]
+
+    group_prompt = load_prompt("group_summary")
+    chunker = DiffChunker(counter, budget - counter.count(group_prompt) - 32)
+    level = 0
+    while True:
+        prompt = total_prompt + f"\n\n{render_summaries((name, content) for _, name, content in entries)}"
+        if counter.fits(prompt, budget):
+            if level:
+                print(f"🌲 {level}단계로 묶어 요약한 뒤 전체 총평을 생성합니다.")
+            return call_llm_for_summary(prompt, system_prompt)
+
+        depth = max(len(dirs) for dirs, _, _ in entries)
+        if depth == 0 and len(entries) == 1:
+            # 더 묶을 것이 없으면 남은 요약으로 총평 생성
+            return call_llm_for_summary(prompt, system_prompt)
+        level += 1
+        groups = {}
+        for entry in entries:
+            # 가장 깊은 디렉토리의 항목만 묶어서 한 단계 위로 올림
+            key = entry[0] if len(entry[0]) == depth else None
+            groups.setdefault(key, []).append(entry)
+
+        next_entries = list(groups.pop(None, []))
+        prompts, targets = [], []
+        for dirs, members in groups.items():
+            label = "/".join(dirs) or "(전체)"
+            parent = dirs[:-1]
+            if len(members) == 1 and depth > 0:
+                next_entries.append([parent, members[0][1], members[0][2]])
+                continue
+            batches = chunker.pack_texts([render_summaries([(name, content)]) for _, name, content in members])
+            if len(batches) == len(members) and len(members) > 1:
+                # 요약 하나가 예산을 다 쓰더라도 개수가 줄도록 두 개씩 묶음
+                batches = [list(range(i, min(i + 2, len(members)))) for i in range(0, len(members), 2)]
+            for number, batch in enumerate(batches, start=1):
+                name = label if len(batches) == 1 else f"{label} ({number}/{len(batches)})"
+                prompts.append(group_prompt + f"\n디렉토리: {label}\n" +
+                               render_summaries((members[i][1], members[i][2]) for i in batch))
+                targets.append([parent, name])
+
+        results = call_llm_for_summaries(prompts, system_prompt) if prompts else []
+        for (parent, name), result in zip(targets, results):
+            if result != SUMMARY_FAILED:
+                next_entries.append([parent, name, result])
+        if not next_entries:
+            return SUMMARY_FAILED
+        entries = next_entries
 
 def save_total_summary(total_summary: str, target_date: str):
     """전체 요약을 저장합니다."""
@@ -77,6 +266,10 @@ def main(date=None, system_prompt=None):
     total_summary = generate_overall_summary(summaries, target_date, system_prompt)
     save_total_summary(total_summary, target_date)
 
+    cache = get_summary_cache()
+    if cache:
+        print(f"📦 요약 캐시: 재사용 {cache.hits}건, 새로 생성 {cache.misses}건")
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         main(sys.argv[1])
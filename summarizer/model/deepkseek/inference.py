@@ -1,5 +1,7 @@
 import torch
+import transformers
 from transformers import AutoTokenizer, AutoModelForCausalLM
+from collections import OrderedDict
 import argparse
 import os
 import glob
@@ -9,39 +11,246 @@ import glob
 # ================================
 MODEL_NAME = "deepseek-ai/deepseek-coder-6.7b-instruct"
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
-model = AutoModelForCausalLM.from_pretrained(
-    MODEL_NAME,
-    trust_remote_code=True,
-    torch_dtype=torch.bfloat16
-).cuda()
+# GPU가 없으면 CPU에서 실행 (CPU는 bfloat16 연산이 느려 float32 사용)
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+# 배치 크기 결정에 사용할 메모리 예산 (None이면 GPU는 남은 메모리의 80%, CPU는 4GB)
+MEMORY_BUDGET_BYTES = None
+CPU_MEMORY_BUDGET_BYTES = 4 * 1024 ** 3
+MAX_BATCH_SIZE = 16
+
+# 시스템 프롬프트 앞부분의 KV 캐시 재사용 (시스템 프롬프트별로 한 번만 prefill)
+# 입력 일부만 새로 계산하는 generate()는 cache_position을 지원하는 transformers 4.38 이상에서만 사용
+PREFIX_CACHE_ENABLED = tuple(int(part) for part in transformers.__version__.split(".")[:2] if part.isdigit()) >= (4, 38)
+PREFIX_CACHE_SIZE = 4
+PREFIX_CACHE_STATS = {"hits": 0, "misses": 0, "reused_tokens": 0}
+
+tokenizer = None
+model = None
+_prefix_cache = OrderedDict()
+
+def load_model():
+    """모델과 토크나이저를 로드합니다. (이미 로드되어 있으면 그대로 사용)"""
+    global tokenizer, model
+    if model is not None:
+        return
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+    model = AutoModelForCausalLM.from_pretrained(
+        MODEL_NAME,
+        trust_remote_code=True,
+        torch_dtype=torch.bfloat16 if DEVICE == "cuda" else torch.float32
+    ).to(DEVICE)
+    model.eval()
+
+def build_messages(prompt: str, system_prompt: str = None) -> list:
+    """채팅 템플릿에 넣을 메시지 목록을 만듭니다."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
 
 # ================================
 # 함수: 텍스트 추론 (프롬프트 주입)
 # ================================
-def infer(prompt: str, max_new_tokens: int = 512) -> str:
-    messages = [
-        {"role": "user", "content": prompt}
-    ]
-    inputs = tokenizer.apply_chat_template(messages, add_generation_prompt=True, return_tensors="pt").to(model.device)
-
-    outputs = model.generate(
-        inputs,
-        max_new_tokens=max_new_tokens,
-        do_sample=False,
-        top_k=50,
-        top_p=0.95,
-        num_return_sequences=1,
-        eos_token_id=tokenizer.eos_token_id
+def infer(prompt: str, max_new_tokens: int = 512, system_prompt: str = None) -> str:
+    return infer_batch([prompt], max_new_tokens=max_new_tokens, system_prompt=system_prompt)[0]
+
+def encode_prompt(prompt: str, system_prompt: str = None) -> list:
+    """채팅 템플릿을 적용한 토큰 id 목록을 반환합니다."""
+    return tokenizer.apply_chat_template(build_messages(prompt, system_prompt), add_generation_prompt=True)
+
+# ================================
+# 함수: 시스템 프롬프트 KV 캐시
+# ================================
+def get_prefix_cache(system_prompt: str):
+    """
+    시스템 프롬프트 부분(모든 요청에 공통인 앞부분)의 토큰과 KV 캐시를 반환합니다.
+    처음 요청될 때 한 번만 계산하고, 최근에 쓴 PREFIX_CACHE_SIZE개를 보관합니다.
+
+    Returns:
+        (앞부분 토큰 id 목록, 레이어별 (key, value) 튜플) 또는 None
+    """
+    global PREFIX_CACHE_ENABLED
+    if not PREFIX_CACHE_ENABLED or not system_prompt:
+        return None
+    entry = _prefix_cache.get(system_prompt)
+    if entry is not None:
+        _prefix_cache.move_to_end(system_prompt)
+        return entry
+
+    # 사용자 내용만 다른 두 입력의 공통 앞부분 = 템플릿 + 시스템 프롬프트
+    first, second = encode_prompt("a", system_prompt), encode_prompt("b", system_prompt)
+    length = 0
+    while length < min(len(first), len(second)) and first[length] == second[length]:
+        length += 1
+    prefix_ids = first[:length]
+    if length < 2:
+        return None
+
+    try:
+        with torch.no_grad():
+            outputs = model(input_ids=torch.tensor([prefix_ids], dtype=torch.long).to(model.device), use_cache=True)
+        past = outputs.past_key_values
+        layers = past.to_legacy_cache() if hasattr(past, "to_legacy_cache") else past
+    except Exception as e:
+        print(f"⚠️ 시스템 프롬프트 KV 캐시를 만들 수 없어 사용하지 않습니다: {e}", flush=True)
+        PREFIX_CACHE_ENABLED = False
+        return None
+
+    entry = (prefix_ids, tuple(tuple(layer) for layer in layers))
+    _prefix_cache[system_prompt] = entry
+    while len(_prefix_cache) > PREFIX_CACHE_SIZE:
+        _prefix_cache.popitem(last=False)
+    return entry
+
+def expand_prefix_cache(layers: tuple, batch_size: int):
+    """배치 크기만큼 복제한 KV 캐시를 만듭니다. (generate가 캐시를 직접 고치므로 항상 복사)"""
+    expanded = tuple(
+        tuple(tensor.repeat(batch_size, *([1] * (tensor.dim() - 1))) for tensor in layer)
+        for layer in layers
     )
+    cache_class = getattr(transformers, "DynamicCache", None)
+    return cache_class.from_legacy_cache(expanded) if cache_class is not None else expanded
+
+# ================================
+# 함수: 배치 추론 (여러 프롬프트를 한 번의 generate로)
+# ================================
+def kv_bytes_per_token() -> int:
+    """토큰 하나가 KV 캐시에 차지하는 바이트 수 (모든 레이어의 key + value)"""
+    config = model.config
+    num_heads = config.num_attention_heads
+    kv_heads = getattr(config, "num_key_value_heads", None) or num_heads
+    head_dim = config.hidden_size // num_heads
+    element_size = next(model.parameters()).element_size()
+    return 2 * config.num_hidden_layers * kv_heads * head_dim * element_size
 
-    result = tokenizer.decode(outputs[0][len(inputs[0]):], skip_special_tokens=True)
-    return result.strip()
+def memory_budget_bytes() -> int:
+    """배치에 사용할 수 있는 메모리 예산을 반환합니다."""
+    if MEMORY_BUDGET_BYTES:
+        return MEMORY_BUDGET_BYTES
+    if DEVICE == "cuda":
+        free_bytes, _ = torch.cuda.mem_get_info()
+        return int(free_bytes * 0.8)
+    return CPU_MEMORY_BUDGET_BYTES
+
+def plan_batches(lengths: list, max_new_tokens: int, budget_bytes: int, per_token_bytes: int) -> list:
+    """
+    길이가 비슷한 프롬프트끼리 묶어 메모리 예산에 맞는 배치로 나눕니다.
+
+    Args:
+        lengths: 프롬프트별 토큰 수
+        max_new_tokens: 최대 생성 토큰 수
+        budget_bytes: 메모리 예산
+        per_token_bytes: 토큰당 KV 캐시 바이트
+
+    Returns:
+        list: 배치별 프롬프트 인덱스 목록 (긴 프롬프트부터)
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches = []
+    current = []
+    for index in order:
+        # 긴 것부터 넣으므로 배치의 첫 프롬프트 길이가 패딩 후 길이
+        width = lengths[current[0]] if current else lengths[index]
+        cost = (len(current) + 1) * (width + max_new_tokens) * per_token_bytes
+        if current and (len(current) >= MAX_BATCH_SIZE or cost > budget_bytes):
+            batches.append(current)
+            current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+def infer_batch(prompts: list, max_new_tokens: int = 512, system_prompt: str = None) -> list:
+    """
+    여러 프롬프트를 길이별로 묶어 배치마다 generate를 한 번씩 실행합니다.
+
+    Args:
+        prompts: 프롬프트 목록
+        max_new_tokens: 최대 생성 토큰 수
+        system_prompt: 모든 프롬프트에 공통으로 쓰는 시스템 프롬프트
+
+    Returns:
+        list: 프롬프트 순서와 같은 순서의 결과 목록
+    """
+    global PREFIX_CACHE_ENABLED
+    load_model()
+    if not prompts:
+        return []
+    encoded = [encode_prompt(prompt, system_prompt) for prompt in prompts]
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    batches = plan_batches([len(ids) for ids in encoded], max_new_tokens, memory_budget_bytes(), kv_bytes_per_token())
+    prefix = get_prefix_cache(system_prompt)
+
+    results = [None] * len(prompts)
+    for batch in batches:
+        prefix_ids = prefix[0] if prefix else []
+        if prefix and not all(encoded[i][:len(prefix_ids)] == prefix_ids for i in batch):
+            prefix_ids = []
+        try:
+            outputs, width = _generate_batch([encoded[i] for i in batch], prefix_ids, prefix, max_new_tokens, pad_token_id)
+        except Exception as e:
+            if not prefix_ids:
+                raise
+            # 캐시를 이어 쓰는 generate를 지원하지 않는 모델이면 캐시 없이 다시 생성
+            print(f"⚠️ 시스템 프롬프트 KV 캐시 재사용에 실패하여 사용하지 않습니다: {e}", flush=True)
+            PREFIX_CACHE_ENABLED = False
+            prefix = None
+            _prefix_cache.clear()
+            outputs, width = _generate_batch([encoded[i] for i in batch], [], None, max_new_tokens, pad_token_id)
+
+        for row, index in enumerate(batch):
+            results[index] = tokenizer.decode(outputs[row][width:], skip_special_tokens=True).strip()
+    return results
+
+def _generate_batch(rows: list, prefix_ids: list, prefix, max_new_tokens: int, pad_token_id: int):
+    """
+    한 배치를 생성합니다.
+    - 캐시 없음: [패딩][입력] (왼쪽 패딩)
+    - 캐시 사용: [시스템 프롬프트][패딩][나머지 입력] (시스템 프롬프트 부분은 캐시로 건너뜀,
+      위치는 attention_mask 누적합으로 계산되므로 가운데 패딩은 위치에 영향을 주지 않음)
+
+    Returns:
+        (generate 결과, 입력 길이)
+    """
+    start = len(prefix_ids)
+    width = start + max(len(ids) - start for ids in rows)
+    input_ids = torch.full((len(rows), width), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+    for row, ids in enumerate(rows):
+        if start:
+            input_ids[row, :start] = torch.tensor(prefix_ids, dtype=torch.long)
+            attention_mask[row, :start] = 1
+        # 생성은 오른쪽 끝에서 이어지므로 패딩은 나머지 입력의 왼쪽에 둠
+        input_ids[row, width - (len(ids) - start):] = torch.tensor(ids[start:], dtype=torch.long)
+        attention_mask[row, width - (len(ids) - start):] = 1
+
+    kwargs = {}
+    if start:
+        kwargs["past_key_values"] = expand_prefix_cache(prefix[1], len(rows))
+        PREFIX_CACHE_STATS["hits"] += 1
+        PREFIX_CACHE_STATS["reused_tokens"] += start * len(rows)
+    else:
+        PREFIX_CACHE_STATS["misses"] += 1
+
+    with torch.no_grad():
+        outputs = model.generate(
+            input_ids=input_ids.to(model.device),
+            attention_mask=attention_mask.to(model.device),
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            num_return_sequences=1,
+            pad_token_id=pad_token_id,
+            eos_token_id=tokenizer.eos_token_id,
+            **kwargs
+        )
+    return outputs, width
 
 # ================================
 # 함수: 파일 읽고 타입별 요약 요청
 # ================================
-def summarize_file(file_path: str) -> str:
+def build_file_prompt(file_path: str) -> str:
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
 
@@ -67,7 +276,10 @@ def summarize_file(file_path: str) -> str:
             f"{content}"
         )
 
-    summary = infer(prompt)
+    return prompt
+
+def summarize_file(file_path: str) -> str:
+    summary = infer(build_file_prompt(file_path))
     return summary
 
 # ================================
@@ -87,11 +299,11 @@ def batch_summarize(directory: str) -> None:
 
     print(f"총 {len(target_files)}개 파일 요약 시작...")
 
-    for file_path in target_files:
-        print(f"요약 중: {file_path}")
-        summary = summarize_file(file_path)
+    # 파일별로 generate를 따로 실행하지 않고 길이가 비슷한 파일끼리 묶어 한 번에 추론
+    summaries = infer_batch([build_file_prompt(file_path) for file_path in target_files])
+    for file_path, summary in zip(target_files, summaries):
         save_summary(file_path, summary)
-        print(f"완료: {file_path}.summary.txt 생성\n")
+        print(f"완료: {file_path}.summary.txt 생성")
 
 # ================================
 # 메인 실행부
@@ -100,9 +312,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--file", type=str, help="요약할 파일 경로")
     parser.add_argument("--dir", type=str, help="요약할 디렉토리 경로 (batch mode)")
+    parser.add_argument("--user-prompt", type=str, help="직접 추론할 프롬프트")
+    parser.add_argument("--system-prompt", type=str, help="시스템 프롬프트 (--user-prompt와 함께 사용)")
     args = parser.parse_args()
 
-    if args.dir:
+    if args.user_prompt:
+        print(infer(args.user_prompt, system_prompt=args.system_prompt))
+    elif args.dir:
         batch_summarize(args.dir)
     elif args.file:
         summary = summarize_file(args.file)
@@ -112,6 +328,6 @@ if __name__ == "__main__":
         save_summary(args.file, summary)
         print(f"요약 결과가 {args.file}.summary.txt 파일로 저장되었습니다.")
     else:
-        print("--file 또는 --dir 중 하나를 지정해야 합니다.")
+        print("--file, --dir, --user-prompt 중 하나를 지정해야 합니다.")
 
 # python inference.py --file "C:\Users\jeahyuk\github\dailyActivityTracker\storage\activities\2025-04-28\diffs\BitNet_run_inference_with_file.py.111951.diff"
\ No newline at end of file
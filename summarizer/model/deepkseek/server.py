@@ -0,0 +1,247 @@
+"""
+로컬 LLM 추론 서버
+- 모델을 한 번만 로드하고 localhost HTTP로 요약 요청을 받음
+- GET  /health    : 상태 확인 ('loading' / 'ready')
+- POST /summarize : {"prompt", "system_prompt", "max_new_tokens"} -> {"summary"}
+- POST /summarize_batch : {"prompts", "system_prompt", "max_new_tokens"} -> {"summaries"}
+- 동시에 들어온 요청을 잠시 모아 길이별 배치로 한 번에 generate
+- 일정 시간 요청이 없으면 스스로 종료 (GPU 메모리 반환)
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import inference
+
+# ================================
+# 서버 상태
+# ================================
+class ServerState:
+    """모델 로드 상태와 마지막 요청 시간"""
+
+    def __init__(self):
+        self.status = "loading"
+        self.error = None
+        self.last_request = time.monotonic()
+        self.served = 0
+        self.batches = 0
+
+    def touch(self):
+        self.last_request = time.monotonic()
+
+
+state = ServerState()
+
+# ================================
+# 요청 모음 배치 처리
+# ================================
+class PendingPrompt:
+    """생성을 기다리는 프롬프트 한 건"""
+
+    __slots__ = ("prompt", "system_prompt", "max_new_tokens", "result", "error", "done")
+
+    def __init__(self, prompt: str, system_prompt: str, max_new_tokens: int):
+        self.prompt = prompt
+        self.system_prompt = system_prompt
+        self.max_new_tokens = max_new_tokens
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class Batcher:
+    """
+    요청을 잠시 모아 한 번에 생성하는 스레드
+    - GPU/CPU 하나에서 generate()가 동시에 실행되지 않도록 이 스레드에서만 생성
+    - 시스템 프롬프트와 최대 토큰 수가 같은 요청끼리 infer_batch()로 묶음
+    """
+
+    def __init__(self, batch_wait: float, max_pending: int = 256):
+        self.batch_wait = batch_wait
+        self.max_pending = max_pending
+        self._queue = queue.Queue()
+        self.busy = False
+
+    def submit(self, items: list) -> list:
+        """프롬프트들을 대기열에 넣고 모두 생성될 때까지 기다립니다."""
+        for item in items:
+            self._queue.put(item)
+        for item in items:
+            item.done.wait()
+        return items
+
+    def run(self):
+        while True:
+            first = self._queue.get()
+            self.busy = True
+            pending = [first]
+            deadline = time.monotonic() + self.batch_wait
+            while len(pending) < self.max_pending:
+                timeout = deadline - time.monotonic()
+                try:
+                    pending.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            groups = {}
+            for item in pending:
+                groups.setdefault((item.system_prompt, item.max_new_tokens), []).append(item)
+            for (system_prompt, max_new_tokens), items in groups.items():
+                try:
+                    results = inference.infer_batch(
+                        [item.prompt for item in items],
+                        max_new_tokens=max_new_tokens,
+                        system_prompt=system_prompt,
+                    )
+                    for item, result in zip(items, results):
+                        item.result = result
+                    state.served += len(items)
+                    state.batches += 1
+                except Exception as e:
+                    for item in items:
+                        item.error = str(e)
+                for item in items:
+                    item.done.set()
+            state.touch()
+            self.busy = False
+
+
+batcher = None
+
+# ================================
+# 요청 처리
+# ================================
+class InferenceHandler(BaseHTTPRequestHandler):
+    """요약 요청 처리기"""
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {
+            "status": state.status,
+            "model": inference.MODEL_NAME,
+            "pid": os.getpid(),
+            "served": state.served,
+            "batches": state.batches,
+            "prefix_cache": dict(inference.PREFIX_CACHE_STATS, enabled=inference.PREFIX_CACHE_ENABLED),
+            "error": state.error,
+        })
+
+    def do_POST(self):
+        if self.path not in ("/summarize", "/summarize_batch"):
+            self._send_json(404, {"error": "not found"})
+            return
+        if state.status != "ready":
+            self._send_json(503, {"error": f"model {state.status}"})
+            return
+        state.touch()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            prompts = request["prompts"] if self.path == "/summarize_batch" else [request["prompt"]]
+            max_new_tokens = int(request.get("max_new_tokens", 512))
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": f"잘못된 요청입니다: {e}"})
+            return
+
+        system_prompt = request.get("system_prompt")
+        items = batcher.submit([PendingPrompt(prompt, system_prompt, max_new_tokens) for prompt in prompts])
+        errors = [item.error for item in items if item.error]
+        if errors:
+            self._send_json(500, {"error": errors[0]})
+        elif self.path == "/summarize_batch":
+            self._send_json(200, {"summaries": [item.result for item in items]})
+        else:
+            self._send_json(200, {"summary": items[0].result})
+
+    def _send_json(self, code: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr에 찍히는 기본 접근 로그는 생략
+        pass
+
+# ================================
+# 유휴 종료
+# ================================
+def watch_idle(server: ThreadingHTTPServer, idle_timeout: float):
+    """idle_timeout 동안 요청이 없으면 서버를 종료합니다."""
+    while True:
+        time.sleep(min(idle_timeout, 30))
+        if not batcher.busy and time.monotonic() - state.last_request >= idle_timeout:
+            print(f"💤 {idle_timeout:.0f}초 동안 요청이 없어 서버를 종료합니다.", flush=True)
+            server.shutdown()
+            return
+
+# ================================
+# 메인 실행부
+# ================================
+def main():
+    parser = argparse.ArgumentParser(description="로컬 LLM 추론 서버")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8765, help="포트")
+    parser.add_argument("--idle-timeout", type=float, default=0, help="유휴 종료 시간 (초, 0이면 종료하지 않음)")
+    parser.add_argument("--model", type=str, help=f"로드할 모델 (기본값: {inference.MODEL_NAME})")
+    parser.add_argument("--batch-wait", type=float, default=0.05, help="요청을 모아 배치로 묶는 대기 시간 (초)")
+    parser.add_argument("--no-prefix-cache", action="store_true", help="시스템 프롬프트 KV 캐시 재사용 끄기")
+    parser.add_argument("--memory-budget-mb", type=int, default=0, help="배치 크기 결정에 쓸 메모리 예산 (MB, 0이면 자동)")
+    args = parser.parse_args()
+
+    global batcher
+    if args.model:
+        inference.MODEL_NAME = args.model
+    if args.no_prefix_cache:
+        inference.PREFIX_CACHE_ENABLED = False
+    if args.memory_budget_mb > 0:
+        inference.MEMORY_BUDGET_BYTES = args.memory_budget_mb * 1024 * 1024
+    batcher = Batcher(args.batch_wait)
+
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), InferenceHandler)
+    except OSError as e:
+        # 이미 다른 서버가 포트를 사용 중 (동시에 자동 시작된 경우 등)
+        print(f"⚠️ 서버를 시작할 수 없습니다: {args.host}:{args.port} ({e})", flush=True)
+        sys.exit(1)
+    server.daemon_threads = True
+
+    # 모델을 로드하는 동안에도 /health 응답이 가능하도록 먼저 요청 처리를 시작
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🚀 LLM 서버 시작: http://{args.host}:{args.port} (모델 로드 중: {inference.MODEL_NAME})", flush=True)
+
+    try:
+        inference.load_model()
+    except Exception as e:
+        state.status = "failed"
+        state.error = str(e)
+        print(f"❌ 모델 로드 실패: {e}", flush=True)
+        server.shutdown()
+        sys.exit(1)
+    threading.Thread(target=batcher.run, daemon=True).start()
+    state.status = "ready"
+    state.touch()
+    print("✅ 모델 로드 완료, 요청 대기 중", flush=True)
+
+    if args.idle_timeout > 0:
+        watch_idle(server, args.idle_timeout)
+    else:
+        threading.Event().wait()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
+
+# python server.py --port 8765 --idle-timeout 1800
@@ -3,10 +3,12 @@
 - prompt_loader: 프롬프트 파일 로딩 관련
 - date_utils: 날짜 처리 관련
 - file_utils: 파일 처리 관련
+- summary_cache: 요약 결과 캐시 관련
 """
 
 from .prompt_loader import load_prompt
 from .date_utils import resolve_date
 from .file_utils import validate_storage_dirs
+from .summary_cache import SummaryCache
 
-__all__ = ['load_prompt', 'resolve_date', 'validate_storage_dirs'] 
\ No newline at end of file
+__all__ = ['load_prompt', 'resolve_date', 'validate_storage_dirs', 'SummaryCache'] 
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""요약 결과 캐시 관련 유틸리티
+
+같은 입력(diff 내용, 시스템 프롬프트, 프롬프트 버전, 모델, 생성 설정)에 대한
+요약을 디스크에 저장해 두고, 다시 요약할 때 LLM 호출 없이 재사용합니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+
+class SummaryCache:
+    """
+    내용 해시를 키로 하는 요약 캐시
+    - 항목: {cache_dir}/{키 앞 2자리}/{키}.txt
+    - 조회할 때마다 수정 시간을 갱신하여 오래 쓰이지 않은 항목부터 제거 (LRU)
+    - 전체 크기가 max_bytes를 넘으면 90%가 될 때까지 제거
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 캐시 최대 크기 (바이트)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt: str, system_prompt: Optional[str], **params: Any) -> str:
+        """
+        요약 입력으로 캐시 키를 만듭니다.
+
+        Args:
+            prompt: 사용자 프롬프트 (diff 내용 등)
+            system_prompt: 시스템 프롬프트
+            **params: 결과에 영향을 주는 나머지 값 (모델, 프롬프트 버전, 생성 설정 등)
+
+        Returns:
+            str: SHA-256 키
+        """
+        payload = json.dumps({
+            'prompt': prompt,
+            'system_prompt': system_prompt,
+            'params': params,
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 요약을 반환합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Optional[str]: 요약 (없으면 None)
+        """
+        path = self._entry_path(key)
+        try:
+            summary = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            summary = None
+        except OSError as e:
+            print(f"⚠️ 요약 캐시 읽기 실패: {path} ({e})")
+            summary = None
+        with self._lock:
+            if summary is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return summary
+
+    def put(self, key: str, summary: str):
+        """
+        요약을 캐시에 저장합니다.
+
+        Args:
+            key: 캐시 키
+            summary: 요약
+        """
+        path = self._entry_path(key)
+        data = summary.encode('utf-8')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 동시에 같은 키를 저장해도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(data)
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ 요약 캐시 저장 실패: {path} ({e})")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """(수정 시간, 크기, 경로) 목록을 반환합니다."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob("*/*.txt"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """오래 쓰이지 않은 항목부터 제거합니다. (잠금을 잡은 상태에서 호출)"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
@@ -0,0 +1,131 @@
+"""
+diff 알고리즘 벤치마크
+- 1KB ~ 10MB 크기의 소스 코드형/lockfile형 텍스트에 대해 알고리즘별 소요 시간 비교
+- 실행: tracker 디렉토리에서 python -m benchmarks.diff_benchmark [--max-size 10MB] [--algorithms ...]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.utils.diff_engine import compute_opcodes, DIFF_ALGORITHMS
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+EDITS_PER_FILE = 20
+# difflib은 큰 반복 텍스트에서 매우 느리므로 이 시간을 넘으면 더 큰 크기는 건너뜀
+SLOW_LIMIT_SECONDS = 60.0
+
+
+def _source_like(size: int, rng: random.Random) -> List[str]:
+    """서로 다른 줄이 대부분인 소스 코드형 텍스트를 만듭니다."""
+    lines = []
+    total = 0
+    while total < size:
+        indent = '    ' * rng.randrange(4)
+        line = f"{indent}value_{rng.randrange(10 ** 6)} = compute({rng.randrange(1000)})\n"
+        lines.append(line)
+        total += len(line)
+    return lines
+
+
+def _lockfile_like(size: int, rng: random.Random) -> List[str]:
+    """같은 줄이 많이 반복되는 lockfile/생성 코드형 텍스트를 만듭니다."""
+    lines = []
+    total = 0
+    while total < size:
+        block = [
+            f'"package-{rng.randrange(5000)}": {{\n',
+            '  "dev": false,\n',
+            '  "optional": false,\n',
+            f'  "version": "1.{rng.randrange(20)}.0"\n',
+            '},\n',
+        ]
+        lines.extend(block)
+        total += sum(len(line) for line in block)
+    return lines
+
+
+def _mutate(lines: List[str], rng: random.Random) -> List[str]:
+    """파일 곳곳에 수정/삽입/삭제를 적용합니다."""
+    result = list(lines)
+    for _ in range(EDITS_PER_FILE):
+        if not result:
+            break
+        index = rng.randrange(len(result))
+        choice = rng.random()
+        if choice < 0.4:
+            result[index] = f"edited_{rng.randrange(10 ** 6)}\n"
+        elif choice < 0.7:
+            result.insert(index, f"inserted_{rng.randrange(10 ** 6)}\n")
+        else:
+            del result[index]
+    return result
+
+
+def _measure(func: Callable[[], object]) -> float:
+    """함수 실행 시간을 초 단위로 반환합니다."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _parse_size(text: str) -> int:
+    """'10MB', '100KB' 같은 크기 문자열을 바이트 수로 변환합니다."""
+    units = {'KB': 1024, 'MB': 1024 * 1024}
+    text = text.upper()
+    for unit, factor in units.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def run(max_size: int, algorithms: List[str], seed: int = 0):
+    """
+    벤치마크를 실행하고 결과를 출력합니다.
+
+    Args:
+        max_size: 최대 파일 크기 (바이트)
+        algorithms: 비교할 알고리즘 목록
+        seed: 난수 시드
+    """
+    rng = random.Random(seed)
+    slow: Dict[str, bool] = {}
+    header = f"{'종류':<10}{'크기':>10}{'줄 수':>10}" + ''.join(f"{name:>12}" for name in algorithms)
+    print(header)
+    print('-' * len(header))
+
+    for kind, make in (('source', _source_like), ('lockfile', _lockfile_like)):
+        slow.clear()
+        for size in SIZES:
+            if size > max_size:
+                break
+            old_lines = make(size, rng)
+            new_lines = _mutate(old_lines, rng)
+            row = f"{kind:<10}{size // 1024:>8}KB{len(old_lines):>10}"
+            for name in algorithms:
+                if slow.get(name):
+                    row += f"{'skip':>12}"
+                    continue
+                elapsed = _measure(lambda: compute_opcodes(old_lines, new_lines, name))
+                slow[name] = elapsed > SLOW_LIMIT_SECONDS
+                row += f"{elapsed * 1000:>10.1f}ms"
+            print(row, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="diff 알고리즘 벤치마크")
+    parser.add_argument('--max-size', default='10MB', help="최대 파일 크기 (예: 1MB)")
+    parser.add_argument('--algorithms', nargs='+', default=list(DIFF_ALGORITHMS),
+                        choices=DIFF_ALGORITHMS, help="비교할 알고리즘")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+    run(_parse_size(args.max_size), args.algorithms, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 """
 
 from pathlib import Path
-from typing import Set
+from typing import List, Set
 
 class TrackerConfig:
     def __init__(self):
@@ -15,10 +15,59 @@ class TrackerConfig:
         # 파일 필터링 설정
         self.FILE_EXTENSIONS: Set[str] = {'.py', '.md'}  # 추적할 파일 확장자
         self.EXCLUDE_DIRS: Set[str] = {'.git', '__pycache__', 'venv', 'node_modules'}  # 제외할 디렉토리
+        self.IGNORE_PATTERNS: List[str] = []  # gitignore 형식 추가 제외 패턴 (예: '*.min.js', 'build/', '!keep.md')
+        self.USE_GITIGNORE = True  # 하위 디렉토리의 .gitignore 규칙 적용 여부
         self.MAX_FILE_SIZE = 10 * 1024 * 1024  # 최대 파일 크기 (10MB)
+        self.SCAN_WORKERS = 8  # 초기 스캔 시 디렉토리 탐색 스레드 수
 
         # 저장소 설정
         self.STORAGE_DIR = Path(r"C:\Users\jeahyuk\storage")  # 저장소 디렉토리
+        self.STORAGE_BACKEND = 'files'  # 'files': 날짜별 파일, 'sqlite': STORAGE_DIR/SQLITE_DB_NAME (WAL)
+        self.SQLITE_DB_NAME = 'tracker.db'  # SQLite 데이터베이스 파일명
+        self.SQLITE_BATCH_SIZE = 256  # 이만큼 모이면 한 트랜잭션으로 삽입
+        self.SQLITE_FLUSH_INTERVAL = 1.0  # 가장 오래된 대기 기록이 이 시간(초)을 넘으면 백그라운드에서 삽입
+
+        # 백업 이력 설정
+        self.BACKUP_KEEP_HISTORY = True  # 이전 버전을 역방향 delta로 보관
+        self.BACKUP_CHECKPOINT_INTERVAL = 20  # 이 간격의 버전은 전체 내용으로 보관
+        self.BACKUP_MAX_VERSIONS = 100  # 파일별 최대 보관 버전 수
+
+        # 추가 저장 설정
+        self.BACKUP_MAX_SEGMENTS = 64  # 추가 저장 구간이 이 수를 넘으면 하나로 합침
+        self.APPEND_FAST_PATH = True  # 뒤에만 추가된 파일은 추가된 부분만 diff/백업
+
+        # 백업 캐시 설정
+        self.BACKUP_CACHE_BYTES = 64 * 1024 * 1024  # 기준 내용 캐시 최대 메모리 (64MB)
+        self.BACKUP_HASH_CACHE_ENTRIES = 4096  # 원본 해시 -> 내용 해시 캐시 최대 항목 수
+
+        # diff 설정
+        self.DIFF_ALGORITHM = 'histogram'  # 'myers', 'histogram', 'patience', 'difflib'
+
+        # 압축 설정: {데이터 종류: [(최소 크기(바이트), 코덱)]} - 코덱은 'none', 'zlib', 'lzma', 'bz2'
+        self.COMPRESSION_POLICY = {
+            'backup': [(512, 'zlib')],
+            'delta': [(512, 'zlib')],
+            'diff': [(512, 'zlib'), (1024 * 1024, 'lzma')],
+            'activity': [(512, 'zlib')],
+        }
+
+        # 활동 로그 설정
+        self.ACTIVITY_SEGMENT_BYTES = 8 * 1024 * 1024  # 활동 로그 구간 최대 크기 (8MB, 넘으면 압축 후 새 구간)
+        self.ACTIVITY_ROTATE_SECONDS = 3600  # 활동 로그 구간 교체 주기 (초, None이면 크기로만 교체)
+        self.ACTIVITY_FSYNC = 'interval'  # 'always', 'interval', 'never'
+        self.ACTIVITY_FSYNC_INTERVAL = 1.0  # 'interval' 정책의 fsync 간격 (초)
+
+        # 그룹 커밋 기록 설정
+        self.WRITER_DURABILITY = 'group'  # 'buffered'(요청 시만 fsync), 'group'(묶음마다 fsync), 'sync'(fsync까지 대기)
+        self.WRITER_FLUSH_INTERVAL = 0.05  # 첫 쓰기 이후 묶음을 모으는 최대 시간 (초)
+        self.WRITER_QUEUE_SIZE = 1024  # 대기 가능한 최대 쓰기 수 (넘으면 이벤트 처리가 대기)
+        self.WRITER_MAX_BATCH = 256  # 한 묶음의 최대 쓰기 수
+
+        # 이벤트 처리 설정
+        self.EVENT_SETTLE_SECONDS = 0.5  # 마지막 이벤트 이후 처리까지 대기 시간 (초)
+        self.EVENT_STABILITY_INTERVAL = 0.2  # 파일 크기/수정 시간 재확인 간격 (초)
+        self.EVENT_MAX_DELAY = 10.0  # 계속 변경되는 파일도 이 시간이 지나면 처리 (초)
+        self.EVENT_WORKERS = 4  # 이벤트 처리 워커 수
 
         # 기타 설정
         self.BASELINE_ONLY_ON_FIRST_SEEN = True  # 첫 감지 시에만 기준선 저장
@@ -0,0 +1,532 @@
+"""
+활동 로그 조회 엔진
+- 시간 범위, 파일 경로 접두, 활동 유형, 저장소(repo) 조건으로 조회
+- 날짜 디렉토리 -> 구간별 요약(시간 범위/유형) -> 희소 시간 인덱스 순으로 읽을 범위를 좁힘
+  (시각이 거꾸로 된 기록이 있는 구간은 희소 인덱스 없이 처음부터 읽음)
+- 경로/유형 인덱스 (경로, 유형 -> 기록 번호 구간)로 조건에 맞는 줄만 파싱
+- 인덱스는 날짜 디렉토리에 저장하고, 현재 구간은 늘어난 부분만 추가 색인
+  (구간 교체는 파일 식별값(장치, inode, 마지막 구간 번호)으로 감지해 다시 색인)
+- 결과는 하나씩 반환 (스트리밍), 커서 기반 페이지 조회
+"""
+
+import io
+import json
+import os
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .utils.activity_log import ActivityLog
+from .utils.codec import ContentCodec
+
+INDEX_FILENAME = "activities.idx"
+INDEX_VERSION = 3
+
+
+class ActivityFilter:
+    """활동 조회 조건"""
+
+    __slots__ = ('since', 'until', 'path_prefix', 'activity_type', 'repo')
+
+    def __init__(self,
+                 since: Optional[datetime] = None,
+                 until: Optional[datetime] = None,
+                 path_prefix: Optional[str] = None,
+                 activity_type: Optional[str] = None,
+                 repo: Optional[str] = None):
+        """
+        Args:
+            since: 이 시각 이후 (포함)
+            until: 이 시각 이전 (포함)
+            path_prefix: 파일 경로 접두
+            activity_type: 활동 유형
+            repo: 저장소 이름 또는 경로 (.git이 있는 가장 가까운 상위 디렉토리)
+        """
+        self.since = since
+        self.until = until
+        self.path_prefix = path_prefix
+        self.activity_type = activity_type
+        self.repo = repo
+
+    @property
+    def since_key(self) -> Optional[str]:
+        return self.since.isoformat() if self.since else None
+
+    @property
+    def until_key(self) -> Optional[str]:
+        return self.until.isoformat() if self.until else None
+
+    @property
+    def has_path_condition(self) -> bool:
+        return self.path_prefix is not None or self.repo is not None
+
+
+class RepoRoots:
+    """파일이 속한 저장소 루트(.git이 있는 가장 가까운 상위 디렉토리) 탐색 캐시"""
+
+    def __init__(self):
+        # 디렉토리 -> 저장소 루트 (.git 탐색 결과)
+        self._roots: Dict[str, Optional[str]] = {}
+
+    def find(self, path: str) -> Optional[str]:
+        """
+        파일이 속한 저장소 루트를 찾습니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            Optional[str]: 저장소 루트 (없으면 None)
+        """
+        directory = os.path.dirname(path)
+        visited = []
+        root = None
+        while directory and directory not in self._roots:
+            visited.append(directory)
+            if os.path.exists(os.path.join(directory, '.git')):
+                root = directory
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        else:
+            root = self._roots.get(directory)
+        for visited_dir in visited:
+            self._roots[visited_dir] = root
+        return root
+
+    def path_matches(self, path: Optional[str], query: ActivityFilter) -> bool:
+        """
+        경로가 경로 접두/저장소 조건에 맞는지 확인합니다.
+
+        Args:
+            path: 파일 경로
+            query: 조회 조건
+
+        Returns:
+            bool: 조건에 맞으면 True
+        """
+        if not path:
+            return False
+        if query.path_prefix is not None and not path.startswith(query.path_prefix):
+            return False
+        if query.repo is not None:
+            root = self.find(path)
+            if root is None or query.repo not in (root, os.path.basename(root)):
+                return False
+        return True
+
+
+class ActivityQuery:
+    """
+    활동 로그 조회 엔진 (ActivityLog가 기록한 디렉토리를 읽기만 함)
+    - 소스: 이전 형식(activities.json) -> 교체된 구간 -> 현재 구간 순서
+    - 소스별 인덱스: 기록 수, 시간 범위, 유형/경로별 기록 번호 구간, 희소 시간 인덱스
+    """
+
+    def __init__(self, activity_dir: Path, sparse_interval: int = 64, persist_index: bool = True):
+        """
+        Args:
+            activity_dir: 활동 로그 디렉토리
+            sparse_interval: 희소 시간 인덱스 간격 (기록 수)
+            persist_index: 인덱스를 날짜 디렉토리에 저장할지 여부
+        """
+        self.activity_dir = activity_dir
+        self.sparse_interval = max(1, sparse_interval)
+        self.persist_index = persist_index
+        # 날짜 -> {소스 이름: 인덱스}
+        self._indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._repo_roots = RepoRoots()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def search(self, query: ActivityFilter) -> Iterator[Dict[str, Any]]:
+        """
+        조건에 맞는 활동을 오래된 순서로 하나씩 반환합니다.
+
+        Args:
+            query: 조회 조건
+
+        Returns:
+            Iterator[Dict[str, Any]]: 활동 기록
+        """
+        for _, record in self._search(query):
+            yield record
+
+    def page(self,
+             query: ActivityFilter,
+             limit: int,
+             cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        조건에 맞는 활동을 한 페이지만 반환합니다.
+
+        Args:
+            query: 조회 조건
+            limit: 페이지 크기
+            cursor: 이전 페이지가 반환한 커서 (첫 페이지는 None)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (활동 기록 목록, 다음 페이지 커서 - 마지막이면 None)
+        """
+        # 커서는 '마지막 기록 시각|그 시각의 기록 중 이미 반환한 수' (구간이 교체되어도 유효)
+        after_ts, skip = None, 0
+        if cursor:
+            after_ts, _, count = cursor.rpartition('|')
+            skip = int(count)
+            since = datetime.fromisoformat(after_ts)
+            if query.since is None or since > query.since:
+                query = ActivityFilter(since, query.until, query.path_prefix, query.activity_type, query.repo)
+
+        records: List[Dict[str, Any]] = []
+        last_ts, same_ts = after_ts, skip
+        for timestamp, record in self._search(query):
+            if after_ts is not None:
+                if timestamp < after_ts:
+                    continue
+                if timestamp == after_ts and skip:
+                    skip -= 1
+                    continue
+            if len(records) == limit:
+                return records, f"{last_ts}|{same_ts}"
+            records.append(record)
+            same_ts = same_ts + 1 if timestamp == last_ts else 1
+            last_ts = timestamp
+        return records, None
+
+    def _search(self, query: ActivityFilter) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """조건에 맞는 (시각, 기록)을 반환합니다."""
+        since_key = query.since_key
+        until_key = query.until_key
+        for date_key in self._date_keys(query):
+            date_dir = self.activity_dir / date_key
+            indexes = self._load_day_index(date_key)
+            for source_path in self._source_paths(date_dir):
+                index = indexes.get(source_path.name)
+                if index is None or not self._source_may_match(index, query, since_key, until_key):
+                    continue
+                ordinals = self._wanted_ordinals(index, query)
+                if ordinals is not None and not ordinals:
+                    continue
+                for ordinal, record in self._read_source(source_path, index, since_key, ordinals):
+                    timestamp = record.get('timestamp', '')
+                    if since_key and timestamp < since_key:
+                        continue
+                    if until_key and timestamp > until_key:
+                        continue
+                    if query.activity_type and record.get('type') != query.activity_type:
+                        continue
+                    if query.has_path_condition and not self._repo_roots.path_matches(self._record_path(record), query):
+                        continue
+                    yield timestamp, record
+
+    def _date_keys(self, query: ActivityFilter) -> List[str]:
+        """조회 범위에 걸친 날짜 디렉토리 이름을 순서대로 반환합니다."""
+        if not self.activity_dir.exists():
+            return []
+        first = query.since.strftime("%Y-%m-%d") if query.since else None
+        last = query.until.strftime("%Y-%m-%d") if query.until else None
+        keys = []
+        for entry in os.scandir(self.activity_dir):
+            if not entry.is_dir():
+                continue
+            try:
+                datetime.strptime(entry.name, "%Y-%m-%d")
+            except ValueError:
+                continue
+            if (first and entry.name < first) or (last and entry.name > last):
+                continue
+            keys.append(entry.name)
+        return sorted(keys)
+
+    @staticmethod
+    def _source_paths(date_dir: Path) -> List[Path]:
+        """날짜 디렉토리의 소스 파일을 기록 순서로 반환합니다."""
+        sources = []
+        legacy_path = date_dir / ActivityLog.LEGACY_FILENAME
+        if legacy_path.exists():
+            sources.append(legacy_path)
+        sources.extend(sorted(path for path in date_dir.iterdir() if ActivityLog.SEGMENT_PATTERN.match(path.name)))
+        active_path = date_dir / ActivityLog.ACTIVE_FILENAME
+        if active_path.exists():
+            sources.append(active_path)
+        return sources
+
+    @staticmethod
+    def _source_may_match(index: Dict[str, Any], query: ActivityFilter,
+                          since_key: Optional[str], until_key: Optional[str]) -> bool:
+        """소스 요약으로 조건에 맞는 기록이 있을 수 있는지 확인합니다."""
+        if not index['count']:
+            return False
+        if since_key and index['max_ts'] < since_key:
+            return False
+        if until_key and index['min_ts'] > until_key:
+            return False
+        if query.activity_type and query.activity_type not in index['types']:
+            return False
+        return True
+
+    def _wanted_ordinals(self, index: Dict[str, Any], query: ActivityFilter) -> Optional[set]:
+        """경로/유형 인덱스로 읽을 기록 번호를 구합니다. (경로/유형 조건이 없으면 None)"""
+        wanted = None
+        if query.activity_type:
+            wanted = self._expand_runs(index['types'].get(query.activity_type, []))
+        if query.has_path_condition:
+            ordinals = set()
+            for path, runs in index['paths'].items():
+                if self._repo_roots.path_matches(path, query):
+                    ordinals |= self._expand_runs(runs)
+            wanted = ordinals if wanted is None else wanted & ordinals
+        return wanted
+
+    @staticmethod
+    def _expand_runs(runs: List[List[int]]) -> set:
+        """[시작 번호, 길이] 구간 목록을 기록 번호 집합으로 바꿉니다."""
+        ordinals = set()
+        for start, length in runs:
+            ordinals.update(range(start, start + length))
+        return ordinals
+
+    @staticmethod
+    def _record_path(record: Dict[str, Any]) -> Optional[str]:
+        """활동 기록의 파일 경로를 반환합니다."""
+        data = record.get('data')
+        return data.get('file_path') if isinstance(data, dict) else None
+
+    # ------------------------------------------------------------------
+    # 소스 읽기
+    # ------------------------------------------------------------------
+    def _read_source(self,
+                     source_path: Path,
+                     index: Dict[str, Any],
+                     since_key: Optional[str],
+                     ordinals: Optional[set]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """소스에서 (기록 번호, 기록)을 읽습니다. 시각 순서로 기록된 소스는 희소 인덱스로 시작 위치를 건너뜁니다."""
+        ordinal, offset = 0, 0
+        if since_key and index['sparse'] and index['ordered']:
+            position = bisect_left([entry[0] for entry in index['sparse']], since_key)
+            if position > 0:
+                _, ordinal, offset = index['sparse'][position - 1]
+
+        if source_path.name == ActivityLog.LEGACY_FILENAME:
+            records = self._load_legacy(source_path)
+            for number in range(ordinal, len(records)):
+                if ordinals is None or number in ordinals:
+                    yield number, records[number]
+            return
+
+        stream, end = self._open_source(source_path, index)
+        try:
+            stream.seek(offset)
+            position = offset
+            last = max(ordinals) if ordinals else None
+            while position < end:
+                raw_line = stream.readline()
+                if not raw_line.endswith(b'\n'):
+                    break
+                position += len(raw_line)
+                if ordinals is None or ordinal in ordinals:
+                    try:
+                        yield ordinal, json.loads(raw_line)
+                    except ValueError:
+                        pass
+                if last is not None and ordinal >= last:
+                    break
+                ordinal += 1
+        finally:
+            stream.close()
+
+    @staticmethod
+    def _open_source(source_path: Path, index: Dict[str, Any]):
+        """소스를 (스트림, 색인된 끝 위치)로 엽니다. 교체된 구간은 압축을 풀어 읽습니다."""
+        if source_path.name == ActivityLog.ACTIVE_FILENAME:
+            return open(source_path, 'rb'), index['indexed_bytes']
+        with open(source_path, 'rb') as f:
+            data = ContentCodec.decode(f.read())
+        return io.BytesIO(data), len(data)
+
+    @staticmethod
+    def _load_legacy(source_path: Path) -> List[Dict[str, Any]]:
+        """이전 형식(JSON 배열) 활동 로그를 읽습니다."""
+        with open(source_path, 'rb') as f:
+            return json.loads(ContentCodec.decode(f.read()).decode('utf-8'))
+
+    # ------------------------------------------------------------------
+    # 인덱스
+    # ------------------------------------------------------------------
+    def refresh_index(self, date_key: str) -> Dict[str, Dict[str, Any]]:
+        """
+        날짜의 인덱스를 최신 상태로 만들어 반환합니다.
+
+        Args:
+            date_key: 날짜 (YYYY-MM-DD)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 소스 이름 -> 인덱스
+        """
+        return self._load_day_index(date_key)
+
+    def _load_day_index(self, date_key: str) -> Dict[str, Dict[str, Any]]:
+        """날짜 인덱스를 읽고, 바뀐 소스만 다시 (현재 구간은 늘어난 부분만) 색인합니다."""
+        date_dir = self.activity_dir / date_key
+        indexes = self._indexes.get(date_key)
+        if indexes is None:
+            indexes = self._read_index_file(date_dir)
+
+        changed = False
+        current = {}
+        source_paths = self._source_paths(date_dir)
+        for source_path in source_paths:
+            try:
+                stat = source_path.stat()
+            except OSError:
+                continue
+            index = indexes.get(source_path.name)
+            is_active = source_path.name == ActivityLog.ACTIVE_FILENAME
+            file_id = self._active_file_id(stat, source_paths) if is_active else None
+            if index is not None and index.get('file_id') != file_id:
+                # 구간 교체로 다른 파일이 되었으면 이전 인덱스는 쓰지 않음
+                index = None
+            if index is not None and index['size'] == stat.st_size and index['mtime_ns'] == stat.st_mtime_ns:
+                current[source_path.name] = index
+                continue
+            try:
+                if is_active and index is not None and stat.st_size >= index['indexed_bytes']:
+                    # 현재 구간은 뒤에만 추가되므로 늘어난 부분만 색인
+                    self._extend_active_index(source_path, index)
+                else:
+                    index = self._build_index(source_path)
+            except Exception as e:
+                print(f"⚠️ 활동 로그 색인 실패: {source_path} ({e})")
+                continue
+            index['size'] = stat.st_size
+            index['mtime_ns'] = stat.st_mtime_ns
+            if is_active:
+                index['file_id'] = file_id
+            current[source_path.name] = index
+            changed = True
+
+        if changed or len(current) != len(indexes):
+            self._write_index_file(date_dir, current)
+        self._indexes[date_key] = current
+        return current
+
+    @staticmethod
+    def _active_file_id(stat: os.stat_result, source_paths: List[Path]) -> List[Any]:
+        """
+        현재 구간 파일의 식별값을 반환합니다.
+
+        구간 교체는 현재 구간을 새 번호의 구간 파일로 이름만 바꾸고, 다음 기록이 새 파일을 만듭니다.
+        내용 앞부분은 교체 전후에 같을 수 있으므로 파일 자체(장치, inode)와 마지막 구간 번호로 비교합니다.
+        (압축으로 이전 inode가 해제되어 재사용되더라도 구간 번호가 바뀌므로 구분됨)
+
+        Args:
+            stat: 현재 구간 파일의 stat 결과
+            source_paths: 날짜 디렉토리의 소스 파일 목록
+
+        Returns:
+            List[Any]: [장치 번호, inode 번호, 마지막 구간 파일 이름]
+        """
+        segments = [path.name for path in source_paths if ActivityLog.SEGMENT_PATTERN.match(path.name)]
+        return [stat.st_dev, stat.st_ino, segments[-1] if segments else '']
+
+    def _read_index_file(self, date_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """저장된 날짜 인덱스를 읽습니다. (없거나 형식이 다르면 빈 인덱스)"""
+        index_path = date_dir / INDEX_FILENAME
+        if not self.persist_index or not index_path.exists():
+            return {}
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == INDEX_VERSION:
+                return stored['sources']
+        except Exception as e:
+            print(f"⚠️ 활동 로그 인덱스 로드 실패: {index_path} ({e})")
+        return {}
+
+    def _write_index_file(self, date_dir: Path, indexes: Dict[str, Dict[str, Any]]):
+        """날짜 인덱스를 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+        if not self.persist_index:
+            return
+        index_path = date_dir / INDEX_FILENAME
+        tmp_path = index_path.with_name(f"{INDEX_FILENAME}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'sources': indexes}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, index_path)
+        except Exception as e:
+            print(f"⚠️ 활동 로그 인덱스 저장 실패: {index_path} ({e})")
+
+    @staticmethod
+    def _new_index() -> Dict[str, Any]:
+        """빈 소스 인덱스를 만듭니다."""
+        return {'size': 0, 'mtime_ns': 0, 'indexed_bytes': 0, 'count': 0, 'min_ts': None, 'max_ts': None,
+                'ordered': True, 'types': {}, 'paths': {}, 'sparse': []}
+
+    def _add_record(self, index: Dict[str, Any], record: Dict[str, Any], offset: Optional[int]):
+        """기록 하나를 인덱스에 추가합니다."""
+        ordinal = index['count']
+        timestamp = record.get('timestamp', '')
+        if ordinal % self.sparse_interval == 0:
+            index['sparse'].append([timestamp, ordinal, offset or 0])
+        if index['min_ts'] is None or timestamp < index['min_ts']:
+            index['min_ts'] = timestamp
+        if index['max_ts'] is None or timestamp > index['max_ts']:
+            index['max_ts'] = timestamp
+        elif timestamp < index['max_ts']:
+            # 시계가 되돌려졌거나 여러 프로세스가 기록한 경우 희소 인덱스 이분 탐색을 쓸 수 없음
+            index['ordered'] = False
+        self._add_run(index['types'].setdefault(record.get('type', ''), []), ordinal)
+        path = self._record_path(record)
+        if path:
+            self._add_run(index['paths'].setdefault(path, []), ordinal)
+        index['count'] = ordinal + 1
+
+    @staticmethod
+    def _add_run(runs: List[List[int]], ordinal: int):
+        """기록 번호를 추가합니다. 연속된 번호는 하나의 구간 [시작 번호, 길이]로 저장합니다."""
+        if runs and runs[-1][0] + runs[-1][1] == ordinal:
+            runs[-1][1] += 1
+        else:
+            runs.append([ordinal, 1])
+
+    def _build_index(self, source_path: Path) -> Dict[str, Any]:
+        """소스 전체를 색인합니다."""
+        index = self._new_index()
+        if source_path.name == ActivityLog.LEGACY_FILENAME:
+            for record in self._load_legacy(source_path):
+                self._add_record(index, record, None)
+            return index
+        if source_path.name == ActivityLog.ACTIVE_FILENAME:
+            self._extend_active_index(source_path, index)
+            return index
+        stream, end = self._open_source(source_path, index)
+        with stream:
+            self._index_lines(index, stream, 0, end)
+        index['indexed_bytes'] = end
+        return index
+
+    def _extend_active_index(self, source_path: Path, index: Dict[str, Any]):
+        """현재 구간에서 아직 색인하지 않은 뒷부분만 색인합니다."""
+        with open(source_path, 'rb') as f:
+            f.seek(index['indexed_bytes'])
+            index['indexed_bytes'] = self._index_lines(index, f, index['indexed_bytes'], None)
+
+    def _index_lines(self, index: Dict[str, Any], stream, offset: int, end: Optional[int]) -> int:
+        """JSONL 스트림을 색인하고 마지막으로 색인한 위치를 반환합니다. (기록 중인 마지막 줄은 제외)"""
+        for raw_line in stream:
+            if not raw_line.endswith(b'\n') or (end is not None and offset >= end):
+                break
+            try:
+                record = json.loads(raw_line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                self._add_record(index, record, offset)
+            else:
+                # 읽을 때와 번호가 어긋나지 않도록 손상된 줄도 번호를 차지함
+                index['count'] += 1
+            offset += len(raw_line)
+        return offset
@@ -3,13 +3,14 @@
 """
 
 from typing import Any, Dict, List
-import difflib
 from .base_generator import BaseDiffGenerator
+from ..utils.diff_engine import compute_opcodes, unified_diff, DEFAULT_ALGORITHM
 
 class TextDiffGenerator(BaseDiffGenerator):
     """텍스트 파일용 diff 생성기"""
     
-    def __init__(self):
+    def __init__(self, algorithm: str = DEFAULT_ALGORITHM):
+        self.algorithm = algorithm
         self.supported_extensions = {'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yaml', '.yml'}
     
     def can_handle(self, file_extension: str) -> bool:
@@ -29,12 +30,11 @@ class TextDiffGenerator(BaseDiffGenerator):
         if not isinstance(old_content, str) or not isinstance(new_content, str):
             raise ValueError("텍스트 파일 diff 생성기는 문자열 타입만 처리할 수 있습니다.")
         
-        # difflib을 사용하여 diff 생성
-        diff = list(difflib.unified_diff(
-            old_content.splitlines(),
-            new_content.splitlines(),
-            lineterm=''
-        ))
+        # 선택한 알고리즘으로 diff 생성
+        old_lines = old_content.splitlines()
+        new_lines = new_content.splitlines()
+        opcodes = compute_opcodes(old_lines, new_lines, self.algorithm)
+        diff = unified_diff(old_lines, new_lines, opcodes, lineterm='')
         
         return {
             'type': 'text',
@@ -0,0 +1,234 @@
+"""
+파일 이벤트 디바운스 큐
+- 경로별 이벤트 병합 (settle window)
+- 파일 크기/수정 시간 안정성 검사
+- 워커 풀로 작업 전달
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+
+class _PendingJob:
+    """경로별로 대기 중인 작업 정보"""
+
+    __slots__ = ('path', 'event', 'first_seen', 'deadline', 'last_stat', 'event_count')
+
+    def __init__(self, path: str, event: Any, now: float, deadline: float):
+        self.path = path
+        self.event = event
+        self.first_seen = now
+        self.deadline = deadline
+        self.last_stat: Optional[Tuple[int, int]] = None
+        self.event_count = 1
+
+
+class DebouncedEventQueue:
+    """
+    watchdog 이벤트를 경로별로 모았다가 한 번만 처리하는 큐
+    - observer 스레드에서는 등록만 하고 즉시 반환
+    - settle window 동안 추가 이벤트가 없고 파일 크기/수정 시간이 안정되면 워커 풀로 전달
+    - 같은 경로의 작업은 동시에 실행되지 않음
+    """
+
+    def __init__(self,
+                 handler: Callable[[Any], None],
+                 settle_seconds: float = 0.5,
+                 stability_interval: float = 0.2,
+                 max_delay: float = 10.0,
+                 max_workers: int = 4):
+        """
+        Args:
+            handler: 병합된 이벤트를 처리할 콜백 (마지막 이벤트 객체가 전달됨)
+            settle_seconds: 마지막 이벤트 이후 대기 시간 (초)
+            stability_interval: 크기/수정 시간 재확인 간격 (초)
+            max_delay: 파일이 계속 변경되더라도 이 시간이 지나면 강제로 처리 (초)
+            max_workers: 워커 스레드 수
+        """
+        self.handler = handler
+        self.settle_seconds = settle_seconds
+        self.stability_interval = stability_interval
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+
+        self._pending: Dict[str, _PendingJob] = {}
+        self._in_flight: Set[str] = set()
+        self._cond = threading.Condition()
+        self._running = False
+        self._scheduler: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {'received': 0, 'dispatched': 0, 'coalesced': 0}
+
+    def start(self):
+        """스케줄러 스레드와 워커 풀을 시작합니다."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='tracker-worker'
+        )
+        self._scheduler = threading.Thread(
+            target=self._run,
+            name='tracker-debouncer',
+            daemon=True
+        )
+        self._scheduler.start()
+
+    def stop(self, drain: bool = True):
+        """
+        큐를 중지합니다.
+
+        Args:
+            drain: True면 대기 중인 작업을 즉시 처리한 뒤 종료
+        """
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        if self._scheduler:
+            self._scheduler.join()
+
+        if drain:
+            with self._cond:
+                remaining = list(self._pending.values())
+                self._pending.clear()
+            for job in remaining:
+                self._dispatch(job)
+
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def submit(self, event: Any):
+        """
+        이벤트를 등록합니다. observer 스레드에서 호출되므로 I/O 없이 바로 반환합니다.
+
+        Args:
+            event: watchdog 이벤트 (src_path 속성 필요)
+        """
+        path = event.src_path
+        now = time.monotonic()
+        with self._cond:
+            self._stats['received'] += 1
+            job = self._pending.get(path)
+            if job:
+                job.event = event
+                job.deadline = now + self.settle_seconds
+                job.event_count += 1
+                self._stats['coalesced'] += 1
+            else:
+                self._pending[path] = _PendingJob(path, event, now, now + self.settle_seconds)
+            self._cond.notify()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        큐 처리 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 수신/전달/병합된 이벤트 수와 대기 중인 경로 수
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['in_flight'] = len(self._in_flight)
+        return stats
+
+    def _run(self):
+        """settle window가 지난 작업을 골라 안정성 검사 후 워커로 전달합니다."""
+        while True:
+            with self._cond:
+                due = self._wait_for_due_jobs()
+                if due is None:
+                    return
+
+            for job in due:
+                if self._is_stable(job):
+                    self._dispatch(job)
+                else:
+                    self._requeue(job)
+
+    def _wait_for_due_jobs(self) -> Optional[list]:
+        """처리 시점이 된 작업들을 꺼냅니다. (self._cond 보유 상태에서 호출)"""
+        while self._running:
+            now = time.monotonic()
+            due = []
+            next_deadline = None
+            for path, job in self._pending.items():
+                if path in self._in_flight:
+                    continue
+                if job.deadline <= now:
+                    due.append(job)
+                elif next_deadline is None or job.deadline < next_deadline:
+                    next_deadline = job.deadline
+
+            if due:
+                for job in due:
+                    del self._pending[job.path]
+                return due
+
+            timeout = None if next_deadline is None else max(next_deadline - now, 0)
+            self._cond.wait(timeout)
+        return None
+
+    def _is_stable(self, job: _PendingJob) -> bool:
+        """
+        파일 크기와 수정 시간이 직전 확인 때와 같은지 검사합니다.
+        반쯤 쓰인 파일을 읽지 않기 위한 검사이며, 삭제된 파일은 바로 처리합니다.
+        """
+        try:
+            stat = os.stat(job.path)
+        except OSError:
+            return True
+
+        current = (stat.st_size, stat.st_mtime_ns)
+        if job.last_stat == current:
+            return True
+        if time.monotonic() - job.first_seen >= self.max_delay:
+            return True
+        job.last_stat = current
+        return False
+
+    def _requeue(self, job: _PendingJob):
+        """안정되지 않은 작업을 다시 대기열에 넣습니다."""
+        with self._cond:
+            newer = self._pending.get(job.path)
+            if newer:
+                # 그 사이 새 이벤트가 들어왔다면 새 작업에 병합
+                newer.first_seen = min(newer.first_seen, job.first_seen)
+                newer.event_count += job.event_count
+                return
+            job.deadline = time.monotonic() + self.stability_interval
+            self._pending[job.path] = job
+            self._cond.notify()
+
+    def _dispatch(self, job: _PendingJob):
+        """작업을 워커 풀로 전달합니다."""
+        with self._cond:
+            self._in_flight.add(job.path)
+            self._stats['dispatched'] += 1
+        try:
+            future = self._executor.submit(self._execute, job)
+        except RuntimeError:
+            # 워커 풀이 이미 종료된 경우 현재 스레드에서 처리
+            self._execute(job)
+            self._finish(job.path)
+            return
+        future.add_done_callback(lambda _: self._finish(job.path))
+
+    def _execute(self, job: _PendingJob):
+        """핸들러를 호출합니다."""
+        try:
+            self.handler(job.event)
+        except Exception as e:
+            print(f"⚠️ 이벤트 처리 중 오류 발생: {job.path} ({e})")
+
+    def _finish(self, path: str):
+        """같은 경로의 다음 작업이 실행될 수 있도록 표시를 해제합니다."""
+        with self._cond:
+            self._in_flight.discard(path)
+            self._cond.notify()
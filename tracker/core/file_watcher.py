@@ -8,6 +8,7 @@ from watchdog.events import FileSystemEventHandler, FileModifiedEvent
 from pathlib import Path
 from typing import Callable, Optional, List
 from .utils.file_filter import FileFilter
+from .utils.ignore_rules import IgnoreRuleEngine
 from interfaces.file.watcher import FileWatcherInterface
 
 class FileChangeHandler(FileSystemEventHandler):
@@ -17,18 +18,28 @@ class FileChangeHandler(FileSystemEventHandler):
         self.file_filter = file_filter
         self.on_modified = on_modified
         
+    def _refresh_rules(self, event):
+        """.gitignore가 바뀌면 해당 디렉토리의 제외 규칙 캐시를 비웁니다."""
+        path = Path(event.src_path)
+        if path.name == IgnoreRuleEngine.GITIGNORE_FILENAME:
+            self.file_filter.invalidate_rules(path.parent)
+        
     def on_created(self, event):
-        if not event.is_directory and self.file_filter.should_track(Path(event.src_path)):
+        self._refresh_rules(event)
+        if not event.is_directory and self.file_filter.matches(Path(event.src_path)):
             print(f"파일 생성됨: {event.src_path}")
 
     def on_modified(self, event):
-        if not event.is_directory and self.file_filter.should_track(Path(event.src_path)):
+        # 파일 크기 검사(stat)는 워커에서 수행하고 여기서는 경로 규칙만 확인
+        self._refresh_rules(event)
+        if not event.is_directory and self.file_filter.matches(Path(event.src_path)):
             print(f"파일 수정됨: {event.src_path}")
             if self.on_modified:
                 self.on_modified(event)
             
     def on_deleted(self, event):
-        if not event.is_directory and self.file_filter.should_track(Path(event.src_path)):
+        self._refresh_rules(event)
+        if not event.is_directory and self.file_filter.matches(Path(event.src_path)):
             print(f"파일 삭제됨: {event.src_path}")
 
 class FileWatcher(FileWatcherInterface):
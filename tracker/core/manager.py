@@ -5,14 +5,24 @@
 - diff 추적
 """
 
+import os
 from pathlib import Path
+from array import array
 from typing import Optional, Callable, List, Set
 from .utils.backup_manager import BackupManager
 from .utils.file_filter import FileFilter
 from .utils.diff_generator import TextDiffGenerator
+from .utils.file_manifest import FileManifest
+from .utils.dir_scanner import DirectoryScanner
+from .utils.codec import ContentCodec
+from .utils.group_writer import GroupCommitWriter, WriteFailedError
+from .utils.content_hash import compute_content_hash, compute_prefix_hash, decode_text
+from .utils.line_hash import compute_line_hashes
 from .file_watcher import FileWatcher
+from .event_queue import DebouncedEventQueue
 from config import tracker_config
 from .storage import TrackerStorage
+from .sqlite_storage import SQLiteStorage
 from interfaces.diff.generator import DiffGeneratorInterface
 
 class TrackerManager:
@@ -35,20 +45,71 @@ class TrackerManager:
             exclude_dirs=exclude_dirs,
             file_extensions=file_extensions,
             max_file_size=max_file_size,
-            backup_exclude_dir=tracker_config.BACKUP_EXCLUDE_DIR
+            backup_exclude_dir=tracker_config.BACKUP_EXCLUDE_DIR,
+            root_dir=self.watch_dir,
+            ignore_patterns=tracker_config.IGNORE_PATTERNS,
+            use_gitignore=tracker_config.USE_GITIGNORE
+        )
+        # 백업/diff/활동 로그 공통 압축 정책
+        self.codec = ContentCodec(tracker_config.COMPRESSION_POLICY)
+        # 백업/diff/활동 로그 쓰기는 기록 스레드에서 묶어 기록 (이벤트 처리가 디스크 지연을 기다리지 않음)
+        self.writer = GroupCommitWriter(
+            durability=tracker_config.WRITER_DURABILITY,
+            flush_interval=tracker_config.WRITER_FLUSH_INTERVAL,
+            max_queue=tracker_config.WRITER_QUEUE_SIZE,
+            max_batch=tracker_config.WRITER_MAX_BATCH
         )
         self.backup_manager = BackupManager(
             watch_dir=self.watch_dir,
             backup_dir=self.backup_dir,
-            file_filter=self.file_filter
+            file_filter=self.file_filter,
+            keep_history=tracker_config.BACKUP_KEEP_HISTORY,
+            checkpoint_interval=tracker_config.BACKUP_CHECKPOINT_INTERVAL,
+            max_versions=tracker_config.BACKUP_MAX_VERSIONS,
+            max_segments=tracker_config.BACKUP_MAX_SEGMENTS,
+            codec=self.codec,
+            content_cache_bytes=tracker_config.BACKUP_CACHE_BYTES,
+            hash_cache_entries=tracker_config.BACKUP_HASH_CACHE_ENTRIES,
+            writer=self.writer
+        )
+        # 수정 이벤트는 경로별로 병합한 뒤 워커 스레드에서 처리
+        self.event_queue = DebouncedEventQueue(
+            handler=self._on_file_modified,
+            settle_seconds=tracker_config.EVENT_SETTLE_SECONDS,
+            stability_interval=tracker_config.EVENT_STABILITY_INTERVAL,
+            max_delay=tracker_config.EVENT_MAX_DELAY,
+            max_workers=tracker_config.EVENT_WORKERS
         )
         self.file_watcher = FileWatcher(
             watch_dir=self.watch_dir,
             file_filter=self.file_filter,
-            on_modified=self._on_file_modified
+            on_modified=self.event_queue.submit
+        )
+        self.manifest = FileManifest(manifest_dir=self.backup_dir)
+        content_resolver = lambda path, content_hash: self.backup_manager.load_content_by_hash(Path(path), content_hash)
+        if tracker_config.STORAGE_BACKEND == 'sqlite':
+            self.storage = SQLiteStorage(
+                db_path=tracker_config.STORAGE_DIR / tracker_config.SQLITE_DB_NAME,
+                codec=self.codec,
+                content_resolver=content_resolver,
+                batch_size=tracker_config.SQLITE_BATCH_SIZE,
+                flush_interval=tracker_config.SQLITE_FLUSH_INTERVAL
+            )
+        else:
+            self.storage = TrackerStorage(
+                base_dir=tracker_config.STORAGE_DIR,
+                codec=self.codec,
+                content_resolver=content_resolver,
+                activity_segment_bytes=tracker_config.ACTIVITY_SEGMENT_BYTES,
+                activity_rotate_seconds=tracker_config.ACTIVITY_ROTATE_SECONDS,
+                activity_fsync=tracker_config.ACTIVITY_FSYNC,
+                activity_fsync_interval=tracker_config.ACTIVITY_FSYNC_INTERVAL,
+                writer=self.writer
+            )
+        self.diff_generator = TextDiffGenerator(
+            supported_extensions=file_extensions,
+            algorithm=tracker_config.DIFF_ALGORITHM
         )
-        self.storage = TrackerStorage(base_dir=tracker_config.STORAGE_DIR)
-        self.diff_generator = TextDiffGenerator(supported_extensions=file_extensions)
 
     def _on_file_modified(self, event):
         """파일이 수정되었을 때 호출되는 콜백"""
@@ -59,43 +120,63 @@ class TrackerManager:
             print(f"⚠️ 파일이 존재하지 않음 (삭제된 파일일 수 있음): {file_path}")
             return
 
-        # (1) EXCLUDE_DIRS 검사
-        if any(part in tracker_config.EXCLUDE_DIRS for part in file_path.parts):
-            return
-
-        # (2) 확장자 검사
-        if file_path.suffix not in tracker_config.FILE_EXTENSIONS:
-            return
-
-        # (3) 파일 사이즈 검사
+        # 확장자/제외 규칙/파일 크기 검사 (observer 스레드에서는 크기 검사를 생략하므로 여기서 수행)
         try:
-            if file_path.stat().st_size > tracker_config.MAX_FILE_SIZE:
-                return
+            stat = file_path.stat()
         except Exception as e:
             print(f"⚠️ 파일 크기 확인 실패 (삭제된 파일일 수 있음): {file_path} ({e})")
             return
+        if not self.file_filter.should_track(file_path, file_size=stat.st_size):
+            return
 
         try:
-            # 새 내용 읽기
-            new_content = file_path.read_text(encoding='utf-8')
+            # 새 내용은 바이트로 한 번만 읽고 해시부터 비교
+            data = file_path.read_bytes()
+            append_offset = self._find_append_offset(file_path, data)
+            if append_offset:
+                prefix_hash, raw_hash = compute_prefix_hash(data, append_offset)
+                if prefix_hash == self.manifest.get_hash(file_path):
+                    # 이전 내용 뒤에만 추가된 경우 추가된 부분만 처리
+                    self._on_file_appended(file_path, stat, data, append_offset, raw_hash)
+                    return
+            else:
+                raw_hash = compute_content_hash(data)
+            
+            # 기준과 바이트가 같으면 (touch, 변경 없는 저장 등) 디코딩/diff 없이 종료
+            if self.has_backup(file_path) and self._is_same_as_baseline(file_path, len(data), raw_hash):
+                print(f"ℹ️ 변경 없음: {file_path}")
+                self.manifest.update(file_path, stat.st_size, stat.st_mtime_ns, raw_hash)
+                return
+            new_content = decode_text(data)
             
-            # 이전 백업 내용 로드
-            old_content = self.load_backup_content(file_path)
+            # 이전 백업 내용 로드 (해시가 같으면 백업을 읽지 않음)
+            if self.backup_manager.is_same_content(file_path, new_content, raw_hash=raw_hash):
+                old_content = new_content
+            else:
+                old_content = self.load_backup_content(file_path)
             
             # 내용이 변경된 경우에만 처리
             if old_content != new_content:
                 # BASELINE_ONLY_ON_FIRST_SEEN이 True이고 백업이 없는 경우에는 diff를 생성하지 않음
                 if tracker_config.BASELINE_ONLY_ON_FIRST_SEEN and not self.has_backup(file_path):
                     print(f"📝 첫 감지된 파일, diff 생성 생략: {file_path}")
-                    self.update_backup(file_path, new_content)
+                    if self.update_backup(file_path, new_content, raw_hash=raw_hash):
+                        self.manifest.update(file_path, stat.st_size, stat.st_mtime_ns, raw_hash)
                     return
 
-                # diff 생성
-                diff_data = self.diff_generator.generate_diff(old_content, new_content)
+                # diff 생성 (기준 줄 해시는 백업에 저장된 값을 사용)
+                new_line_hashes = compute_line_hashes(new_content.splitlines(keepends=True))
+                diff_data = self.diff_generator.generate_diff(
+                    old_content,
+                    new_content,
+                    old_line_hashes=self.backup_manager.load_line_hashes(file_path),
+                    new_line_hashes=new_line_hashes
+                )
                 formatted_diff = self.diff_generator.format_diff(diff_data)
                 
                 # diff 저장
-                saved_diff = self.storage.save_diff(file_path, old_content, new_content)
+                saved_diff = self.storage.save_diff(file_path, old_content, new_content,
+                                                    opcodes=diff_data.get('opcodes'))
                 if saved_diff:
                     print(f"✅ 변경사항 저장 완료: {saved_diff}")
                     print(formatted_diff)  # diff 내용 출력
@@ -107,32 +188,137 @@ class TrackerManager:
                 else:
                     print(f"⚠️ 변경사항 저장 실패: {file_path}")
                 
-                # 백업 업데이트
-                self.update_backup(file_path, new_content)
+                # 백업 업데이트 (실패하면 매니페스트를 갱신하지 않아 다음 저장에서 다시 비교)
+                if not self.update_backup(file_path, new_content, raw_hash=raw_hash,
+                                          line_hashes=new_line_hashes):
+                    return
             else:
                 print(f"ℹ️ 변경 없음: {file_path}")
+            
+            # 마지막으로 처리한 파일 상태 기록
+            self.manifest.update(file_path, stat.st_size, stat.st_mtime_ns, raw_hash)
                 
         except Exception as e:
             print(f"⚠️ 파일 처리 중 오류 발생: {file_path} ({e})")
 
+    def _find_append_offset(self, file_path: Path, data: bytes) -> int:
+        """
+        추가 저장 여부를 검사할 오프셋을 반환합니다.
+        마지막 백업보다 커졌고 그 끝이 줄바꿈인 경우에만 후보가 됩니다.
+        (앞부분 해시가 같은지는 호출하는 쪽에서 확인)
+        
+        Args:
+            file_path: 파일 경로
+            data: 새 내용 바이트
+            
+        Returns:
+            int: 이전 크기 (후보가 아니면 0)
+        """
+        if not tracker_config.APPEND_FAST_PATH or not self.has_backup(file_path):
+            return 0
+        entry = self.manifest.get_entry(file_path)
+        if entry is None or not 0 < entry['size'] < len(data):
+            return 0
+        # 줄 중간에서 이어 쓴 경우는 마지막 줄이 수정된 것이므로 일반 diff로 처리
+        if data[entry['size'] - 1:entry['size']] != b'\n':
+            return 0
+        return entry['size']
+
+    def _on_file_appended(self, file_path: Path, stat: os.stat_result, data: bytes, offset: int, raw_hash: str):
+        """
+        뒤에 내용만 추가된 파일을 처리합니다.
+        이전 내용을 읽거나 비교하지 않고 추가된 부분만 diff/백업에 기록합니다.
+        
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과
+            data: 새 내용 바이트
+            offset: 추가가 시작된 바이트 위치
+            raw_hash: 새 내용 전체의 원본 해시
+        """
+        appended = decode_text(data[offset:])
+        diff_data = self.diff_generator.generate_append_diff(appended)
+        
+        saved_diff = self.storage.save_append_diff(file_path, offset, appended)
+        if saved_diff:
+            print(f"✅ 추가된 내용 저장 완료: {saved_diff} ({len(data) - offset}바이트)")
+            self.storage.log_activity('file_modified', {
+                'file_path': str(file_path),
+                'diff_path': saved_diff,
+                'diff_summary': diff_data['summary']
+            })
+        else:
+            print(f"⚠️ 변경사항 저장 실패: {file_path}")
+        
+        # 줄바꿈 정규화가 없으면 디코딩한 내용의 해시는 원본 해시와 같음
+        content_hash = raw_hash if b'\r' not in data else compute_content_hash(decode_text(data).encode('utf-8'))
+        if self.backup_manager.append_backup(file_path, appended, content_hash, raw_hash=raw_hash):
+            self.manifest.update(file_path, stat.st_size, stat.st_mtime_ns, raw_hash)
+
+    def _is_same_as_baseline(self, file_path: Path, size: int, raw_hash: str) -> bool:
+        """
+        원본 바이트가 마지막 백업 기준과 같은지 크기와 해시로 확인합니다.
+        
+        Args:
+            file_path: 파일 경로
+            size: 읽은 바이트 수
+            raw_hash: 원본 바이트 해시
+            
+        Returns:
+            bool: 같으면 True
+        """
+        # 매니페스트에는 마지막으로 백업한 원본의 크기/해시가 기록되어 있음
+        entry = self.manifest.get_entry(file_path)
+        if entry is not None and entry['size'] == size and entry['hash'] == raw_hash:
+            return True
+        # 매니페스트 기록이 없거나 오래된 경우 해시 캐시로 확인
+        return self.backup_manager.is_same_raw(file_path, raw_hash)
+
     def _backup_existing_files(self):
-        """현재 존재하는 파일들의 초기 백업을 수행합니다."""
+        """
+        현재 존재하는 파일들의 초기 백업을 수행합니다.
+        매니페스트와 크기/수정 시간이 같은 파일은 읽지 않고 건너뛰며,
+        stat만 바뀌고 내용이 같은 파일은 다시 백업하지 않습니다.
+        """
         print("📦 기존 파일들의 초기 백업을 시작합니다...")
+        seen_paths = []
+        skipped = 0
+        updated = 0
         
-        for ext in self.file_filter.get_file_extensions():
-            for file_path in self.watch_dir.rglob(f"*{ext}"):
-                # 제외 디렉토리 검사
-                if not self.file_filter.should_track(file_path):
+        scanner = DirectoryScanner(
+            root=self.watch_dir,
+            file_filter=self.file_filter,
+            max_workers=tracker_config.SCAN_WORKERS
+        )
+        
+        for scan_entry in scanner.scan():
+            file_path = scan_entry.path
+            seen_paths.append(str(file_path))
+            
+            try:
+                # 스캔 중 얻은 stat 결과를 그대로 사용
+                stat = scan_entry.stat()
+                has_backup = self.backup_manager.has_backup(file_path)
+                if has_backup and self.manifest.is_unchanged(file_path, stat):
+                    skipped += 1
                     continue
                 
                 # 파일 내용 읽기 및 백업
-                try:
-                    content = file_path.read_text(encoding='utf-8')
-                    self.backup_manager.update_backup(file_path, content)
-                except Exception as e:
-                    print(f"⚠️ 파일 백업 실패: {file_path} ({e})")
+                data = file_path.read_bytes()
+                content_hash = compute_content_hash(data)
+                if not has_backup or content_hash != self.manifest.get_hash(file_path):
+                    if not self.backup_manager.update_backup(file_path, decode_text(data), raw_hash=content_hash):
+                        continue
+                    updated += 1
+                else:
+                    skipped += 1
+                self.manifest.update(file_path, stat.st_size, stat.st_mtime_ns, content_hash)
+            except Exception as e:
+                print(f"⚠️ 파일 백업 실패: {file_path} ({e})")
         
-        print("📦 초기 백업이 완료되었습니다.")
+        removed = self.manifest.prune(seen_paths)
+        self._save_manifest()
+        print(f"📦 초기 백업이 완료되었습니다. (갱신 {updated}개, 변경 없음 {skipped}개, 삭제된 파일 {removed}개)")
 
     def start(self):
         """파일 변경 감시를 시작합니다."""
@@ -141,23 +327,61 @@ class TrackerManager:
         self.file_filter.cleanup_backup_files(self.backup_dir)
         print("✅ 백업 파일 정리가 완료되었습니다.")
         
+        # 기록 스레드 시작
+        self.writer.start()
+        
         # 초기 백업 수행
         self._backup_existing_files()
         
+        # 이벤트 처리 워커 시작
+        self.event_queue.start()
+        
         # 파일 감시 시작
         self.file_watcher.start()
 
     def stop(self):
         """파일 변경 감시를 중지합니다."""
         self.file_watcher.stop()
+        self.event_queue.stop()
+        self._save_manifest()
+        self.backup_manager.close()
+        self.storage.close()
+        self.writer.close()
+        
+        cache_stats = self.backup_manager.get_cache_stats()['content']
+        print(f"📊 기준 내용 캐시: 적중 {cache_stats['hits']}회, 실패 {cache_stats['misses']}회, "
+              f"제거 {cache_stats['evictions']}회, 사용 {cache_stats['bytes']}바이트")
+        writer_stats = self.writer.get_stats()
+        print(f"📊 그룹 커밋: 쓰기 {writer_stats['ops']}건, 묶음 {writer_stats['commits']}회, "
+              f"최대 묶음 {writer_stats['max_batch']}건, 실패 {writer_stats['errors']}건")
+
+    def _save_manifest(self):
+        """
+        기록 대기 중인 백업을 모두 기록한 뒤 매니페스트를 저장합니다.
+        기록하지 못한 쓰기가 있었으면 저장하지 않아, 다음 시작 때 마지막으로 저장된
+        매니페스트와 비교하여 그 뒤에 바뀐 파일을 다시 백업합니다.
+        """
+        try:
+            self.writer.flush()
+        except WriteFailedError as e:
+            print(f"⚠️ 백업 기록 실패: {e}")
+        if self.writer.get_stats()['errors']:
+            print("⚠️ 기록하지 못한 백업이 있어 매니페스트를 저장하지 않습니다.")
+            return
+        self.manifest.save()
 
     def load_backup_content(self, file_path: Path) -> str:
         """파일의 백업 내용을 로드합니다."""
         return self.backup_manager.load_backup_content(file_path)
 
-    def update_backup(self, file_path: Path, new_content: str):
+    def update_backup(self,
+                      file_path: Path,
+                      new_content: str,
+                      raw_hash: Optional[str] = None,
+                      line_hashes: Optional[array] = None) -> Optional[str]:
         """파일의 백업을 업데이트합니다."""
-        self.backup_manager.update_backup(file_path, new_content)
+        return self.backup_manager.update_backup(file_path, new_content, raw_hash=raw_hash,
+                                                 line_hashes=line_hashes)
 
     def has_backup(self, file_path: Path) -> bool:
         """파일의 백업이 존재하는지 확인합니다."""
@@ -0,0 +1,550 @@
+"""
+SQLite 저장소 구현
+- diff, 활동 로그, 요약을 하나의 SQLite 데이터베이스에 저장
+- WAL 모드 (쓰는 동안에도 읽기 가능)
+- 고정 SQL 문 사용 (sqlite3 문장 캐시로 준비된 문장 재사용)
+- 기록은 모았다가 한 트랜잭션으로 일괄 삽입 (오래된 대기 기록은 백그라운드 스레드가 삽입)
+- (날짜, 경로, 종류) 인덱스로 하루치 diff/활동 조회
+- 시각 인덱스로 기간/경로/유형 조건 활동 조회 (커서 기반 페이지 조회)
+"""
+
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from interfaces.storage.storage import StorageInterface
+from .activity_query import ActivityFilter, RepoRoots
+from .utils.codec import ContentCodec
+from .utils.patch import DiffRecord, ContentResolver, build_patch_record, build_append_record
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS diffs (
+    id INTEGER PRIMARY KEY,
+    ref TEXT,
+    date TEXT NOT NULL,
+    path TEXT NOT NULL,
+    type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    record BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_diffs_date_path_type ON diffs (date, path, type);
+
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    path TEXT,
+    type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_activities_date_type ON activities (date, type);
+CREATE INDEX IF NOT EXISTS idx_activities_date_path ON activities (date, path);
+CREATE INDEX IF NOT EXISTS idx_activities_timestamp ON activities (timestamp);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summaries_date ON summaries (date);
+"""
+
+_INSERT_DIFF = "INSERT INTO diffs (ref, date, path, type, timestamp, record) VALUES (?, ?, ?, ?, ?, ?)"
+_INSERT_ACTIVITY = "INSERT INTO activities (date, path, type, timestamp, data) VALUES (?, ?, ?, ?, ?)"
+_INSERT_SUMMARY = "INSERT INTO summaries (date, timestamp, content, metadata) VALUES (?, ?, ?, ?)"
+
+DateLike = Union[datetime, str]
+
+
+def _date_key(date: DateLike) -> str:
+    """datetime 또는 'YYYY-MM-DD' 문자열을 날짜 키로 변환합니다."""
+    return date.strftime("%Y-%m-%d") if isinstance(date, datetime) else str(date)
+
+
+class SQLiteStorage(StorageInterface):
+    """
+    SQLite 기반 저장소
+    - tracker의 StorageInterface를 구현하며, date에 'YYYY-MM-DD' 문자열과
+      file_path/activity_type 필터도 받으므로 storage.interfaces.StorageInterface와도 호환
+    - diff 참조는 '{데이터베이스 경로}#{diff 키}' 형식의 경로
+      (키는 저장 즉시 만들고 id는 삽입할 때 SQLite가 할당하므로 여러 프로세스가 같은 파일을 써도 겹치지 않음)
+    """
+
+    def __init__(self,
+                 db_path: Path,
+                 codec: Optional[ContentCodec] = None,
+                 content_resolver: Optional[ContentResolver] = None,
+                 batch_size: int = 256,
+                 flush_interval: float = 1.0):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+            codec: diff 기록 압축 코덱 (None이면 압축하지 않음)
+            content_resolver: (파일 경로, 내용 해시)로 백업 내용을 찾는 함수 (diff 전체 내용 복원용)
+            batch_size: 이만큼 모이면 한 트랜잭션으로 삽입
+            flush_interval: 가장 오래된 대기 기록이 이 시간(초)을 넘으면 백그라운드 스레드가 삽입
+        """
+        self.db_path = db_path
+        self.codec = codec or ContentCodec()
+        self.content_resolver = content_resolver
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 쓰기는 연결 하나를 잠금으로 보호하고, 읽기는 스레드별 연결을 사용
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._readers = threading.local()
+        self._repo_roots = RepoRoots()
+
+        # 일괄 삽입 대기 기록
+        self._pending: Dict[str, List[Tuple]] = {_INSERT_DIFF: [], _INSERT_ACTIVITY: [], _INSERT_SUMMARY: []}
+        self._pending_count = 0
+        self._oldest_pending = 0.0
+
+        # 새 기록이 없어도 오래된 대기 기록이 삽입되도록 주기적으로 확인
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self.flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name='sqlite-flush', daemon=True)
+            self._flusher.start()
+
+    def _migrate(self):
+        """이전 버전 데이터베이스에 없는 열과 인덱스를 추가합니다."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(diffs)")}
+        if 'ref' not in columns:
+            # 이전 버전의 diff는 id로 참조
+            self._conn.execute("ALTER TABLE diffs ADD COLUMN ref TEXT")
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_diffs_ref ON diffs (ref)")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """WAL 모드 연결을 엽니다."""
+        conn = sqlite3.connect(str(self.db_path), isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """현재 스레드의 읽기 연결을 반환합니다."""
+        conn = getattr(self._readers, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._readers.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # 일괄 삽입
+    # ------------------------------------------------------------------
+    def _enqueue(self, statement: str, row: Tuple):
+        """기록을 대기열에 넣고, 가득 찼거나 오래되었으면 삽입합니다. (잠금을 잡은 상태에서 호출)"""
+        now = time.monotonic()
+        if not self._pending_count:
+            self._oldest_pending = now
+        self._pending[statement].append(row)
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size or now - self._oldest_pending >= self.flush_interval:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """대기 중인 기록을 한 트랜잭션으로 삽입합니다. (잠금을 잡은 상태에서 호출)"""
+        if not self._pending_count:
+            return
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for statement, rows in self._pending.items():
+                if rows:
+                    self._conn.executemany(statement, rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        for rows in self._pending.values():
+            rows.clear()
+        self._pending_count = 0
+
+    def _flush_loop(self):
+        """가장 오래된 대기 기록이 flush_interval을 넘으면 삽입합니다. (백그라운드 스레드)"""
+        timeout = self.flush_interval
+        while not self._closed.wait(timeout):
+            timeout = self.flush_interval
+            with self._lock:
+                if not self._pending_count:
+                    continue
+                age = time.monotonic() - self._oldest_pending
+                if age < self.flush_interval:
+                    timeout = self.flush_interval - age
+                    continue
+                try:
+                    self._flush_locked()
+                except Exception as e:
+                    print(f"⚠️ 저장소 기록 실패: {self.db_path} ({e})")
+
+    def flush(self):
+        """대기 중인 기록을 모두 삽입합니다."""
+        with self._lock:
+            try:
+                self._flush_locked()
+            except Exception as e:
+                print(f"⚠️ 저장소 기록 실패: {self.db_path} ({e})")
+
+    def close(self):
+        """대기 중인 기록을 삽입하고 연결을 닫습니다."""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        with self._lock:
+            self._conn.close()
+        reader = getattr(self._readers, 'conn', None)
+        if reader is not None:
+            reader.close()
+            self._readers.conn = None
+
+    # ------------------------------------------------------------------
+    # diff
+    # ------------------------------------------------------------------
+    def save_diff(self,
+                  file_path: Path,
+                  old_content: str,
+                  new_content: str,
+                  opcodes: Optional[List[Tuple[str, int, int, int, int]]] = None,
+                  context: int = 3) -> Optional[str]:
+        """
+        파일의 변경사항을 저장합니다. (hunk와 이전/새 내용 해시만 저장)
+
+        Args:
+            file_path: 변경된 파일 경로
+            old_content: 이전 파일 내용
+            new_content: 새로운 파일 내용
+            opcodes: 이미 계산한 편집 명령 (없으면 계산)
+            context: hunk 문맥 줄 수
+
+        Returns:
+            Optional[str]: 저장된 diff 참조 (실패 시 None)
+        """
+        try:
+            return self._save_diff_record(build_patch_record(file_path, old_content, new_content, opcodes, context))
+        except Exception as e:
+            print(f"⚠️ diff 저장 실패: {file_path} ({e})")
+            return None
+
+    def save_append_diff(self, file_path: Path, offset: int, appended_content: str) -> Optional[str]:
+        """
+        뒤에 추가된 내용만 diff로 저장합니다.
+
+        Args:
+            file_path: 변경된 파일 경로
+            offset: 추가가 시작된 위치 (원본 파일의 바이트 오프셋)
+            appended_content: 추가된 내용
+
+        Returns:
+            Optional[str]: 저장된 diff 참조 (실패 시 None)
+        """
+        try:
+            return self._save_diff_record(build_append_record(file_path, offset, appended_content))
+        except Exception as e:
+            print(f"⚠️ diff 저장 실패: {file_path} ({e})")
+            return None
+
+    def _save_diff_record(self, record: Dict[str, Any]) -> str:
+        """diff 기록을 삽입 대기열에 넣고 참조를 반환합니다."""
+        data = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        stored = self.codec.encode(data, 'diff')
+        date = record['timestamp'][:10]
+        # id는 다른 프로세스와 겹칠 수 있으므로 미리 정하지 않고 고유 키로 참조
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._enqueue(_INSERT_DIFF, (key, date, record['file_path'], record['type'],
+                                         record['timestamp'], stored))
+        return self._diff_ref(key)
+
+    def _diff_ref(self, key: Union[int, str]) -> str:
+        """diff 키의 참조 경로를 만듭니다."""
+        return f"{self.db_path}#{key}"
+
+    @staticmethod
+    def _diff_key(diff_path: Union[Path, str]) -> str:
+        """참조 경로에서 diff 키를 꺼냅니다."""
+        return str(diff_path).rsplit('#', 1)[1]
+
+    def get_diffs(self, date: DateLike, file_path: Optional[Path] = None) -> List[Path]:
+        """
+        특정 날짜의 diff 참조 목록을 반환합니다.
+
+        Args:
+            date: 날짜 (datetime 또는 'YYYY-MM-DD')
+            file_path: 이 파일의 diff만 조회 (기본값: 전체)
+
+        Returns:
+            List[Path]: diff 참조 목록 (open_diff/load_diff로 읽음)
+        """
+        self.flush()
+        if file_path is None:
+            rows = self._reader().execute("SELECT COALESCE(ref, id) FROM diffs WHERE date = ? ORDER BY id",
+                                          (_date_key(date),))
+        else:
+            rows = self._reader().execute("SELECT COALESCE(ref, id) FROM diffs WHERE date = ? AND path = ? ORDER BY id",
+                                          (_date_key(date), str(file_path)))
+        return [Path(self._diff_ref(key)) for (key,) in rows]
+
+    def iter_diffs(self,
+                   date: DateLike,
+                   file_path: Optional[Path] = None,
+                   diff_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        특정 날짜의 diff 기록을 순서대로 하나씩 반환합니다.
+
+        Args:
+            date: 날짜 (datetime 또는 'YYYY-MM-DD')
+            file_path: 이 파일의 diff만 조회 (기본값: 전체)
+            diff_type: 'patch' 또는 'append'만 조회 (기본값: 전체)
+
+        Returns:
+            Iterator[Dict[str, Any]]: diff 기록
+        """
+        self.flush()
+        sql = "SELECT record FROM diffs WHERE date = ?"
+        params: List[Any] = [_date_key(date)]
+        if file_path is not None:
+            sql += " AND path = ?"
+            params.append(str(file_path))
+        if diff_type is not None:
+            sql += " AND type = ?"
+            params.append(diff_type)
+        cursor = self._reader().execute(sql + " ORDER BY id", params)
+        for (stored,) in cursor:
+            yield json.loads(self.codec.decode(stored).decode('utf-8'))
+
+    def open_diff(self, diff_path: Union[Path, str]) -> Optional[DiffRecord]:
+        """
+        저장된 diff를 읽습니다. 전체 내용은 old_content/new_content에 접근할 때 복원됩니다.
+
+        Args:
+            diff_path: diff 참조
+
+        Returns:
+            Optional[DiffRecord]: diff 기록 (실패 시 None)
+        """
+        record = self.load_diff(diff_path)
+        return DiffRecord(record, self.content_resolver) if record is not None else None
+
+    def load_diff(self, diff_path: Union[Path, str]) -> Optional[Dict[str, Any]]:
+        """
+        저장된 diff 기록을 읽습니다.
+
+        Args:
+            diff_path: diff 참조
+
+        Returns:
+            Optional[Dict[str, Any]]: diff 내용 (실패 시 None)
+        """
+        try:
+            self.flush()
+            key = self._diff_key(diff_path)
+            if key.isdigit():
+                # 이전 버전에서 id로 만든 참조
+                row = self._reader().execute("SELECT record FROM diffs WHERE id = ?", (int(key),)).fetchone()
+            else:
+                row = self._reader().execute("SELECT record FROM diffs WHERE ref = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            return json.loads(self.codec.decode(row[0]).decode('utf-8'))
+        except Exception as e:
+            print(f"⚠️ diff 로드 실패: {diff_path} ({e})")
+            return None
+
+    # ------------------------------------------------------------------
+    # 활동 로그
+    # ------------------------------------------------------------------
+    def log_activity(self, activity_type: str, data: Dict[str, Any]):
+        """
+        활동을 로그에 기록합니다.
+
+        Args:
+            activity_type: 활동 유형
+            data: 활동 데이터 (file_path가 있으면 경로 인덱스에 기록)
+        """
+        try:
+            now = datetime.now()
+            row = (now.strftime("%Y-%m-%d"), data.get('file_path'), activity_type, now.isoformat(),
+                   json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            with self._lock:
+                self._enqueue(_INSERT_ACTIVITY, row)
+        except Exception as e:
+            print(f"⚠️ 활동 로그 기록 실패: {activity_type} ({e})")
+
+    def get_activities(self, date: DateLike, activity_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        특정 날짜의 활동 로그를 반환합니다. (기록을 하나씩 읽음)
+
+        Args:
+            date: 날짜 (datetime 또는 'YYYY-MM-DD')
+            activity_type: 이 유형의 활동만 조회 (기본값: 전체)
+
+        Returns:
+            Iterator[Dict[str, Any]]: 활동 로그 (오래된 순서)
+        """
+        self.flush()
+        if activity_type is None:
+            cursor = self._reader().execute(
+                "SELECT type, data, timestamp FROM activities WHERE date = ? ORDER BY id",
+                (_date_key(date),))
+        else:
+            cursor = self._reader().execute(
+                "SELECT type, data, timestamp FROM activities WHERE date = ? AND type = ? ORDER BY id",
+                (_date_key(date), activity_type))
+        return ({'type': row[0], 'data': json.loads(row[1]), 'timestamp': row[2]} for row in cursor)
+
+    def query_activities(self, query: ActivityFilter) -> Iterator[Dict[str, Any]]:
+        """
+        조건에 맞는 활동 로그를 여러 날짜에 걸쳐 조회합니다.
+
+        Args:
+            query: 조회 조건 (시간 범위, 파일 경로 접두, 활동 유형, 저장소)
+
+        Returns:
+            Iterator[Dict[str, Any]]: 활동 로그 (오래된 순서)
+        """
+        return (record for _, record in self._query_activities(query))
+
+    def page_activities(self,
+                        query: ActivityFilter,
+                        limit: int,
+                        cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        조건에 맞는 활동 로그를 한 페이지만 반환합니다.
+
+        Args:
+            query: 조회 조건
+            limit: 페이지 크기
+            cursor: 이전 페이지가 반환한 커서 (첫 페이지는 None)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (활동 기록 목록, 다음 페이지 커서 - 마지막이면 None)
+        """
+        # 커서는 '마지막 기록 시각|마지막 기록 id'
+        after = None
+        if cursor:
+            timestamp, _, last_id = cursor.rpartition('|')
+            after = (timestamp, int(last_id))
+
+        records: List[Dict[str, Any]] = []
+        last = after
+        for position, record in self._query_activities(query, after):
+            if len(records) == limit:
+                return records, f"{last[0]}|{last[1]}"
+            records.append(record)
+            last = position
+        return records, None
+
+    def _query_activities(self,
+                          query: ActivityFilter,
+                          after: Optional[Tuple[str, int]] = None) -> Iterator[Tuple[Tuple[str, int], Dict[str, Any]]]:
+        """조건에 맞는 ((시각, id), 기록)을 시각 순서로 반환합니다."""
+        self.flush()
+        conditions: List[str] = []
+        params: List[Any] = []
+        if query.since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(query.since_key)
+        if query.until is not None:
+            conditions.append("timestamp <= ?")
+            params.append(query.until_key)
+        if after is not None:
+            conditions.append("(timestamp > ? OR (timestamp = ? AND id > ?))")
+            params.extend([after[0], after[0], after[1]])
+        if query.activity_type:
+            conditions.append("type = ?")
+            params.append(query.activity_type)
+        if query.path_prefix is not None:
+            conditions.append("substr(path, 1, ?) = ?")
+            params.extend([len(query.path_prefix), query.path_prefix])
+        where = " AND ".join(conditions) or "1"
+        cursor = self._reader().execute(
+            f"SELECT id, path, type, data, timestamp FROM activities WHERE {where} ORDER BY timestamp, id", params)
+        for activity_id, path, activity_type, data, timestamp in cursor:
+            # 저장소 조건은 .git 위치를 확인해야 하므로 읽은 뒤 비교
+            if query.repo is not None and not self._repo_roots.path_matches(path, query):
+                continue
+            yield (timestamp, activity_id), {'type': activity_type, 'data': json.loads(data), 'timestamp': timestamp}
+
+    # ------------------------------------------------------------------
+    # 요약
+    # ------------------------------------------------------------------
+    def save_summary(self, date: DateLike, summary: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        요약을 저장합니다.
+
+        Args:
+            date: 요약 대상 날짜
+            summary: 요약 내용
+            metadata: 요약 메타데이터
+
+        Returns:
+            Optional[str]: 저장된 날짜 키 (실패 시 None)
+        """
+        try:
+            row = (_date_key(date), datetime.now().isoformat(), summary,
+                   json.dumps(metadata or {}, ensure_ascii=False, separators=(',', ':')))
+            with self._lock:
+                self._enqueue(_INSERT_SUMMARY, row)
+            return row[0]
+        except Exception as e:
+            print(f"⚠️ 요약 저장 실패: {date} ({e})")
+            return None
+
+    def get_summaries(self, date: DateLike) -> List[Dict[str, Any]]:
+        """
+        특정 날짜의 요약 목록을 반환합니다.
+
+        Args:
+            date: 날짜 (datetime 또는 'YYYY-MM-DD')
+
+        Returns:
+            List[Dict[str, Any]]: [{content, metadata, timestamp}] (오래된 순서)
+        """
+        self.flush()
+        rows = self._reader().execute(
+            "SELECT content, metadata, timestamp FROM summaries WHERE date = ? ORDER BY id",
+            (_date_key(date),))
+        return [{'content': row[0], 'metadata': json.loads(row[1]), 'timestamp': row[2]} for row in rows]
+
+    # ------------------------------------------------------------------
+    # 정리
+    # ------------------------------------------------------------------
+    def cleanup_old_data(self, days: int):
+        """
+        오래된 데이터를 정리합니다.
+
+        Args:
+            days: 보관할 일수
+        """
+        try:
+            # 날짜 디렉토리 정리와 같이 (지금 - 날짜).days > days 인 날짜를 삭제
+            cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            with self._lock:
+                self._flush_locked()
+                self._conn.execute("BEGIN IMMEDIATE")
+                for table in ('diffs', 'activities', 'summaries'):
+                    self._conn.execute(f"DELETE FROM {table} WHERE date < ?", (cutoff,))
+                self._conn.execute("COMMIT")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            print(f"⚠️ 오래된 데이터 정리 실패: {e}")
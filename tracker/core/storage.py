@@ -1,68 +1,167 @@
 """
 Tracker 모듈의 저장소 구현
 - 파일 변경사항 저장
-- 활동 로깅
+- 활동 로깅 (append-only JSONL, 구간 교체)
+- 압축 코덱 적용 (헤더가 없는 이전 평문 파일도 읽기 가능)
+- diff는 전체 내용 대신 패치(hunk)와 내용 해시로 저장
+- 쓰기는 그룹 커밋 기록기를 거쳐 백그라운드에서 묶어 기록
 """
 
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import json
 from datetime import datetime
 import hashlib
 import shutil
+import threading
 from interfaces.storage.storage import StorageInterface
+from .utils.codec import ContentCodec
+from .utils.activity_log import ActivityLog
+from .activity_query import ActivityQuery, ActivityFilter
+from .utils.group_writer import GroupCommitWriter
+from .utils.patch import DiffRecord, ContentResolver, build_patch_record, build_append_record
 
 class TrackerStorage(StorageInterface):
     """Tracker 모듈의 저장소 구현"""
     
-    def __init__(self, base_dir: Path):
+    def __init__(self,
+                 base_dir: Path,
+                 codec: Optional[ContentCodec] = None,
+                 content_resolver: Optional[ContentResolver] = None,
+                 activity_segment_bytes: int = 8 * 1024 * 1024,
+                 activity_rotate_seconds: Optional[float] = 3600.0,
+                 activity_fsync: str = 'interval',
+                 activity_fsync_interval: float = 1.0,
+                 writer: Optional[GroupCommitWriter] = None):
+        """
+        Args:
+            base_dir: 저장소 기본 디렉토리
+            codec: diff/활동 로그 압축 코덱 (None이면 압축하지 않음)
+            content_resolver: (파일 경로, 내용 해시)로 백업 내용을 찾는 함수 (diff 전체 내용 복원용)
+            activity_segment_bytes: 활동 로그 구간 최대 크기
+            activity_rotate_seconds: 활동 로그 구간 교체 주기 (초)
+            activity_fsync: 활동 로그 fsync 정책 ('always', 'interval', 'never')
+            activity_fsync_interval: 'interval' 정책의 fsync 간격 (초)
+            writer: diff/활동 로그 쓰기를 모아 기록할 그룹 커밋 기록기 (None이면 바로 기록)
+        """
         self.base_dir = base_dir
+        self.codec = codec or ContentCodec()
+        self.content_resolver = content_resolver
+        self.writer = writer or GroupCommitWriter()
         self.diff_dir = base_dir / "diffs"
         self.activity_dir = base_dir / "activities"
+        # 여러 워커가 동시에 diff 경로를 만들 때 같은 경로를 받지 않도록 보호
+        self._path_lock = threading.Lock()
+        # 경로를 정했지만 아직 기록을 요청하지 않은 diff 경로
+        self._reserved_paths = set()
         
         # 필요한 디렉토리 생성
         self.diff_dir.mkdir(parents=True, exist_ok=True)
         self.activity_dir.mkdir(parents=True, exist_ok=True)
         
-    def save_diff(self, file_path: Path, old_content: str, new_content: str) -> Optional[str]:
+        # 활동 로그는 날짜별 JSONL 파일에 한 줄씩 추가
+        self.activity_log = ActivityLog(
+            self.activity_dir,
+            codec=self.codec,
+            max_segment_bytes=activity_segment_bytes,
+            rotate_seconds=activity_rotate_seconds,
+            fsync=activity_fsync,
+            fsync_interval=activity_fsync_interval,
+            writer=self.writer
+        )
+        # 기간/경로/유형 조건 조회 (날짜 디렉토리에 인덱스를 두고 재사용)
+        self.activity_query = ActivityQuery(self.activity_dir)
+    
+    def _write_json(self, path: Path, obj: Any, data_class: str):
+        """JSON을 코덱으로 인코딩하여 저장합니다."""
+        data = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.writer.write(path, self.codec.encode(data, data_class))
+    
+    def _read_json(self, path: Path) -> Any:
+        """코덱으로 저장된 JSON(또는 이전 평문 JSON)을 읽습니다. (기록 대기 중인 내용 포함)"""
+        stored = self.writer.pending(path)
+        if stored is None:
+            with open(path, 'rb') as f:
+                stored = f.read()
+        return json.loads(self.codec.decode(stored).decode('utf-8'))
+        
+    def save_diff(self,
+                  file_path: Path,
+                  old_content: str,
+                  new_content: str,
+                  opcodes: Optional[List[Tuple[str, int, int, int, int]]] = None,
+                  context: int = 3) -> Optional[str]:
         """
         파일의 변경사항을 저장합니다.
+        전체 내용 대신 unified hunk와 이전/새 내용 해시만 저장하고,
+        전체 내용은 open_diff()로 읽을 때 백업 저장소에서 복원합니다.
         
         Args:
             file_path: 변경된 파일 경로
             old_content: 이전 파일 내용
             new_content: 새로운 파일 내용
+            opcodes: 이미 계산한 편집 명령 (없으면 계산)
+            context: hunk 문맥 줄 수
             
         Returns:
             Optional[str]: 저장된 diff 파일 경로 (실패 시 None)
         """
         try:
-            # 날짜별 디렉토리 생성
-            date_dir = self.diff_dir / datetime.now().strftime("%Y-%m-%d")
-            date_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 파일명 생성 (타임스탬프 포함)
-            timestamp = datetime.now().strftime("%H-%M-%S")
-            diff_filename = f"{file_path.stem}_{timestamp}.diff"
-            diff_path = date_dir / diff_filename
-            
             # diff 내용 저장
-            diff_content = {
-                'file_path': str(file_path),
-                'old_content': old_content,
-                'new_content': new_content,
-                'timestamp': datetime.now().isoformat()
-            }
+            diff_content = build_patch_record(file_path, old_content, new_content, opcodes, context)
+            
+            return str(self._write_new_diff(file_path, diff_content))
             
-            with open(diff_path, 'w', encoding='utf-8') as f:
-                json.dump(diff_content, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"⚠️ diff 저장 실패: {file_path} ({e})")
+            return None
+    
+    def save_append_diff(self, file_path: Path, offset: int, appended_content: str) -> Optional[str]:
+        """
+        뒤에 추가된 내용만 diff로 저장합니다. (이전/새 내용 전체를 저장하지 않음)
+        
+        Args:
+            file_path: 변경된 파일 경로
+            offset: 추가가 시작된 위치 (원본 파일의 바이트 오프셋)
+            appended_content: 추가된 내용
             
-            return str(diff_path)
+        Returns:
+            Optional[str]: 저장된 diff 파일 경로 (실패 시 None)
+        """
+        try:
+            diff_content = build_append_record(file_path, offset, appended_content)
+            return str(self._write_new_diff(file_path, diff_content))
             
         except Exception as e:
             print(f"⚠️ diff 저장 실패: {file_path} ({e})")
             return None
     
+    def _write_new_diff(self, file_path: Path, diff_content: Dict[str, Any]) -> Path:
+        """날짜별 디렉토리 아래에 겹치지 않는 새 diff 파일 경로를 만들어 기록합니다."""
+        # 날짜별 디렉토리 생성
+        date_dir = self.diff_dir / datetime.now().strftime("%Y-%m-%d")
+        date_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 파일명 생성 (타임스탬프 포함)
+        # 이름이 같은 다른 경로의 파일(예: a/__init__.py, b/__init__.py)과 겹치지 않도록 경로 해시를 붙임
+        timestamp = datetime.now().strftime("%H-%M-%S-%f")
+        path_hash = hashlib.blake2b(str(file_path).encode('utf-8'), digest_size=4).hexdigest()
+        base_name = f"{file_path.stem}_{timestamp}_{path_hash}"
+        with self._path_lock:
+            # 같은 파일을 같은 순간에 두 번 저장한 경우 번호를 붙임
+            diff_path = date_dir / f"{base_name}.diff"
+            number = 1
+            while diff_path in self._reserved_paths or self.writer.is_pending(diff_path) or diff_path.exists():
+                diff_path = date_dir / f"{base_name}_{number}.diff"
+                number += 1
+            self._reserved_paths.add(diff_path)
+        try:
+            self._write_json(diff_path, diff_content, 'diff')
+        finally:
+            with self._path_lock:
+                self._reserved_paths.discard(diff_path)
+        return diff_path
+    
     def get_diffs(self, date: datetime) -> List[Path]:
         """
         특정 날짜의 diff 파일 목록을 반환합니다.
@@ -73,69 +172,102 @@ class TrackerStorage(StorageInterface):
         Returns:
             List[Path]: diff 파일 경로 목록
         """
+        # 기록 대기 중인 diff도 목록에 포함되도록 먼저 기록
+        self.writer.flush(raise_failed=False)
         date_dir = self.diff_dir / date.strftime("%Y-%m-%d")
         if not date_dir.exists():
             return []
         
         return list(date_dir.glob("*.diff"))
     
+    def open_diff(self, diff_path: Path) -> Optional[DiffRecord]:
+        """
+        저장된 diff를 읽습니다. 전체 내용은 old_content/new_content에 접근할 때 복원됩니다.
+        
+        Args:
+            diff_path: diff 파일 경로
+            
+        Returns:
+            Optional[DiffRecord]: diff 기록 (실패 시 None)
+        """
+        record = self.load_diff(diff_path)
+        return DiffRecord(record, self.content_resolver) if record is not None else None
+    
+    def load_diff(self, diff_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        저장된 diff 파일을 읽습니다. (압축 여부와 관계없이)
+        
+        Args:
+            diff_path: diff 파일 경로
+            
+        Returns:
+            Optional[Dict[str, Any]]: diff 내용 (실패 시 None)
+        """
+        try:
+            return self._read_json(Path(diff_path))
+        except Exception as e:
+            print(f"⚠️ diff 로드 실패: {diff_path} ({e})")
+            return None
+    
     def log_activity(self, activity_type: str, data: Dict[str, Any]):
         """
-        활동을 로그에 기록합니다.
+        활동을 로그에 기록합니다. (기존 기록을 다시 쓰지 않고 한 줄만 추가)
         
         Args:
             activity_type: 활동 유형
             data: 활동 데이터
         """
         try:
-            # 날짜별 디렉토리 생성
-            date_dir = self.activity_dir / datetime.now().strftime("%Y-%m-%d")
-            date_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 로그 파일 경로
-            log_path = date_dir / "activities.json"
-            
-            # 기존 로그 로드
-            activities = []
-            if log_path.exists():
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    activities = json.load(f)
-            
-            # 새 활동 추가
+            now = datetime.now()
             activity = {
                 'type': activity_type,
                 'data': data,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now.isoformat()
             }
-            activities.append(activity)
-            
-            # 로그 저장
-            with open(log_path, 'w', encoding='utf-8') as f:
-                json.dump(activities, f, ensure_ascii=False, indent=2)
+            self.activity_log.append(activity, now)
                 
         except Exception as e:
             print(f"⚠️ 활동 로그 기록 실패: {activity_type} ({e})")
     
-    def get_activities(self, date: datetime) -> List[Dict[str, Any]]:
+    def get_activities(self, date: datetime) -> Iterator[Dict[str, Any]]:
         """
         특정 날짜의 활동 로그를 반환합니다.
+        전체를 메모리에 올리지 않고 기록을 하나씩 읽습니다.
         
         Args:
             date: 날짜
             
         Returns:
-            List[Dict[str, Any]]: 활동 로그 목록
+            Iterator[Dict[str, Any]]: 활동 로그 (오래된 순서)
         """
-        log_path = self.activity_dir / date.strftime("%Y-%m-%d") / "activities.json"
-        if not log_path.exists():
-            return []
+        return self.activity_log.iter_records(date)
+    
+    def flush(self):
+        """
+        기록 대기 중인 diff/활동 로그를 모두 기록합니다.
         
-        try:
-            with open(log_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"⚠️ 활동 로그 로드 실패: {date} ({e})")
-            return []
+        Raises:
+            WriteFailedError: 기록하지 못한 쓰기가 있었던 경우
+        """
+        self.writer.flush()
+    
+    def query_activities(self, query: ActivityFilter) -> Iterator[Dict[str, Any]]:
+        """
+        조건에 맞는 활동 로그를 여러 날짜에 걸쳐 조회합니다.
+        
+        Args:
+            query: 조회 조건 (시간 범위, 파일 경로 접두, 활동 유형, 저장소)
+            
+        Returns:
+            Iterator[Dict[str, Any]]: 활동 로그 (오래된 순서)
+        """
+        self.activity_log.flush()
+        return self.activity_query.search(query)
+    
+    def close(self):
+        """기록 대기 중인 내용을 모두 기록하고 활동 로그를 닫습니다."""
+        self.activity_log.close()
+        self.writer.flush(raise_failed=False)
     
     def cleanup_old_data(self, days: int):
         """
@@ -145,6 +277,9 @@ class TrackerStorage(StorageInterface):
             days: 보관할 일수
         """
         try:
+            # 기록 대기 중인 파일이 삭제 후 다시 생기지 않도록 먼저 기록
+            self.writer.flush(raise_failed=False)
+            
             # 현재 날짜
             now = datetime.now()
             
@@ -170,6 +305,7 @@ class TrackerStorage(StorageInterface):
                 try:
                     date = datetime.strptime(activity_date_dir.name, "%Y-%m-%d")
                     if (now - date).days > days:
+                        self.activity_log.release(activity_date_dir.name)
                         shutil.rmtree(activity_date_dir)
                 except ValueError:
                     continue
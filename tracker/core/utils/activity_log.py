@@ -0,0 +1,266 @@
+"""
+활동 로그 (append-only JSONL)
+- 날짜별 디렉토리에 한 줄씩 추가 (파일 전체를 다시 쓰지 않음)
+- 크기/시간 기준 구간 교체(rotation), 교체된 구간은 압축
+- fsync 정책 선택 ('always', 'interval', 'never')
+- 기록을 한 줄씩 읽어 반환하는 스트리밍 리더 (이전 activities.json도 읽음)
+- 추가 기록은 그룹 커밋 기록기를 거침
+"""
+
+import io
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from .codec import ContentCodec
+from .group_writer import GroupCommitWriter
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+class ActivityLog:
+    """
+    날짜별 JSONL 활동 로그
+    - 현재 구간: {날짜}/activities.jsonl
+    - 교체된 구간: {날짜}/activities.{번호:06d}.jsonl (코덱으로 압축)
+    - 이전 형식: {날짜}/activities.json (JSON 배열)
+    """
+
+    ACTIVE_FILENAME = "activities.jsonl"
+    LEGACY_FILENAME = "activities.json"
+    SEGMENT_PATTERN = re.compile(r"^activities\.(\d{6})\.jsonl$")
+
+    def __init__(self,
+                 activity_dir: Path,
+                 codec: Optional[ContentCodec] = None,
+                 max_segment_bytes: int = 8 * 1024 * 1024,
+                 rotate_seconds: Optional[float] = 3600.0,
+                 fsync: str = 'interval',
+                 fsync_interval: float = 1.0,
+                 writer: Optional[GroupCommitWriter] = None):
+        """
+        Args:
+            activity_dir: 활동 로그 디렉토리
+            codec: 교체된 구간 압축 코덱
+            max_segment_bytes: 현재 구간이 이 크기를 넘으면 교체
+            rotate_seconds: 현재 구간을 연 뒤 이 시간이 지나면 교체 (None이면 시간 기준 교체 없음)
+            fsync: fsync 정책 ('always': 기록마다, 'interval': fsync_interval마다, 'never': OS에 맡김)
+            fsync_interval: 'interval' 정책의 fsync 간격 (초)
+            writer: 그룹 커밋 기록기 (None이면 바로 기록)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"지원하지 않는 fsync 정책입니다: {fsync}")
+        self.activity_dir = activity_dir
+        self.codec = codec or ContentCodec()
+        self.max_segment_bytes = max_segment_bytes
+        self.rotate_seconds = rotate_seconds
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.writer = writer or GroupCommitWriter()
+
+        self._lock = threading.Lock()
+        self._active_path: Optional[Path] = None
+        self._active_date: Optional[str] = None
+        self._active_size = 0
+        self._opened_at = 0.0
+        self._last_fsync = 0.0
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def append(self, record: Dict[str, Any], when: Optional[datetime] = None):
+        """
+        기록 한 줄을 추가합니다.
+
+        Args:
+            record: 활동 기록
+            when: 기록 날짜 (기본값: 현재 시간)
+        """
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        date_key = (when or datetime.now()).strftime("%Y-%m-%d")
+        data = line.encode('utf-8')
+        with self._lock:
+            self._ensure_open(date_key)
+            now = time.monotonic()
+            sync = self.fsync == 'always' or (self.fsync == 'interval' and now - self._last_fsync >= self.fsync_interval)
+            if sync:
+                self._last_fsync = now
+            self.writer.append(self._active_path, data, fsync=sync)
+            self._active_size += len(data)
+            if self._should_rotate(now):
+                self._rotate()
+
+    def _ensure_open(self, date_key: str):
+        """날짜에 맞는 현재 구간을 준비합니다. (잠금을 잡은 상태에서 호출)"""
+        if self._active_date == date_key:
+            return
+        date_dir = self.activity_dir / date_key
+        date_dir.mkdir(parents=True, exist_ok=True)
+        active_path = date_dir / self.ACTIVE_FILENAME
+        if not self.writer.is_pending(active_path):
+            self._repair_torn_tail(active_path)
+        self._active_path = active_path
+        self._active_date = date_key
+        self._active_size = active_path.stat().st_size if active_path.exists() else 0
+        self._opened_at = time.monotonic()
+
+    @staticmethod
+    def _repair_torn_tail(path: Path):
+        """기록 중 중단되어 줄바꿈 없이 끝난 마지막 줄을 잘라냅니다."""
+        if not path.exists() or path.stat().st_size == 0:
+            return
+        with open(path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b'\n':
+                return
+            # 마지막 줄바꿈 위치를 뒤에서부터 찾음
+            size = f.seek(0, os.SEEK_END)
+            position = size
+            while position > 0:
+                step = min(64 * 1024, position)
+                position -= step
+                f.seek(position)
+                index = f.read(step).rfind(b'\n')
+                if index >= 0:
+                    f.truncate(position + index + 1)
+                    return
+            f.truncate(0)
+
+    def _should_rotate(self, now: float) -> bool:
+        """현재 구간을 교체해야 하는지 확인합니다."""
+        if self._active_size >= self.max_segment_bytes:
+            return True
+        return self.rotate_seconds is not None and now - self._opened_at >= self.rotate_seconds
+
+    def _rotate(self):
+        """
+        현재 구간을 번호가 붙은 구간으로 옮기고 새 구간을 엽니다.
+        이름 변경 한 번으로 교체하므로 도중에 중단되어도 같은 기록이 두 구간에 남지 않습니다.
+        """
+        date_dir = self.activity_dir / self._active_date
+        active_path = self._active_path
+        # 대기 중인 기록까지 현재 구간에 쓴 뒤 교체 (잠금을 잡고 있으므로 새 기록은 들어오지 않음)
+        self.writer.flush(raise_failed=False)
+        self._opened_at = time.monotonic()
+        try:
+            segments = self._segment_paths(date_dir)
+            next_number = int(self.SEGMENT_PATTERN.match(segments[-1].name).group(1)) + 1 if segments else 1
+            segment_path = date_dir / f"activities.{next_number:06d}.jsonl"
+            # 다음 기록은 새 현재 구간 파일을 만들어 추가됨
+            os.replace(active_path, segment_path)
+            self._active_size = 0
+        except Exception as e:
+            print(f"⚠️ 활동 로그 구간 교체 실패: {active_path} ({e})")
+            return
+        self._compress_segment(segment_path)
+
+    def _compress_segment(self, segment_path: Path):
+        """
+        교체된 구간을 압축본으로 바꿉니다.
+        압축본을 임시 파일에 쓴 뒤 같은 이름으로 교체하며, 실패하면 압축하지 않은 채로 둡니다.
+        (읽을 때 코덱 헤더가 없으면 그대로 읽음)
+        """
+        tmp_path = segment_path.with_name(segment_path.name + '.tmp')
+        try:
+            with open(segment_path, 'rb') as f:
+                data = f.read()
+            stored = self.codec.encode(data, 'activity')
+            if stored is data:
+                return
+            with open(tmp_path, 'wb') as f:
+                f.write(stored)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, segment_path)
+        except Exception as e:
+            print(f"⚠️ 활동 로그 구간 압축 실패: {segment_path} ({e})")
+
+    def flush(self):
+        """대기 중인 기록을 모두 파일에 씁니다."""
+        with self._lock:
+            if self._active_path is not None and self.writer.is_pending(self._active_path):
+                self.writer.flush(raise_failed=False)
+
+    def close(self):
+        """대기 중인 기록을 모두 쓰고 현재 구간을 닫습니다."""
+        with self._lock:
+            if self._active_path is not None and self.writer.is_pending(self._active_path):
+                self.writer.flush(raise_failed=False)
+            self._active_path = None
+            self._active_date = None
+
+    def release(self, date_key: str):
+        """
+        해당 날짜의 구간을 사용 중이면 닫습니다. (디렉토리 삭제 전 호출)
+
+        Args:
+            date_key: 날짜 (YYYY-MM-DD)
+        """
+        with self._lock:
+            if self._active_date == date_key:
+                if self.writer.is_pending(self._active_path):
+                    self.writer.flush(raise_failed=False)
+                self._active_path = None
+                self._active_date = None
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def _segment_paths(self, date_dir: Path) -> List[Path]:
+        """교체된 구간 파일을 번호 순서로 반환합니다."""
+        if not date_dir.exists():
+            return []
+        return sorted(path for path in date_dir.iterdir() if self.SEGMENT_PATTERN.match(path.name))
+
+    def iter_records(self, date: datetime) -> Iterator[Dict[str, Any]]:
+        """
+        해당 날짜의 기록을 오래된 순서로 하나씩 반환합니다.
+
+        Args:
+            date: 날짜
+
+        Returns:
+            Iterator[Dict[str, Any]]: 활동 기록
+        """
+        date_key = date.strftime("%Y-%m-%d")
+        date_dir = self.activity_dir / date_key
+
+        legacy_path = date_dir / self.LEGACY_FILENAME
+        if legacy_path.exists():
+            try:
+                with open(legacy_path, 'rb') as f:
+                    yield from json.loads(self.codec.decode(f.read()).decode('utf-8'))
+            except Exception as e:
+                print(f"⚠️ 활동 로그 로드 실패: {legacy_path} ({e})")
+
+        for segment_path in self._segment_paths(date_dir):
+            try:
+                with open(segment_path, 'rb') as f:
+                    stream = io.BytesIO(self.codec.decode(f.read()))
+            except Exception as e:
+                print(f"⚠️ 활동 로그 로드 실패: {segment_path} ({e})")
+                continue
+            yield from self._iter_lines(stream, segment_path)
+
+        active_path = date_dir / self.ACTIVE_FILENAME
+        if self.writer.is_pending(active_path):
+            # 아직 기록되지 않은 활동도 읽히도록 먼저 기록
+            self.writer.flush(raise_failed=False)
+        if active_path.exists():
+            with open(active_path, 'rb') as f:
+                yield from self._iter_lines(f, active_path)
+
+    @staticmethod
+    def _iter_lines(stream, path: Path) -> Iterator[Dict[str, Any]]:
+        """JSONL 스트림을 한 줄씩 읽습니다. 줄바꿈 없이 끝난 마지막 줄(기록 중)은 건너뜁니다."""
+        for raw_line in stream:
+            if not raw_line.endswith(b'\n'):
+                break
+            try:
+                yield json.loads(raw_line)
+            except ValueError:
+                print(f"⚠️ 손상된 활동 기록을 건너뜁니다: {path}")
@@ -0,0 +1,217 @@
+"""
+백업 카탈로그
+- 파일 경로별 백업 정보 (append-only 로그 + 스냅샷)
+- 변경 시 한 줄만 추가 (전체 재기록 없음)
+- 로그가 커지면 스냅샷으로 압축
+- 기록 중 중단되어 잘린 마지막 줄은 로드 시 복구
+- 로그 기록은 그룹 커밋 기록기를 거침
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .group_writer import GroupCommitWriter
+
+
+class BackupCatalog:
+    """
+    path -> 백업 정보 카탈로그
+    - 메모리의 dict가 기준이고, 디스크에는 스냅샷 + 변경 로그로 보관
+    - 로드 순서: 스냅샷 -> 로그 재생 (같은 기록을 두 번 적용해도 결과가 같음)
+    """
+
+    SNAPSHOT_FILENAME = "backup_catalog.json"
+    LOG_FILENAME = "backup_catalog.log"
+    LEGACY_FILENAME = "backup_info.json"
+    VERSION = 1
+
+    def __init__(self,
+                 catalog_dir: Path,
+                 compact_ratio: int = 4,
+                 min_compact_records: int = 1000,
+                 fsync: bool = False,
+                 writer: Optional[GroupCommitWriter] = None):
+        """
+        Args:
+            catalog_dir: 카탈로그 파일을 둘 디렉토리
+            compact_ratio: 로그 기록 수가 항목 수의 이 배수를 넘으면 압축
+            min_compact_records: 이보다 적은 로그는 압축하지 않음
+            fsync: 로그 기록마다 fsync 수행 여부
+            writer: 그룹 커밋 기록기 (None이면 바로 기록)
+        """
+        self.catalog_dir = catalog_dir
+        self.snapshot_path = catalog_dir / self.SNAPSHOT_FILENAME
+        self.log_path = catalog_dir / self.LOG_FILENAME
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+        self.fsync = fsync
+        self.writer = writer or GroupCommitWriter()
+
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._log_records = 0
+        self.catalog_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # 로드 / 복구
+    # ------------------------------------------------------------------
+    def _load(self):
+        """스냅샷과 로그를 읽어 카탈로그를 복원합니다."""
+        legacy_path = self.catalog_dir / self.LEGACY_FILENAME
+        if not self.snapshot_path.exists() and not self.log_path.exists() and legacy_path.exists():
+            self._migrate_legacy(legacy_path)
+            return
+
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f).get('entries', {})
+            except Exception as e:
+                print(f"⚠️ 백업 카탈로그 스냅샷 로드 실패: {e}")
+
+        if self.log_path.exists():
+            self._replay_log()
+
+    def _replay_log(self):
+        """로그를 재생하고, 중단되어 잘린 마지막 기록은 잘라냅니다."""
+        valid_end = 0
+        with open(self.log_path, 'rb') as f:
+            for raw_line in f:
+                if not raw_line.endswith(b'\n'):
+                    # 기록 도중 중단된 줄
+                    break
+                try:
+                    self._apply(json.loads(raw_line))
+                except (ValueError, KeyError):
+                    print(f"⚠️ 손상된 백업 카탈로그 기록을 건너뜁니다: offset {valid_end}")
+                valid_end += len(raw_line)
+                self._log_records += 1
+
+        if valid_end < self.log_path.stat().st_size:
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(valid_end)
+
+    def _migrate_legacy(self, legacy_path: Path):
+        """이전 형식(backup_info.json)을 스냅샷으로 옮깁니다."""
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            self._write_snapshot()
+            print(f"📦 백업 정보를 카탈로그로 변환했습니다: {len(self._entries)}개")
+        except Exception as e:
+            print(f"⚠️ 백업 정보 로드 실패: {e}")
+
+    def _apply(self, record: Dict[str, Any]):
+        """로그 기록 하나를 적용합니다."""
+        if record['op'] == 'put':
+            self._entries[record['path']] = record['info']
+        elif record['op'] == 'del':
+            self._entries.pop(record['path'], None)
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def _append(self, record: Dict[str, Any]):
+        """로그에 기록 한 줄을 추가합니다."""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        self.writer.append(self.log_path, line.encode('utf-8'), fsync=self.fsync)
+        self._log_records += 1
+        if self._log_records >= max(self.min_compact_records, self.compact_ratio * len(self._entries)):
+            self.compact()
+
+    def put(self, path: str, info: Dict[str, Any]):
+        """
+        백업 정보를 기록합니다.
+
+        Args:
+            path: 파일 경로
+            info: 백업 정보
+        """
+        with self._lock:
+            self._entries[path] = info
+            self._append({'op': 'put', 'path': path, 'info': info})
+
+    def remove(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        백업 정보를 삭제합니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            Optional[Dict[str, Any]]: 삭제된 정보 (없으면 None)
+        """
+        with self._lock:
+            info = self._entries.pop(path, None)
+            if info is not None:
+                self._append({'op': 'del', 'path': path})
+            return info
+
+    def _write_snapshot(self):
+        """현재 카탈로그 전체를 스냅샷으로 저장합니다."""
+        tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'entries': self._entries}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def compact(self):
+        """
+        스냅샷을 새로 쓰고 로그를 비웁니다.
+        스냅샷 교체 후 로그를 비우기 전에 중단되어도 로그 재생 결과는 같습니다.
+        """
+        with self._lock:
+            try:
+                # 대기 중인 로그 기록이 비운 로그 뒤에 쓰이지 않도록 먼저 기록
+                self.writer.flush(raise_failed=False)
+                self._write_snapshot()
+                open(self.log_path, 'wb').close()
+                self._log_records = 0
+            except Exception as e:
+                print(f"⚠️ 백업 카탈로그 압축 실패: {e}")
+
+    def close(self):
+        """로그를 스냅샷으로 압축합니다. (이후 기록하지 않음)"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._log_records:
+                self.compact()
+            self._closed = True
+
+    # ------------------------------------------------------------------
+    # 조회 (dict와 같은 방식으로 사용)
+    # ------------------------------------------------------------------
+    def get(self, path: str, default: Any = None) -> Any:
+        """경로의 백업 정보를 반환합니다."""
+        return self._entries.get(path, default)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        """모든 경로 목록 (복사본)"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def values(self) -> List[Dict[str, Any]]:
+        """모든 백업 정보 목록 (복사본)"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """모든 (경로, 백업 정보) 목록 (복사본)"""
+        with self._lock:
+            return list(self._entries.items())
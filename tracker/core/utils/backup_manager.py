@@ -1,73 +1,146 @@
 """
 백업 관리자 구현
-- 파일 백업 생성 및 관리
+- 파일 백업 생성 및 관리 (내용 주소 기반 blob 저장소 사용)
 - 백업 파일 로드
+- 파일별 변경 이력 (역방향 delta + 주기적 전체 체크포인트)
+- 최근 기준 내용/해시 메모리 캐시
+- 기준 내용의 줄 해시 배열 보관 (diff 시 다시 계산하지 않음)
+- 뒤에 내용만 추가된 파일은 추가된 부분만 구간(segment)으로 저장
 - 오래된 백업 정리
 """
 
 from pathlib import Path
+from array import array
 from typing import Dict, Any, Optional, List
+from collections import Counter
 from datetime import datetime
 import shutil
-import json
+import sys
+import threading
 from interfaces.backup.manager import BackupManagerInterface
 from interfaces.file.filter import FileFilterInterface
+from .blob_store import BlobStore
+from .backup_catalog import BackupCatalog
+from .content_hash import compute_content_hash
+from .codec import ContentCodec
+from .group_writer import GroupCommitWriter
+from .lru_cache import LRUCache
+from .line_hash import line_hashes_to_bytes, line_hashes_from_bytes
+from .reverse_delta import encode_delta, apply_delta
 
 class BackupManager(BackupManagerInterface):
     """파일 백업 관리자"""
     
-    def __init__(self, watch_dir: Path, backup_dir: Path, file_filter: FileFilterInterface):
+    def __init__(self,
+                 watch_dir: Path,
+                 backup_dir: Path,
+                 file_filter: FileFilterInterface,
+                 keep_history: bool = False,
+                 checkpoint_interval: int = 20,
+                 max_versions: int = 100,
+                 codec: Optional[ContentCodec] = None,
+                 content_cache_bytes: int = 64 * 1024 * 1024,
+                 hash_cache_entries: int = 4096,
+                 max_segments: int = 64,
+                 writer: Optional[GroupCommitWriter] = None):
+        """
+        Args:
+            watch_dir: 감시 디렉토리
+            backup_dir: 백업 디렉토리
+            file_filter: 파일 필터
+            keep_history: 파일별 이전 버전을 역방향 delta로 보관할지 여부
+            checkpoint_interval: 이 간격의 버전은 delta 대신 전체 내용으로 보관
+            max_versions: 파일별 최대 보관 버전 수
+            codec: blob 압축 코덱 (None이면 압축하지 않음)
+            content_cache_bytes: 기준 내용 캐시의 최대 메모리 (바이트)
+            hash_cache_entries: 원본 바이트 해시 -> 내용 해시 캐시의 최대 항목 수
+            max_segments: 추가 구간이 이 수를 넘으면 하나의 blob으로 합침
+            writer: blob/카탈로그 쓰기를 모아 기록할 그룹 커밋 기록기 (None이면 바로 기록)
+        """
         self.watch_dir = watch_dir
         self.backup_dir = backup_dir
         self.file_filter = file_filter
+        self.keep_history = keep_history
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.max_versions = max(1, max_versions)
+        self.max_segments = max(2, max_segments)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
-        self.backup_info = self._load_backup_info()
-    
-    def _load_backup_info(self) -> Dict[str, Any]:
-        """백업 정보를 로드합니다."""
-        info_path = self.backup_dir / "backup_info.json"
-        if info_path.exists():
-            try:
-                with open(info_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠️ 백업 정보 로드 실패: {e}")
-        return {}
-    
-    def _save_backup_info(self):
-        """백업 정보를 저장합니다."""
-        info_path = self.backup_dir / "backup_info.json"
-        try:
-            with open(info_path, 'w', encoding='utf-8') as f:
-                json.dump(self.backup_info, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"⚠️ 백업 정보 저장 실패: {e}")
+        # 같은 내용은 한 번만 저장하고 backup_info에는 해시만 기록
+        self.blob_store = BlobStore(self.backup_dir / "objects", codec=codec, writer=writer)
+        # 백업 정보는 append-only 카탈로그에 기록 (변경 시 한 줄만 추가)
+        self.backup_info = BackupCatalog(self.backup_dir, writer=writer)
+        # 여러 워커 스레드에서 동시에 백업 정보를 갱신하므로 잠금으로 보호
+        self._lock = threading.Lock()
+        # blob별 참조 수 (0이 되면 즉시 삭제)
+        self._blob_refs = Counter()
+        for info in self.backup_info.values():
+            self._blob_refs.update(self._referenced_blobs(info))
+        # 내용 해시 -> 기준 내용 (수정 이벤트마다 blob을 다시 읽지 않도록 함)
+        self._content_cache = LRUCache(max_bytes=content_cache_bytes, sizeof=sys.getsizeof)
+        # 원본 바이트 해시 -> 내용 해시 (디코딩 없이 변경 없음을 판별)
+        self._hash_cache = LRUCache(max_entries=hash_cache_entries)
     
-    def update_backup(self, file_path: Path, content: str) -> Optional[str]:
+    def close(self):
+        """백업 카탈로그를 압축하고 닫습니다."""
+        self.backup_info.close()
+    
+    def update_backup(self,
+                      file_path: Path,
+                      content: str,
+                      raw_hash: Optional[str] = None,
+                      line_hashes: Optional[array] = None) -> Optional[str]:
         """
         파일의 백업을 생성하거나 업데이트합니다.
+        내용이 이미 저장되어 있으면 blob을 다시 쓰지 않고 해시만 기록합니다.
+        이전에 요청한 백업 쓰기가 기록되지 못했으면 새로 기록하지 않고 실패로 반환합니다.
         
         Args:
             file_path: 백업할 파일 경로
             content: 파일 내용
+            raw_hash: 디코딩 전 원본 바이트 해시 (있으면 해시 캐시에 기록)
+            line_hashes: 내용의 줄 해시 배열 (있으면 백업 옆에 함께 저장)
             
         Returns:
             Optional[str]: 백업 파일 경로 (실패 시 None)
         """
         try:
-            # 백업 파일 경로 생성
-            backup_path = self.backup_dir / f"{file_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
+            self._raise_write_failures()
+            data = content.encode('utf-8')
+            line_hash_data = line_hashes_to_bytes(line_hashes) if line_hashes is not None else None
             
-            # 백업 파일 저장
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # blob 저장과 백업 정보 갱신 사이에 정리(gc)가 끼어들지 않도록 함께 잠금
+            with self._lock:
+                content_hash = self.blob_store.put(data)
+                backup_path = self.blob_store.blob_path(content_hash)
+                now = datetime.now().isoformat()
+                prev_info = self.backup_info.get(str(file_path))
+                
+                info = {
+                    'last_backup': now,
+                    'content_hash': content_hash,
+                    'size': len(data),
+                    'backup_path': str(backup_path)
+                }
+                if line_hash_data is not None:
+                    info['line_hashes'] = self.blob_store.put(line_hash_data, data_class='line_hashes')
+                elif prev_info and prev_info.get('content_hash') == content_hash and 'line_hashes' in prev_info:
+                    info['line_hashes'] = prev_info['line_hashes']
+                if self.keep_history:
+                    info['history'] = self._extend_history(prev_info, content_hash, data, now)
+                
+                # 새 참조를 먼저 늘린 뒤 이전 참조를 줄여 공유 blob이 삭제되지 않도록 함
+                self._blob_refs.update(self._referenced_blobs(info))
+                self._release_blobs(self._referenced_blobs(prev_info))
+                
+                # 백업 정보 업데이트
+                self.backup_info.put(str(file_path), info)
             
-            # 백업 정보 업데이트
-            self.backup_info[str(file_path)] = {
-                'last_backup': datetime.now().isoformat(),
-                'backup_path': str(backup_path)
-            }
-            self._save_backup_info()
+            # 새 백업이 다음 변경의 기준이 되므로 캐시에 보관
+            self._content_cache.put(content_hash, content)
+            if line_hashes is not None:
+                self._content_cache.put(info['line_hashes'], line_hashes)
+            if raw_hash:
+                self._hash_cache.put(raw_hash, content_hash)
             
             return str(backup_path)
             
@@ -75,6 +148,100 @@ class BackupManager(BackupManagerInterface):
             print(f"⚠️ 백업 생성 실패: {file_path} ({e})")
             return None
     
+    def append_backup(self,
+                      file_path: Path,
+                      appended: str,
+                      content_hash: str,
+                      raw_hash: Optional[str] = None) -> Optional[str]:
+        """
+        기존 백업 뒤에 추가된 내용만 저장합니다. (기존 내용을 다시 쓰지 않음)
+        구간 수가 max_segments를 넘으면 전체를 하나의 blob으로 합칩니다.
+        구간으로 저장해도 백업 정보에는 전체 내용의 해시를 기록합니다.
+        
+        Args:
+            file_path: 파일 경로
+            appended: 기존 내용 뒤에 추가된 내용
+            content_hash: 추가 후 전체 내용의 해시
+            raw_hash: 추가 후 원본 바이트 해시 (있으면 해시 캐시에 기록)
+            
+        Returns:
+            Optional[str]: 백업 파일 경로 (기존 백업이 없거나 실패 시 None)
+        """
+        try:
+            self._raise_write_failures()
+            tail = appended.encode('utf-8')
+            
+            with self._lock:
+                prev_info = self.backup_info.get(str(file_path))
+                if not prev_info or 'content_hash' not in prev_info:
+                    return None
+                
+                segments = list(prev_info.get('segments') or [prev_info['content_hash']])
+                size = prev_info.get('size', 0) + len(tail)
+                if len(segments) >= self.max_segments:
+                    # 구간이 너무 많으면 읽기 비용이 커지므로 하나로 합침
+                    content_hash = self.blob_store.put(self._join_segments(segments) + tail)
+                    segments = None
+                else:
+                    segments.append(self.blob_store.put(tail))
+                now = datetime.now().isoformat()
+                
+                info = {
+                    'last_backup': now,
+                    'content_hash': content_hash,
+                    'size': size,
+                    'backup_path': str(self.blob_store.blob_path(segments[0] if segments else content_hash))
+                }
+                if segments:
+                    info['segments'] = segments
+                if self.keep_history:
+                    info['history'] = self._extend_history_append(prev_info, content_hash, size, now, segments)
+                
+                self._blob_refs.update(self._referenced_blobs(info))
+                self._release_blobs(self._referenced_blobs(prev_info))
+                self.backup_info.put(str(file_path), info)
+            
+            if raw_hash:
+                self._hash_cache.put(raw_hash, content_hash)
+            return info['backup_path']
+            
+        except Exception as e:
+            print(f"⚠️ 추가 내용 백업 실패: {file_path} ({e})")
+            return None
+    
+    def _raise_write_failures(self):
+        """
+        백업 디렉토리에 요청한 쓰기 중 기록되지 못한 것이 있으면 알립니다.
+        (그룹 커밋 기록기는 호출자를 기다리게 하지 않으므로 실패를 다음 백업에서 확인)
+        
+        Raises:
+            WriteFailedError: 기록되지 못한 blob/카탈로그 쓰기가 있는 경우
+        """
+        self.blob_store.writer.raise_failed(self.backup_dir)
+        if self.backup_info.writer is not self.blob_store.writer:
+            self.backup_info.writer.raise_failed(self.backup_dir)
+    
+    def _join_segments(self, segments: List[str]) -> bytes:
+        """
+        구간 blob들을 이어 전체 내용을 만듭니다.
+        
+        Raises:
+            FileNotFoundError: 구간 blob이 없는 경우
+        """
+        parts = []
+        for segment_hash in segments:
+            part = self.blob_store.get(segment_hash)
+            if part is None:
+                raise FileNotFoundError(f"백업 구간이 없습니다: {segment_hash}")
+            parts.append(part)
+        return b''.join(parts)
+    
+    def _load_entry_data(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        """전체 내용으로 저장된 백업 정보/이력 항목의 내용을 읽습니다."""
+        if entry.get('segments'):
+            return self._join_segments(entry['segments'])
+        return self.blob_store.get(entry.get('hash') or entry['content_hash'])
+    
     def load_backup_content(self, file_path: Path) -> Optional[str]:
         """
         파일의 백업 내용을 로드합니다.
@@ -90,6 +257,19 @@ class BackupManager(BackupManagerInterface):
             if not backup_info:
                 return None
             
+            content_hash = backup_info.get('content_hash')
+            if content_hash:
+                content = self._content_cache.get(content_hash)
+                if content is not None:
+                    return content
+                data = self._load_entry_data(backup_info)
+                if data is None:
+                    return None
+                content = data.decode('utf-8')
+                self._content_cache.put(content_hash, content)
+                return content
+            
+            # 이전 형식 ({stem}_{timestamp}.bak) 백업
             backup_path = Path(backup_info['backup_path'])
             if not backup_path.exists():
                 return None
@@ -101,6 +281,294 @@ class BackupManager(BackupManagerInterface):
             print(f"⚠️ 백업 로드 실패: {file_path} ({e})")
             return None
     
+    def load_line_hashes(self, file_path: Path) -> Optional[array]:
+        """
+        백업된 내용의 줄 해시 배열을 로드합니다.
+        
+        Args:
+            file_path: 파일 경로
+            
+        Returns:
+            Optional[array]: 줄 해시 배열 (저장된 적이 없으면 None)
+        """
+        backup_info = self.backup_info.get(str(file_path))
+        sidecar_hash = backup_info.get('line_hashes') if backup_info else None
+        if not sidecar_hash:
+            return None
+        
+        hashes = self._content_cache.get(sidecar_hash)
+        if hashes is not None:
+            return hashes
+        data = self.blob_store.get(sidecar_hash)
+        if data is None:
+            return None
+        hashes = line_hashes_from_bytes(data)
+        self._content_cache.put(sidecar_hash, hashes)
+        return hashes
+    
+    def get_content_hash(self, file_path: Path) -> Optional[str]:
+        """
+        백업된 내용의 해시를 반환합니다.
+        
+        Args:
+            file_path: 파일 경로
+            
+        Returns:
+            Optional[str]: 내용 해시 (백업이 없거나 이전 형식이면 None)
+        """
+        backup_info = self.backup_info.get(str(file_path))
+        return backup_info.get('content_hash') if backup_info else None
+    
+    def is_same_content(self, file_path: Path, content: str, raw_hash: Optional[str] = None) -> bool:
+        """
+        내용이 백업과 같은지 해시로 비교합니다. (백업 내용을 읽지 않음)
+        
+        Args:
+            file_path: 파일 경로
+            content: 비교할 내용
+            raw_hash: 디코딩 전 원본 바이트 해시 (있으면 해시 캐시에 기록)
+            
+        Returns:
+            bool: 같으면 True (백업이 없거나 이전 형식이면 False)
+        """
+        content_hash = compute_content_hash(content.encode('utf-8'))
+        if raw_hash:
+            self._hash_cache.put(raw_hash, content_hash)
+        stored_hash = self.get_content_hash(file_path)
+        return stored_hash is not None and stored_hash == content_hash
+    
+    def is_same_raw(self, file_path: Path, raw_hash: str) -> bool:
+        """
+        원본 바이트 해시만으로 내용이 백업과 같은지 확인합니다. (디코딩하지 않음)
+        해시 캐시에 없는 경우 False를 반환하므로 is_same_content로 다시 확인해야 합니다.
+        
+        Args:
+            file_path: 파일 경로
+            raw_hash: 원본 바이트 해시
+            
+        Returns:
+            bool: 같은 것이 확인되면 True
+        """
+        stored_hash = self.get_content_hash(file_path)
+        return stored_hash is not None and self._hash_cache.get(raw_hash) == stored_hash
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        캐시 통계를 반환합니다.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: 기준 내용 캐시(content)와 해시 캐시(hash)의 통계
+        """
+        return {
+            'content': self._content_cache.get_stats(),
+            'hash': self._hash_cache.get_stats()
+        }
+    
+    def _referenced_blobs(self, info: Optional[Dict[str, Any]]) -> List[str]:
+        """백업 정보가 참조하는 blob 해시 목록을 반환합니다."""
+        if not info:
+            return []
+        history = info.get('history')
+        if history:
+            hashes = [blob for entry in history for blob in self._entry_blobs(entry)]
+        elif info.get('segments'):
+            hashes = list(info['segments'])
+        else:
+            hashes = [info['content_hash']] if 'content_hash' in info else []
+        if 'line_hashes' in info:
+            hashes.append(info['line_hashes'])
+        return hashes
+    
+    @staticmethod
+    def _entry_blobs(entry: Dict[str, Any]) -> List[str]:
+        """이력 항목 하나가 참조하는 blob 해시 목록을 반환합니다."""
+        if 'delta' in entry:
+            return [entry['delta']]
+        if entry.get('prefix'):
+            # 다음 버전 내용의 앞부분이므로 별도 blob이 없음
+            return []
+        if entry.get('segments'):
+            return list(entry['segments'])
+        return [entry['hash']]
+    
+    def _release_blobs(self, hashes: List[str]):
+        """blob 참조를 줄이고 더 이상 참조되지 않는 blob은 삭제합니다."""
+        for content_hash in hashes:
+            self._blob_refs[content_hash] -= 1
+            if self._blob_refs[content_hash] <= 0:
+                del self._blob_refs[content_hash]
+                self.blob_store.remove(content_hash)
+    
+    def _extend_history(self,
+                        prev_info: Optional[Dict[str, Any]],
+                        content_hash: str,
+                        data: bytes,
+                        timestamp: str) -> List[Dict[str, Any]]:
+        """
+        새 버전을 이력에 추가합니다.
+        직전 최신 버전은 체크포인트가 아니면 새 버전 기준의 역방향 delta로 바꿉니다.
+        최신 버전은 항상 전체 내용이므로 load_backup_content는 한 번만 읽습니다.
+        
+        Args:
+            prev_info: 이전 백업 정보
+            content_hash: 새 내용 해시
+            data: 새 내용
+            timestamp: 백업 시간
+            
+        Returns:
+            List[Dict[str, Any]]: 오래된 순서의 이력 (seq, hash, size, time, delta)
+        """
+        history = self._copy_history(prev_info)
+        if history and history[-1]['hash'] == content_hash:
+            # 구간으로 저장된 같은 내용이면 방금 저장한 전체 blob을 참조
+            history[-1].pop('segments', None)
+            return history
+        
+        seq = 0
+        if history:
+            latest = history[-1]
+            if latest['seq'] % self.checkpoint_interval != 0:
+                prev_data = self._load_entry_data(latest)
+                if prev_data is not None:
+                    latest['delta'] = self.blob_store.put(encode_delta(prev_data, data), data_class='delta')
+                    latest.pop('segments', None)
+            seq = latest['seq'] + 1
+        
+        history.append({'seq': seq, 'hash': content_hash, 'size': len(data), 'time': timestamp})
+        return history[-self.max_versions:]
+    
+    def _extend_history_append(self,
+                               prev_info: Dict[str, Any],
+                               content_hash: str,
+                               size: int,
+                               timestamp: str,
+                               segments: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """
+        추가 저장된 새 버전을 이력에 추가합니다.
+        직전 최신 버전은 새 버전의 앞부분이므로 delta 없이 크기만 남깁니다. (prefix)
+        
+        Args:
+            prev_info: 이전 백업 정보
+            content_hash: 새 버전 해시
+            size: 새 버전 크기
+            timestamp: 백업 시간
+            segments: 새 버전의 구간 목록 (하나로 합쳐졌으면 None)
+            
+        Returns:
+            List[Dict[str, Any]]: 오래된 순서의 이력
+        """
+        history = self._copy_history(prev_info)
+        seq = 0
+        if history:
+            latest = history[-1]
+            latest.pop('segments', None)
+            latest['prefix'] = True
+            seq = latest['seq'] + 1
+        
+        entry = {'seq': seq, 'hash': content_hash, 'size': size, 'time': timestamp}
+        if segments:
+            entry['segments'] = segments
+        history.append(entry)
+        return history[-self.max_versions:]
+    
+    @staticmethod
+    def _copy_history(prev_info: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """이전 백업 정보의 이력을 복사합니다. 이력 없는 백업은 첫 버전으로 변환합니다."""
+        history = [dict(entry) for entry in prev_info.get('history', [])] if prev_info else []
+        if prev_info and not history and prev_info.get('content_hash'):
+            # 이력 없이 저장된 기존 백업을 첫 버전으로 사용
+            history = [{
+                'seq': 0,
+                'hash': prev_info['content_hash'],
+                'size': prev_info.get('size'),
+                'time': prev_info.get('last_backup')
+            }]
+            if prev_info.get('segments'):
+                history[0]['segments'] = list(prev_info['segments'])
+        return history
+    
+    def list_versions(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        파일의 보관된 버전 목록을 반환합니다.
+        
+        Args:
+            file_path: 파일 경로
+            
+        Returns:
+            List[Dict[str, Any]]: 오래된 순서의 버전 목록 (seq, hash, size, time)
+        """
+        info = self.backup_info.get(str(file_path))
+        if not info or 'content_hash' not in info:
+            return []
+        history = info.get('history') or [{
+            'seq': 0,
+            'hash': info['content_hash'],
+            'size': info.get('size'),
+            'time': info.get('last_backup')
+        }]
+        return [{key: entry.get(key) for key in ('seq', 'hash', 'size', 'time')} for entry in history]
+    
+    def load_version_content(self, file_path: Path, seq: int) -> Optional[str]:
+        """
+        특정 버전의 내용을 복원합니다.
+        가장 가까운 새 체크포인트(또는 최신 버전)에서 역방향 delta를 차례로 적용합니다.
+        추가 저장 이전 버전(prefix)은 다음 버전 내용의 앞부분을 잘라 복원합니다.
+        
+        Args:
+            file_path: 파일 경로
+            seq: 버전 번호 (list_versions의 seq)
+            
+        Returns:
+            Optional[str]: 복원된 내용 (없으면 None)
+        """
+        info = self.backup_info.get(str(file_path))
+        if not info:
+            return None
+        history = info.get('history')
+        if not history:
+            return self.load_backup_content(file_path) if seq == 0 else None
+        
+        try:
+            index = next(i for i, entry in enumerate(history) if entry['seq'] == seq)
+            full_index = next(i for i in range(index, len(history))
+                              if 'delta' not in history[i] and not history[i].get('prefix'))
+            data = self._load_entry_data(history[full_index])
+            for i in range(full_index - 1, index - 1, -1):
+                if data is None:
+                    break
+                if history[i].get('prefix'):
+                    data = data[:history[i]['size']]
+                else:
+                    data = apply_delta(data, self.blob_store.get(history[i]['delta']))
+            return data.decode('utf-8') if data is not None else None
+        except StopIteration:
+            return None
+        except Exception as e:
+            print(f"⚠️ 버전 복원 실패: {file_path}@{seq} ({e})")
+            return None
+    
+    def load_content_by_hash(self, file_path: Path, content_hash: str) -> Optional[str]:
+        """
+        파일의 현재 백업 또는 보관된 버전 중 해시가 같은 내용을 찾습니다.
+        
+        Args:
+            file_path: 파일 경로
+            content_hash: 내용 해시
+            
+        Returns:
+            Optional[str]: 내용 (찾지 못하면 None)
+        """
+        info = self.backup_info.get(str(file_path))
+        if info and info.get('content_hash') == content_hash:
+            return self.load_backup_content(file_path)
+        for entry in reversed(info.get('history', []) if info else []):
+            if entry['hash'] == content_hash:
+                return self.load_version_content(file_path, entry['seq'])
+        
+        # 다른 파일과 공유되는 blob으로 남아 있을 수 있음
+        data = self.blob_store.get(content_hash)
+        return data.decode('utf-8') if data is not None else None
+    
     def has_backup(self, file_path: Path) -> bool:
         """
         파일의 백업 존재 여부를 확인합니다.
@@ -116,28 +584,33 @@ class BackupManager(BackupManagerInterface):
     def cleanup_old_backups(self, days: int):
         """
         오래된 백업을 정리합니다.
+        백업 정보에서 제거한 뒤 더 이상 참조되지 않는 blob만 삭제합니다.
         
         Args:
             days: 보관할 일수
         """
         try:
             now = datetime.now()
-            to_remove = []
-            
-            # 삭제할 백업 파일 찾기
-            for file_path, info in self.backup_info.items():
-                backup_time = datetime.fromisoformat(info['last_backup'])
-                if (now - backup_time).days > days:
-                    backup_path = Path(info['backup_path'])
-                    if backup_path.exists():
-                        backup_path.unlink()
-                    to_remove.append(file_path)
-            
-            # 백업 정보에서 제거
-            for file_path in to_remove:
-                del self.backup_info[file_path]
-            
-            self._save_backup_info()
+            
+            with self._lock:
+                # 삭제할 백업 찾기
+                to_remove = []
+                for file_path, info in self.backup_info.items():
+                    backup_time = datetime.fromisoformat(info['last_backup'])
+                    if (now - backup_time).days > days:
+                        to_remove.append(file_path)
+                
+                # 백업 정보에서 제거 (이전 형식 백업은 파일도 삭제)
+                for file_path in to_remove:
+                    info = self.backup_info.remove(file_path)
+                    self._release_blobs(self._referenced_blobs(info))
+                    if 'content_hash' not in info:
+                        backup_path = Path(info['backup_path'])
+                        if backup_path.exists():
+                            backup_path.unlink()
+                
+                # 중단 등으로 남은 참조 없는 blob 정리
+                self.blob_store.gc(set(self._blob_refs))
             
         except Exception as e:
             print(f"⚠️ 백업 정리 실패: {e}")
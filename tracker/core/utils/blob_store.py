@@ -0,0 +1,165 @@
+"""
+내용 주소 기반 blob 저장소
+- 내용 해시를 키로 한 번만 저장 (중복 제거)
+- 해시 앞 2자리로 디렉토리 분산
+- 저장 시 압축 코덱 적용 (해시는 원본 기준)
+- 쓰기는 그룹 커밋 기록기를 거침 (기록 전 blob도 읽기 가능)
+- 참조되지 않는 blob 정리
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Set
+from .content_hash import compute_content_hash
+from .codec import ContentCodec
+from .group_writer import GroupCommitWriter
+
+
+class BlobStore:
+    """
+    내용 해시 -> blob 저장소
+    - 같은 내용은 파일 경로와 관계없이 한 번만 저장
+    - 임시 파일에 쓴 뒤 교체하므로 중간에 중단되어도 깨진 blob이 남지 않음
+    """
+
+    def __init__(self,
+                 root: Path,
+                 codec: Optional[ContentCodec] = None,
+                 writer: Optional[GroupCommitWriter] = None):
+        """
+        Args:
+            root: blob 디렉토리
+            codec: 압축 코덱 (None이면 압축하지 않음)
+            writer: 그룹 커밋 기록기 (None이면 바로 기록)
+        """
+        self.root = root
+        self.codec = codec or ContentCodec()
+        self.writer = writer or GroupCommitWriter()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def blob_path(self, content_hash: str) -> Path:
+        """
+        해시에 해당하는 blob 경로를 반환합니다.
+
+        Args:
+            content_hash: 내용 해시
+
+        Returns:
+            Path: blob 파일 경로 (objects/ab/cdef...)
+        """
+        return self.root / content_hash[:2] / content_hash[2:]
+
+    def put(self, data: bytes, data_class: str = 'backup') -> str:
+        """
+        내용을 저장하고 해시를 반환합니다. 이미 있으면 쓰지 않습니다.
+
+        Args:
+            data: 저장할 바이트
+            data_class: 압축 정책을 고를 데이터 종류
+
+        Returns:
+            str: 내용 해시
+        """
+        content_hash = compute_content_hash(data)
+        path = self.blob_path(content_hash)
+        # gc와 동시에 실행되어 방금 확인한 blob이 삭제되지 않도록 잠금
+        with self._lock:
+            if self.writer.is_pending(path) or path.exists():
+                return content_hash
+            self.writer.write(path, self.codec.encode(data, data_class))
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        """
+        해시에 해당하는 내용을 읽습니다.
+
+        Args:
+            content_hash: 내용 해시
+
+        Returns:
+            Optional[bytes]: 내용 (없으면 None)
+        """
+        path = self.blob_path(content_hash)
+        stored = self.writer.pending(path)
+        if stored is not None:
+            return self.codec.decode(stored)
+        try:
+            with open(path, 'rb') as f:
+                return self.codec.decode(f.read())
+        except FileNotFoundError:
+            return None
+
+    def has(self, content_hash: str) -> bool:
+        """
+        해시에 해당하는 blob이 있는지 확인합니다.
+
+        Args:
+            content_hash: 내용 해시
+
+        Returns:
+            bool: 존재 여부
+        """
+        path = self.blob_path(content_hash)
+        return self.writer.is_pending(path) or path.exists()
+
+    def remove(self, content_hash: str) -> bool:
+        """
+        blob을 삭제합니다.
+
+        Args:
+            content_hash: 내용 해시
+
+        Returns:
+            bool: 삭제 여부
+        """
+        path = self.blob_path(content_hash)
+        with self._lock:
+            # 기록 대기 중인 blob은 기록이 끝난 뒤 삭제 (삭제 후 다시 생기지 않도록)
+            if self.writer.is_pending(path):
+                self.writer.flush(raise_failed=False)
+            try:
+                path.unlink()
+                return True
+            except OSError:
+                return False
+
+    def iter_hashes(self) -> Iterator[str]:
+        """
+        저장된 모든 blob의 해시를 반환합니다.
+
+        Returns:
+            Iterator[str]: 내용 해시
+        """
+        if not self.root.exists():
+            return
+        for fanout in os.scandir(self.root):
+            if not fanout.is_dir() or len(fanout.name) != 2:
+                continue
+            for entry in os.scandir(fanout.path):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    yield fanout.name + entry.name
+
+    def gc(self, referenced: Set[str]) -> int:
+        """
+        참조되지 않는 blob을 삭제합니다.
+
+        Args:
+            referenced: 아직 사용 중인 해시 집합
+
+        Returns:
+            int: 삭제된 blob 수
+        """
+        removed = 0
+        with self._lock:
+            self.writer.flush(raise_failed=False)
+            for content_hash in list(self.iter_hashes()):
+                if content_hash in referenced:
+                    continue
+                try:
+                    self.blob_path(content_hash).unlink()
+                    removed += 1
+                except OSError:
+                    continue
+        return removed
@@ -0,0 +1,104 @@
+"""
+저장 데이터 압축 코덱
+- 데이터 종류와 크기에 따라 zlib/lzma/bz2 선택
+- 매직 헤더로 압축 여부 표시 (헤더가 없으면 이전 형식의 원본으로 간주)
+"""
+
+import bz2
+import lzma
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 0x89는 UTF-8 텍스트/JSON의 첫 바이트가 될 수 없으므로 기존 평문 데이터와 구분됨
+CODEC_MAGIC = b'\x89DAT'
+
+_CODECS = {
+    'none': (0, lambda data: data, lambda data: data),
+    'zlib': (1, lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (2, lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    'bz2': (3, lambda data: bz2.compress(data, 9), bz2.decompress),
+}
+_DECODERS = {codec_id: decompress for codec_id, _, decompress in _CODECS.values()}
+
+
+class ContentCodec:
+    """
+    데이터 종류별 압축 정책을 적용하는 코덱
+    - 정책: {데이터 종류: [(최소 크기, 코덱 이름), ...]}
+    - 데이터 크기 이상인 마지막 단계의 코덱을 사용
+    - 압축해도 작아지지 않으면 원본 그대로 저장
+    """
+
+    def __init__(self, policy: Optional[Dict[str, Sequence[Tuple[int, str]]]] = None):
+        """
+        Args:
+            policy: 데이터 종류별 (최소 크기, 코덱 이름) 단계 목록
+        """
+        self.policy: Dict[str, List[Tuple[int, str]]] = {}
+        for data_class, tiers in (policy or {}).items():
+            for _, codec_name in tiers:
+                if codec_name not in _CODECS:
+                    raise ValueError(f"지원하지 않는 압축 코덱입니다: {codec_name}")
+            self.policy[data_class] = sorted(tiers)
+
+    def select_codec(self, data_class: str, size: int) -> str:
+        """
+        데이터 종류와 크기에 맞는 코덱 이름을 반환합니다.
+
+        Args:
+            data_class: 데이터 종류 ('backup', 'delta', 'diff', 'activity' 등)
+            size: 원본 크기
+
+        Returns:
+            str: 코덱 이름
+        """
+        selected = 'none'
+        for min_size, codec_name in self.policy.get(data_class, []):
+            if size >= min_size:
+                selected = codec_name
+        return selected
+
+    def encode(self, data: bytes, data_class: str) -> bytes:
+        """
+        정책에 따라 데이터를 압축합니다.
+
+        Args:
+            data: 원본 바이트
+            data_class: 데이터 종류
+
+        Returns:
+            bytes: 저장할 바이트
+        """
+        codec_name = self.select_codec(data_class, len(data))
+        if codec_name != 'none':
+            codec_id, compress, _ = _CODECS[codec_name]
+            compressed = compress(data)
+            if len(compressed) + len(CODEC_MAGIC) + 1 < len(data):
+                return CODEC_MAGIC + bytes([codec_id]) + compressed
+
+        if data.startswith(CODEC_MAGIC):
+            # 원본이 우연히 매직 헤더로 시작하면 압축 없음 헤더를 붙여 구분
+            return CODEC_MAGIC + bytes([_CODECS['none'][0]]) + data
+        return data
+
+    @staticmethod
+    def decode(stored: bytes) -> bytes:
+        """
+        저장된 바이트를 원본으로 복원합니다. 헤더가 없으면 그대로 반환합니다.
+
+        Args:
+            stored: 저장된 바이트
+
+        Returns:
+            bytes: 원본 바이트
+
+        Raises:
+            ValueError: 알 수 없는 코덱인 경우
+        """
+        if not stored.startswith(CODEC_MAGIC):
+            return stored
+        offset = len(CODEC_MAGIC)
+        decompress = _DECODERS.get(stored[offset])
+        if decompress is None:
+            raise ValueError(f"알 수 없는 압축 코덱입니다: {stored[offset]}")
+        return decompress(stored[offset + 1:])
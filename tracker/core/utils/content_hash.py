@@ -0,0 +1,83 @@
+"""
+파일 내용 해시 유틸리티
+- 백업/매니페스트 공통 해시 함수
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Tuple
+
+# blake2b는 표준 라이브러리에 포함되어 있고 sha256보다 빠름
+HASH_DIGEST_SIZE = 20
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_content_hash(data: bytes) -> str:
+    """
+    바이트 내용의 해시값을 계산합니다.
+
+    Args:
+        data: 해시할 바이트
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    return hashlib.blake2b(data, digest_size=HASH_DIGEST_SIZE).hexdigest()
+
+
+def compute_prefix_hash(data: bytes, prefix_size: int) -> Tuple[str, str]:
+    """
+    앞부분과 전체의 해시를 한 번의 계산으로 구합니다.
+
+    Args:
+        data: 해시할 바이트
+        prefix_size: 앞부분 크기
+
+    Returns:
+        Tuple[str, str]: (앞부분 해시, 전체 해시)
+    """
+    view = memoryview(data)
+    hasher = hashlib.blake2b(view[:prefix_size], digest_size=HASH_DIGEST_SIZE)
+    prefix_hash = hasher.hexdigest()
+    hasher.update(view[prefix_size:])
+    return prefix_hash, hasher.hexdigest()
+
+
+def compute_file_hash(file_path: Path) -> Tuple[str, int]:
+    """
+    파일을 청크 단위로 읽어 해시값을 계산합니다.
+
+    Args:
+        file_path: 파일 경로
+
+    Returns:
+        Tuple[str, int]: (해시 문자열, 읽은 바이트 수)
+    """
+    hasher = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    size = 0
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            size += len(chunk)
+    return hasher.hexdigest(), size
+
+
+def decode_text(data: bytes, encoding: str = 'utf-8') -> str:
+    """
+    바이트를 텍스트로 디코딩합니다.
+    Path.read_text()와 같은 결과가 되도록 개행 문자를 '\\n'으로 정규화합니다.
+
+    Args:
+        data: 파일 바이트
+        encoding: 인코딩
+
+    Returns:
+        str: 디코딩된 텍스트
+    """
+    text = data.decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
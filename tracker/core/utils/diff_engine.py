@@ -0,0 +1,414 @@
+"""
+줄 단위 diff 엔진
+- Myers (선형 공간, middle snake 분할)
+- histogram / patience (출현 빈도가 낮은 줄을 기준점으로 분할, 실패 시 Myers)
+- difflib (이전 방식)
+- 줄 해시 배열 입력 시 공통 접두/접미를 먼저 잘라내고 남은 구간만 비교
+- 결과는 difflib.SequenceMatcher.get_opcodes()와 같은 형식
+"""
+
+import difflib
+from array import array
+from bisect import bisect_left
+from typing import Dict, Hashable, List, Sequence, Tuple
+from .line_hash import common_prefix_length, common_suffix_length
+
+Opcode = Tuple[str, int, int, int, int]
+Region = Tuple[int, int, int, int]
+
+DIFF_ALGORITHMS = ('myers', 'histogram', 'patience', 'difflib')
+DEFAULT_ALGORITHM = 'histogram'
+
+# histogram 방식에서 기준점으로 쓸 줄의 최대 출현 횟수 (넘으면 Myers로 처리)
+HISTOGRAM_MAX_CHAIN = 64
+
+
+def intern_lines(a: Sequence[Hashable], b: Sequence[Hashable]) -> Tuple[List[int], List[int]]:
+    """
+    두 줄 목록을 정수 id 목록으로 변환합니다. (같은 줄은 같은 id)
+
+    Args:
+        a: 이전 줄 목록
+        b: 새 줄 목록
+
+    Returns:
+        Tuple[List[int], List[int]]: (a의 id 목록, b의 id 목록)
+    """
+    ids: Dict[Hashable, int] = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b]
+    return a_ids, b_ids
+
+
+def compute_opcodes(a: Sequence[Hashable],
+                    b: Sequence[Hashable],
+                    algorithm: str = DEFAULT_ALGORITHM) -> List[Opcode]:
+    """
+    a를 b로 바꾸는 편집 명령 목록을 계산합니다.
+
+    Args:
+        a: 이전 줄 목록
+        b: 새 줄 목록
+        algorithm: 'myers', 'histogram', 'patience', 'difflib' 중 하나
+
+    Returns:
+        List[Opcode]: (tag, i1, i2, j1, j2) 목록 (tag: equal/replace/delete/insert)
+
+    Raises:
+        ValueError: 지원하지 않는 알고리즘인 경우
+    """
+    if algorithm == 'difflib':
+        return difflib.SequenceMatcher(None, a, b).get_opcodes()
+    if algorithm not in DIFF_ALGORITHMS:
+        raise ValueError(f"지원하지 않는 diff 알고리즘입니다: {algorithm}")
+
+    a_ids, b_ids = intern_lines(a, b)
+    matches: List[Tuple[int, int]] = []
+    stack: List[Region] = [(0, len(a_ids), 0, len(b_ids))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        alo, ahi, blo, bhi = _trim_region(a_ids, b_ids, alo, ahi, blo, bhi, matches)
+        if alo == ahi or blo == bhi:
+            continue
+        if algorithm == 'histogram':
+            split = _histogram_split(a_ids, b_ids, alo, ahi, blo, bhi, matches)
+        elif algorithm == 'patience':
+            split = _patience_split(a_ids, b_ids, alo, ahi, blo, bhi, matches)
+        else:
+            split = None
+        if split is None:
+            split = _myers_split(a_ids, b_ids, alo, ahi, blo, bhi, matches)
+        stack.extend(split)
+
+    matches.sort()
+    return _matches_to_opcodes(matches, len(a_ids), len(b_ids))
+
+
+def compute_hashed_opcodes(a_hashes: array,
+                           b_hashes: array,
+                           algorithm: str = DEFAULT_ALGORITHM) -> List[Opcode]:
+    """
+    줄 해시 배열로 편집 명령 목록을 계산합니다.
+    공통 접두/접미는 배열 슬라이스 비교로 잘라내고 가운데 구간만 diff합니다.
+    (64비트 해시가 같은 줄은 같은 줄로 간주)
+
+    Args:
+        a_hashes: 이전 내용의 줄 해시 배열
+        b_hashes: 새 내용의 줄 해시 배열
+        algorithm: diff 알고리즘
+
+    Returns:
+        List[Opcode]: (tag, i1, i2, j1, j2) 목록
+    """
+    n = len(a_hashes)
+    m = len(b_hashes)
+    if algorithm == 'difflib':
+        # 이전 방식은 결과가 그대로 유지되도록 전체를 비교
+        return compute_opcodes(a_hashes, b_hashes, algorithm)
+
+    prefix = common_prefix_length(a_hashes, b_hashes)
+    suffix = common_suffix_length(a_hashes, b_hashes, min(n, m) - prefix)
+
+    opcodes: List[Opcode] = []
+    if prefix:
+        opcodes.append(('equal', 0, prefix, 0, prefix))
+    window = compute_opcodes(a_hashes[prefix:n - suffix], b_hashes[prefix:m - suffix], algorithm)
+    for tag, i1, i2, j1, j2 in window:
+        opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(('equal', n - suffix, n, m - suffix, m))
+    return opcodes
+
+
+def _trim_region(a: List[int], b: List[int],
+                 alo: int, ahi: int, blo: int, bhi: int,
+                 matches: List[Tuple[int, int]]) -> Region:
+    """영역의 공통 접두/접미 줄을 일치로 기록하고 남은 영역을 반환합니다."""
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        matches.append((ahi, bhi))
+    return alo, ahi, blo, bhi
+
+
+def _myers_split(a: List[int], b: List[int],
+                 alo: int, ahi: int, blo: int, bhi: int,
+                 matches: List[Tuple[int, int]]) -> List[Region]:
+    """
+    Myers middle snake로 영역을 둘로 나눕니다. (선형 공간)
+    접두/접미가 제거되어 양쪽 모두 비어 있지 않은 영역만 받습니다.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    delta = n - m
+    odd = delta & 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    vf = [0] * (2 * offset + 1)
+    vb = [0] * (2 * offset + 1)
+
+    for d in range(max_d + 1):
+        # 정방향 탐색
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[offset + k - 1] < vf[offset + k + 1]):
+                x = vf[offset + k + 1]
+            else:
+                x = vf[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            vf[offset + k] = x
+            c = delta - k
+            if odd and -(d - 1) <= c <= d - 1 and x + vb[offset + c] >= n:
+                return _split_at_snake(alo, ahi, blo, bhi, x0, y0, x, y, matches)
+
+        # 역방향 탐색 (끝에서부터의 거리로 기록)
+        for c in range(-d, d + 1, 2):
+            if c == -d or (c != d and vb[offset + c - 1] < vb[offset + c + 1]):
+                x = vb[offset + c + 1]
+            else:
+                x = vb[offset + c - 1] + 1
+            y = x - c
+            x0, y0 = x, y
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            vb[offset + c] = x
+            k = delta - c
+            if not odd and -d <= k <= d and x + vf[offset + k] >= n:
+                return _split_at_snake(alo, ahi, blo, bhi, n - x, m - y, n - x0, m - y0, matches)
+
+    # 도달하지 않음 (모든 경로는 max_d 안에서 만남)
+    return []
+
+
+def _split_at_snake(alo: int, ahi: int, blo: int, bhi: int,
+                    x: int, y: int, u: int, v: int,
+                    matches: List[Tuple[int, int]]) -> List[Region]:
+    """snake (x, y) -> (u, v)를 일치로 기록하고 앞/뒤 영역을 반환합니다."""
+    for step in range(u - x):
+        matches.append((alo + x + step, blo + y + step))
+    return [(alo, alo + x, blo, blo + y), (alo + u, ahi, blo + v, bhi)]
+
+
+def _histogram_split(a: List[int], b: List[int],
+                     alo: int, ahi: int, blo: int, bhi: int,
+                     matches: List[Tuple[int, int]]):
+    """
+    a에서 출현 횟수가 가장 적은 공통 줄을 기준으로 가장 긴 일치 구간을 찾아 나눕니다.
+    공통 줄이 없으면 분할 없이 끝내고, 기준 줄이 너무 흔하면 None을 반환합니다.
+    """
+    positions: Dict[int, List[int]] = {}
+    for i in range(alo, ahi):
+        positions.setdefault(a[i], []).append(i)
+
+    best = None
+    best_count = HISTOGRAM_MAX_CHAIN
+    best_len = 0
+    has_common = False
+    j = blo
+    while j < bhi:
+        occurrences = positions.get(b[j])
+        if occurrences is None:
+            j += 1
+            continue
+        has_common = True
+        if len(occurrences) > best_count:
+            j += 1
+            continue
+        next_j = j + 1
+        for i in occurrences:
+            # 일치 구간을 앞뒤로 확장
+            s_a, s_b = i, j
+            while s_a > alo and s_b > blo and a[s_a - 1] == b[s_b - 1]:
+                s_a -= 1
+                s_b -= 1
+            e_a, e_b = i + 1, j + 1
+            while e_a < ahi and e_b < bhi and a[e_a] == b[e_b]:
+                e_a += 1
+                e_b += 1
+            length = e_a - s_a
+            count = min(len(positions[a[p]]) for p in range(s_a, e_a))
+            if count < best_count or (count == best_count and length > best_len):
+                best = (s_a, s_b, length)
+                best_count = count
+                best_len = length
+            next_j = max(next_j, e_b)
+        j = next_j
+
+    if best is None:
+        # 공통 줄이 없으면 영역 전체가 교체, 흔한 줄만 있으면 Myers로 처리
+        return None if has_common else []
+
+    s_a, s_b, length = best
+    for step in range(length):
+        matches.append((s_a + step, s_b + step))
+    return [(alo, s_a, blo, s_b), (s_a + length, ahi, s_b + length, bhi)]
+
+
+def _patience_split(a: List[int], b: List[int],
+                    alo: int, ahi: int, blo: int, bhi: int,
+                    matches: List[Tuple[int, int]]):
+    """
+    양쪽에서 한 번씩만 나오는 줄의 최장 증가 부분열을 기준점으로 나눕니다.
+    기준점이 없으면 None을 반환합니다.
+    """
+    a_count: Dict[int, int] = {}
+    a_pos: Dict[int, int] = {}
+    for i in range(alo, ahi):
+        a_count[a[i]] = a_count.get(a[i], 0) + 1
+        a_pos[a[i]] = i
+    b_count: Dict[int, int] = {}
+    b_pos: Dict[int, int] = {}
+    for j in range(blo, bhi):
+        if a_count.get(b[j]) == 1:
+            b_count[b[j]] = b_count.get(b[j], 0) + 1
+            b_pos[b[j]] = j
+
+    # b 순서로 정렬된 고유 공통 줄의 a 위치
+    pairs = [(a_pos[line], j) for line, j in sorted(b_pos.items(), key=lambda item: item[1])
+             if b_count[line] == 1]
+    if not pairs:
+        return None
+
+    # patience sorting으로 a 위치의 최장 증가 부분열 계산
+    tails: List[int] = []
+    tail_index: List[int] = []
+    prev = [-1] * len(pairs)
+    for index, (i, _) in enumerate(pairs):
+        pile = bisect_left(tails, i)
+        if pile > 0:
+            prev[index] = tail_index[pile - 1]
+        if pile == len(tails):
+            tails.append(i)
+            tail_index.append(index)
+        else:
+            tails[pile] = i
+            tail_index[pile] = index
+
+    anchors = []
+    index = tail_index[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = prev[index]
+    anchors.reverse()
+
+    regions = []
+    prev_a, prev_b = alo, blo
+    for i, j in anchors:
+        matches.append((i, j))
+        regions.append((prev_a, i, prev_b, j))
+        prev_a, prev_b = i + 1, j + 1
+    regions.append((prev_a, ahi, prev_b, bhi))
+    return regions
+
+
+def _matches_to_opcodes(matches: List[Tuple[int, int]], n: int, m: int) -> List[Opcode]:
+    """정렬된 일치 쌍 목록을 편집 명령 목록으로 변환합니다."""
+    opcodes: List[Opcode] = []
+    i = j = 0
+    index = 0
+    while index < len(matches):
+        mi, mj = matches[index]
+        if i < mi or j < mj:
+            tag = 'replace' if i < mi and j < mj else ('delete' if i < mi else 'insert')
+            opcodes.append((tag, i, mi, j, mj))
+        # 연속된 일치 쌍은 하나의 equal로 묶음
+        end = index + 1
+        while end < len(matches) and matches[end] == (mi + end - index, mj + end - index):
+            end += 1
+        length = end - index
+        opcodes.append(('equal', mi, mi + length, mj, mj + length))
+        i, j = mi + length, mj + length
+        index = end
+    if i < n or j < m:
+        tag = 'replace' if i < n and j < m else ('delete' if i < n else 'insert')
+        opcodes.append((tag, i, n, j, m))
+    return opcodes
+
+
+def group_opcodes(opcodes: List[Opcode], n: int = 3) -> List[List[Opcode]]:
+    """
+    변경 주변 n줄의 문맥만 남겨 hunk 단위로 묶습니다.
+    (difflib.SequenceMatcher.get_grouped_opcodes와 같은 동작)
+
+    Args:
+        opcodes: compute_opcodes() 결과
+        n: 문맥 줄 수
+
+    Returns:
+        List[List[Opcode]]: hunk별 편집 명령 목록
+    """
+    codes = list(opcodes) or [('equal', 0, 1, 0, 1)]
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    groups = []
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > n * 2:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        groups.append(group)
+    return groups
+
+
+def _format_range(start: int, stop: int) -> str:
+    """unified diff 범위 표기를 만듭니다."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff(a: Sequence[str],
+                 b: Sequence[str],
+                 opcodes: List[Opcode],
+                 n: int = 3,
+                 lineterm: str = '\n') -> List[str]:
+    """
+    편집 명령으로 unified diff 줄 목록을 만듭니다. (difflib.unified_diff와 같은 형식)
+
+    Args:
+        a: 이전 줄 목록
+        b: 새 줄 목록
+        opcodes: compute_opcodes() 결과
+        n: 문맥 줄 수
+        lineterm: 헤더 줄 끝 문자
+
+    Returns:
+        List[str]: diff 줄 목록
+    """
+    lines = []
+    for group in group_opcodes(opcodes, n):
+        if not lines:
+            lines.append(f"--- {lineterm}")
+            lines.append(f"+++ {lineterm}")
+        first, last = group[0], group[-1]
+        lines.append(f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@{lineterm}")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                lines.extend(' ' + line for line in a[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                lines.extend('-' + line for line in a[i1:i2])
+            if tag in ('replace', 'insert'):
+                lines.extend('+' + line for line in b[j1:j2])
+    return lines
@@ -3,65 +3,115 @@ Diff 생성기 구현
 - 텍스트 파일 변경사항 생성
 - diff 포맷팅
 - 파일 타입별 처리
+- diff 알고리즘 선택 (myers/histogram/patience/difflib)
 """
 
 from pathlib import Path
-from typing import Set, Dict, Any, List
+from typing import Set, Dict, Any, List, Optional
+from array import array
 from datetime import datetime
-import difflib
 from interfaces.diff.generator import DiffGeneratorInterface
+from .diff_engine import compute_hashed_opcodes, DEFAULT_ALGORITHM, DIFF_ALGORITHMS
+from .line_hash import compute_line_hashes
 
 class TextDiffGenerator(DiffGeneratorInterface):
     """텍스트 파일용 Diff 생성기"""
     
-    def __init__(self, supported_extensions: Set[str] = None):
+    def __init__(self, supported_extensions: Set[str] = None, algorithm: str = DEFAULT_ALGORITHM):
+        """
+        Args:
+            supported_extensions: 지원하는 파일 확장자
+            algorithm: diff 알고리즘 ('myers', 'histogram', 'patience', 'difflib')
+        """
+        if algorithm not in DIFF_ALGORITHMS:
+            raise ValueError(f"지원하지 않는 diff 알고리즘입니다: {algorithm}")
         self.supported_extensions = supported_extensions or {'.txt', '.py', '.md', '.json', '.yaml', '.yml'}
+        self.algorithm = algorithm
     
-    def generate_diff(self, old_content: str, new_content: str) -> Dict[str, Any]:
+    def generate_diff(self,
+                      old_content: str,
+                      new_content: str,
+                      old_line_hashes: Optional[array] = None,
+                      new_line_hashes: Optional[array] = None) -> Dict[str, Any]:
         """
         파일의 변경사항을 생성합니다.
+        줄 해시 배열로 공통 접두/접미를 잘라낸 뒤 가운데 구간만 비교합니다.
         
         Args:
             old_content: 이전 파일 내용
             new_content: 새로운 파일 내용
+            old_line_hashes: 이전 내용의 줄 해시 배열 (백업에 저장된 값, 없으면 계산)
+            new_line_hashes: 새 내용의 줄 해시 배열 (없으면 계산)
             
         Returns:
             Dict[str, Any]: 생성된 diff 데이터
             {
                 'changes': List[Dict],  # 변경사항 목록
                 'summary': Dict,        # 변경 요약
-                'metadata': Dict        # 메타데이터
+                'metadata': Dict,       # 메타데이터
+                'opcodes': List[Tuple]  # 편집 명령 (패치 저장에 재사용)
             }
         """
-        # diff 생성
-        diff = list(difflib.unified_diff(
-            old_content.splitlines(keepends=True),
-            new_content.splitlines(keepends=True),
-            lineterm=''
-        ))
+        old_lines = old_content.splitlines(keepends=True)
+        new_lines = new_content.splitlines(keepends=True)
+        if old_line_hashes is None or len(old_line_hashes) != len(old_lines):
+            old_line_hashes = compute_line_hashes(old_lines)
+        if new_line_hashes is None or len(new_line_hashes) != len(new_lines):
+            new_line_hashes = compute_line_hashes(new_lines)
+        opcodes = compute_hashed_opcodes(old_line_hashes, new_line_hashes, self.algorithm)
         
-        # 변경사항 분석
+        # 변경사항 분석 (unified diff와 같은 순서: 교체는 삭제 줄 다음 추가 줄)
         changes = []
         summary = {
             'added_lines': 0,
             'removed_lines': 0,
-            'modified_files': 1 if diff else 0
+            'modified_files': 0
         }
         
-        for line in diff:
-            if line.startswith('+') and not line.startswith('+++'):
-                summary['added_lines'] += 1
-                changes.append({'type': 'add', 'content': line[1:]})
-            elif line.startswith('-') and not line.startswith('---'):
-                summary['removed_lines'] += 1
-                changes.append({'type': 'remove', 'content': line[1:]})
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'equal':
+                continue
+            summary['modified_files'] = 1
+            for line in old_lines[i1:i2]:
+                changes.append({'type': 'remove', 'content': line})
+            for line in new_lines[j1:j2]:
+                changes.append({'type': 'add', 'content': line})
+            summary['removed_lines'] += i2 - i1
+            summary['added_lines'] += j2 - j1
         
         return {
             'changes': changes,
             'summary': summary,
             'metadata': {
                 'generated_at': datetime.now().isoformat(),
-                'diff_type': 'unified'
+                'diff_type': 'unified',
+                'algorithm': self.algorithm
+            },
+            'opcodes': opcodes
+        }
+    
+    def generate_append_diff(self, appended_content: str) -> Dict[str, Any]:
+        """
+        뒤에 내용만 추가된 경우의 변경사항을 생성합니다. (이전 내용과 비교하지 않음)
+        
+        Args:
+            appended_content: 추가된 내용 (이전 내용은 줄바꿈으로 끝남)
+            
+        Returns:
+            Dict[str, Any]: generate_diff()와 같은 형식의 diff 데이터
+        """
+        lines = appended_content.splitlines(keepends=True)
+        return {
+            'changes': [{'type': 'add', 'content': line} for line in lines],
+            'summary': {
+                'added_lines': len(lines),
+                'removed_lines': 0,
+                'modified_files': 1 if lines else 0
+            },
+            'metadata': {
+                'generated_at': datetime.now().isoformat(),
+                'diff_type': 'append',
+                'algorithm': None
             }
         }
     
@@ -0,0 +1,125 @@
+"""
+디렉토리 스캐너
+- os.scandir 기반 디렉토리 탐색
+- 제외 디렉토리는 내려가기 전에 가지치기 (FileFilter 규칙 사용)
+- 하위 디렉토리를 스레드 풀에서 병렬 탐색
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from .file_filter import FileFilter
+
+
+class ScanEntry:
+    """
+    스캔 결과 항목
+    - DirEntry와 탐색 중 얻은 stat 결과를 함께 보관하여 추가 stat 호출을 없앰
+    """
+
+    __slots__ = ('entry', 'stat_result', '_path')
+
+    def __init__(self, entry: os.DirEntry, stat_result: os.stat_result):
+        self.entry = entry
+        self.stat_result = stat_result
+        self._path: Optional[Path] = None
+
+    @property
+    def path(self) -> Path:
+        """파일 경로"""
+        if self._path is None:
+            self._path = Path(self.entry.path)
+        return self._path
+
+    @property
+    def name(self) -> str:
+        """파일 이름"""
+        return self.entry.name
+
+    def stat(self) -> os.stat_result:
+        """캐시된 stat 결과를 반환합니다."""
+        return self.stat_result
+
+
+class DirectoryScanner:
+    """
+    추적 대상 파일을 찾는 병렬 디렉토리 스캐너
+    - 확장자별로 트리를 여러 번 도는 대신 한 번만 탐색
+    - 제외 규칙에 해당하는 디렉토리는 아예 내려가지 않음
+    """
+
+    def __init__(self,
+                 root: Path,
+                 file_filter: FileFilter,
+                 max_workers: int = 8):
+        """
+        Args:
+            root: 탐색을 시작할 디렉토리
+            file_filter: 디렉토리 가지치기와 파일 선택에 사용할 필터
+            max_workers: 탐색 스레드 수
+        """
+        self.root = root
+        self.file_filter = file_filter
+        self.file_extensions = set(file_filter.get_file_extensions())
+        self.max_workers = max_workers
+
+    def scan(self) -> Iterator[ScanEntry]:
+        """
+        추적 대상 파일을 찾는 대로 반환합니다. (순서는 보장하지 않음)
+
+        Returns:
+            Iterator[ScanEntry]: 스캔 결과 항목
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='tracker-scanner'
+        )
+        try:
+            pending = {executor.submit(self._scan_dir, str(self.root))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(executor.submit(self._scan_dir, subdir))
+                    yield from files
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _scan_dir(self, dir_path: str) -> Tuple[List[ScanEntry], List[str]]:
+        """
+        디렉토리 하나를 탐색합니다.
+
+        Args:
+            dir_path: 탐색할 디렉토리 경로
+
+        Returns:
+            Tuple[List[ScanEntry], List[str]]: (대상 파일 목록, 내려갈 하위 디렉토리 목록)
+        """
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.file_filter.is_excluded_dir(Path(entry.path)):
+                                subdirs.append(entry.path)
+                            continue
+
+                        if not entry.is_file():
+                            continue
+                        if os.path.splitext(entry.name)[1] not in self.file_extensions:
+                            continue
+
+                        stat_result = entry.stat()
+                        scan_entry = ScanEntry(entry, stat_result)
+                        if self.file_filter.should_track(scan_entry.path, file_size=stat_result.st_size):
+                            files.append(scan_entry)
+                    except OSError:
+                        # 탐색 중 삭제되었거나 접근할 수 없는 항목
+                        continue
+        except OSError as e:
+            print(f"⚠️ 디렉토리 탐색 실패: {dir_path} ({e})")
+        return files, subdirs
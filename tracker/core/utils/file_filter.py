@@ -3,12 +3,14 @@
 - 파일 추적 여부 결정
 - 제외 디렉토리 관리
 - 파일 확장자 관리
+- gitignore 스타일 제외 규칙 적용
 """
 
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Optional
 import shutil
 from interfaces.file.filter import FileFilterInterface
+from .ignore_rules import IgnoreRuleEngine, build_exclude_patterns
 
 class FileFilter(FileFilterInterface):
     """파일 필터링 클래스"""
@@ -17,38 +19,83 @@ class FileFilter(FileFilterInterface):
                  exclude_dirs: List[str],
                  file_extensions: Set[str],
                  max_file_size: int,
-                 backup_exclude_dir: Path):
+                 backup_exclude_dir: Path,
+                 root_dir: Optional[Path] = None,
+                 ignore_patterns: Optional[List[str]] = None,
+                 use_gitignore: bool = True):
         self.exclude_dirs = exclude_dirs
         self.file_extensions = file_extensions
         self.max_file_size = max_file_size
         self.backup_exclude_dir = backup_exclude_dir
+        
+        # 제외 규칙은 한 번만 컴파일하고 디렉토리별 판정은 캐시
+        self.rules = IgnoreRuleEngine(
+            root_dir=root_dir,
+            patterns=build_exclude_patterns(exclude_dirs, ignore_patterns or []),
+            use_gitignore=use_gitignore
+        )
     
-    def should_track(self, file_path: Path) -> bool:
+    def matches(self, file_path: Path) -> bool:
         """
-        해당 파일을 추적해야 하는지 결정합니다.
+        파일 크기를 제외한 조건(확장자, 제외 규칙)만 검사합니다.
+        stat을 호출하지 않으므로 observer 스레드에서 사용합니다.
         
         Args:
             file_path: 확인할 파일 경로
             
         Returns:
-            bool: 추적 여부
+            bool: 추적 대상 여부
         """
-        # 제외 디렉토리 검사
-        if any(part in self.exclude_dirs for part in file_path.parts):
+        # 확장자 검사 (가장 저렴한 검사부터)
+        if file_path.suffix not in self.file_extensions:
             return False
         
-        # 확장자 검사
-        if file_path.suffix not in self.file_extensions:
+        # 제외 규칙 검사
+        return not self.rules.is_file_ignored(file_path)
+    
+    def should_track(self, file_path: Path, file_size: Optional[int] = None) -> bool:
+        """
+        해당 파일을 추적해야 하는지 결정합니다.
+        
+        Args:
+            file_path: 확인할 파일 경로
+            file_size: 이미 알고 있는 파일 크기 (None이면 stat으로 확인)
+            
+        Returns:
+            bool: 추적 여부
+        """
+        if not self.matches(file_path):
             return False
         
         # 파일 크기 검사
-        try:
-            if file_path.stat().st_size > self.max_file_size:
+        if file_size is None:
+            try:
+                file_size = file_path.stat().st_size
+            except Exception:
                 return False
-        except Exception:
-            return False
         
-        return True
+        return file_size <= self.max_file_size
+    
+    def is_excluded_dir(self, dir_path: Path) -> bool:
+        """
+        디렉토리가 제외 대상인지 확인합니다. (판정 결과는 디렉토리별로 캐시)
+        
+        Args:
+            dir_path: 디렉토리 경로
+            
+        Returns:
+            bool: 제외 여부
+        """
+        return self.rules.is_dir_ignored(dir_path)
+    
+    def invalidate_rules(self, dir_path: Optional[Path] = None):
+        """
+        .gitignore가 변경되었을 때 해당 디렉토리의 판정 캐시를 비웁니다.
+        
+        Args:
+            dir_path: .gitignore가 있는 디렉토리 (None이면 전체)
+        """
+        self.rules.invalidate(dir_path)
     
     def get_exclude_dirs(self) -> List[str]:
         """
@@ -0,0 +1,150 @@
+"""
+파일 매니페스트 관리
+- 추적 중인 파일의 크기/수정 시간/내용 해시 기록
+- 시작 시 변경된 파일만 다시 읽도록 판단
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+
+class FileManifest:
+    """
+    마지막으로 처리한 파일 상태를 기록하는 매니페스트
+    - path -> {size, mtime_ns, hash}
+    - hash는 원본 파일 바이트의 해시 (content_hash.compute_content_hash)
+    """
+
+    MANIFEST_FILENAME = "file_manifest.json"
+    VERSION = 1
+
+    def __init__(self, manifest_dir: Path):
+        self.manifest_path = manifest_dir / self.MANIFEST_FILENAME
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """매니페스트 파일을 로드합니다."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                return {}
+            return data.get('entries', {})
+        except Exception as e:
+            print(f"⚠️ 매니페스트 로드 실패, 전체 검사를 수행합니다: {e}")
+            return {}
+
+    def save(self):
+        """
+        변경된 내용이 있으면 매니페스트를 저장합니다.
+        임시 파일에 쓴 뒤 교체하므로 저장 중 중단되어도 기존 파일은 유지됩니다.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': self.VERSION, 'entries': self.entries}
+            tmp_path = self.manifest_path.with_suffix('.json.tmp')
+            try:
+                self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.manifest_path)
+                self._dirty = False
+            except Exception as e:
+                print(f"⚠️ 매니페스트 저장 실패: {e}")
+
+    def is_unchanged(self, file_path: Path, stat: os.stat_result) -> bool:
+        """
+        파일의 크기와 수정 시간이 기록과 같은지 확인합니다.
+
+        Args:
+            file_path: 파일 경로
+            stat: 파일의 stat 결과
+
+        Returns:
+            bool: 기록된 상태와 같으면 True
+        """
+        entry = self.entries.get(str(file_path))
+        return (entry is not None
+                and entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns)
+
+    def get_hash(self, file_path: Path) -> Optional[str]:
+        """
+        기록된 내용 해시를 반환합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            Optional[str]: 해시 (기록이 없으면 None)
+        """
+        entry = self.entries.get(str(file_path))
+        return entry['hash'] if entry else None
+
+    def get_entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        파일의 매니페스트 항목을 반환합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            Optional[Dict[str, Any]]: {size, mtime_ns, hash} (기록이 없으면 None)
+        """
+        return self.entries.get(str(file_path))
+
+    def update(self, file_path: Path, size: int, mtime_ns: int, content_hash: str):
+        """
+        파일 상태를 기록합니다.
+
+        Args:
+            file_path: 파일 경로
+            size: 파일 크기
+            mtime_ns: 수정 시간 (나노초)
+            content_hash: 내용 해시
+        """
+        with self._lock:
+            self.entries[str(file_path)] = {
+                'size': size,
+                'mtime_ns': mtime_ns,
+                'hash': content_hash
+            }
+            self._dirty = True
+
+    def remove(self, file_path: Path):
+        """
+        파일 기록을 삭제합니다.
+
+        Args:
+            file_path: 파일 경로
+        """
+        with self._lock:
+            if self.entries.pop(str(file_path), None) is not None:
+                self._dirty = True
+
+    def prune(self, seen_paths: Iterable[str]) -> int:
+        """
+        이번 검사에서 발견되지 않은 (삭제된) 파일 기록을 정리합니다.
+
+        Args:
+            seen_paths: 검사에서 발견된 파일 경로 문자열 목록
+
+        Returns:
+            int: 삭제된 기록 수
+        """
+        seen = set(seen_paths)
+        with self._lock:
+            stale = [path for path in self.entries if path not in seen]
+            for path in stale:
+                del self.entries[path]
+            if stale:
+                self._dirty = True
+        return len(stale)
@@ -0,0 +1,370 @@
+"""
+그룹 커밋 기록기
+- 저장소 쓰기를 백그라운드 스레드 하나로 모아 묶음(group) 단위로 기록
+- 제한된 크기의 큐 (가득 차면 호출한 스레드가 대기)
+- 내구성 수준 선택 ('buffered', 'group', 'sync')
+- 아직 기록되지 않은 내용도 읽을 수 있도록 대기 중인 쓰기를 보관
+- 기다리지 않은 쓰기가 실패하면 다음 flush()/raise_failed()에서 WriteFailedError로 알림
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+DURABILITY_LEVELS = ('buffered', 'group', 'sync')
+
+
+class WriteFailedError(OSError):
+    """기다리지 않고 요청한 쓰기가 기록되지 못한 경우"""
+
+    def __init__(self, errors: List[Tuple[str, Exception]]):
+        self.errors = errors
+        paths = ', '.join(path for path, _ in errors[:3])
+        more = f" 외 {len(errors) - 3}건" if len(errors) > 3 else ""
+        super().__init__(f"기록되지 않은 쓰기 {len(errors)}건: {paths}{more} ({errors[0][1]})")
+
+
+class _WriteOp:
+    """대기 중인 쓰기 한 건"""
+
+    __slots__ = ('kind', 'path', 'data', 'fsync', 'done', 'error')
+
+    def __init__(self, kind: str, path: str, data: bytes, fsync: bool, wait: bool):
+        self.kind = kind
+        self.path = path
+        self.data = data
+        self.fsync = fsync
+        self.done: Optional[threading.Event] = threading.Event() if wait else None
+        self.error: Optional[Exception] = None
+
+
+class GroupCommitWriter:
+    """
+    파일 쓰기를 모아 한 번에 기록하는 기록기
+    - write(): 임시 파일에 쓴 뒤 교체 (blob, diff 파일)
+    - append(): 파일 끝에 추가 (활동 로그, 백업 카탈로그 로그)
+    - 같은 경로에 write()와 append()를 섞어 쓰지 않음
+    - start() 전이나 close() 후에는 호출한 스레드에서 바로 기록
+    """
+
+    def __init__(self,
+                 durability: str = 'group',
+                 flush_interval: float = 0.05,
+                 max_queue: int = 1024,
+                 max_batch: int = 256):
+        """
+        Args:
+            durability: 내구성 수준
+                'buffered': 요청한 쓰기만 fsync, 호출자는 기다리지 않음
+                'group': 묶음마다 모든 파일을 fsync, 호출자는 기다리지 않음
+                'sync': 'group'과 같이 기록하고 호출자는 fsync가 끝날 때까지 대기
+            flush_interval: 첫 쓰기 이후 묶음을 모으는 최대 시간 (초)
+            max_queue: 대기 가능한 최대 쓰기 수 (넘으면 호출자가 대기)
+            max_batch: 한 묶음의 최대 쓰기 수
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"지원하지 않는 내구성 수준입니다: {durability}")
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, max_batch)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        # 경로 -> 마지막으로 대기 중인 write() (기록 전에 읽을 수 있도록 보관)
+        self._pending_writes: Dict[str, _WriteOp] = {}
+        # 경로 -> 대기 중인 쓰기 수 (write + append)
+        self._pending_counts = Counter()
+        # 기다리는 호출자가 없어 아직 알리지 못한 실패 (경로, 오류)
+        self._failed: List[Tuple[str, Exception]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stats = {'ops': 0, 'commits': 0, 'max_batch': 0, 'errors': 0}
+
+    # ------------------------------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------------------------------
+    def start(self):
+        """기록 스레드를 시작합니다."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name='tracker-writer',
+            daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        """대기 중인 쓰기를 모두 기록하고 기록 스레드를 종료합니다."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def flush(self, raise_failed: bool = True):
+        """
+        지금까지 요청된 쓰기가 모두 기록될 때까지 기다립니다.
+
+        Args:
+            raise_failed: 아직 알리지 않은 실패를 알릴지 여부
+                (기록 순서만 맞추려는 내부 호출은 False로 두어 실패를 다음 호출자에게 남김)
+
+        Raises:
+            WriteFailedError: 아직 알리지 않은 실패한 쓰기가 있는 경우
+        """
+        barrier = _WriteOp('barrier', '', b'', fsync=False, wait=True)
+        if self._enqueue(barrier):
+            barrier.done.wait()
+        if raise_failed:
+            self.raise_failed()
+
+    def raise_failed(self, root: Optional[Path] = None):
+        """
+        아직 알리지 않은 실패한 쓰기가 있으면 알립니다. (한 번 알린 실패는 다시 알리지 않음)
+
+        Args:
+            root: 이 디렉토리 아래의 실패만 알림 (None이면 전부)
+
+        Raises:
+            WriteFailedError: 실패한 쓰기가 있는 경우
+        """
+        prefix = os.path.join(str(root), '') if root is not None else ''
+        with self._lock:
+            failed = [item for item in self._failed if item[0].startswith(prefix)]
+            if not failed:
+                return
+            self._failed = [item for item in self._failed if not item[0].startswith(prefix)]
+        raise WriteFailedError(failed)
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def write(self, path: Path, data: bytes, fsync: bool = False):
+        """
+        파일 전체를 기록합니다. (임시 파일에 쓴 뒤 교체)
+
+        Args:
+            path: 파일 경로
+            data: 기록할 바이트
+            fsync: 내구성 수준과 관계없이 fsync 수행 여부
+        """
+        self._submit(_WriteOp('write', str(path), data, fsync, wait=self.durability == 'sync'))
+
+    def append(self, path: Path, data: bytes, fsync: bool = False):
+        """
+        파일 끝에 추가합니다.
+
+        Args:
+            path: 파일 경로
+            data: 추가할 바이트
+            fsync: 내구성 수준과 관계없이 fsync 수행 여부
+        """
+        self._submit(_WriteOp('append', str(path), data, fsync, wait=self.durability == 'sync'))
+
+    def _submit(self, op: _WriteOp):
+        """
+        쓰기를 대기열에 넣습니다. 기록 스레드가 없으면 바로 기록합니다.
+
+        Raises:
+            OSError: 기다린 쓰기(바로 기록한 쓰기 포함)가 실패한 경우
+        """
+        with self._lock:
+            if op.kind == 'write':
+                self._pending_writes[op.path] = op
+            self._pending_counts[op.path] += 1
+        if not self._enqueue(op):
+            # 호출한 스레드에서 바로 기록하므로 실패를 그대로 알림
+            op.done = threading.Event()
+            self._commit([op])
+        elif op.done is not None:
+            op.done.wait()
+        if op.error is not None and op.done is not None:
+            raise op.error
+
+    def _enqueue(self, op: _WriteOp) -> bool:
+        """기록 스레드가 실행 중이면 대기열에 넣습니다. (가득 차면 대기)"""
+        if not self._running:
+            return False
+        self._queue.put(op)
+        return True
+
+    # ------------------------------------------------------------------
+    # 대기 중인 쓰기 조회
+    # ------------------------------------------------------------------
+    def pending(self, path: Path) -> Optional[bytes]:
+        """
+        아직 기록되지 않은 write()의 내용을 반환합니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            Optional[bytes]: 대기 중인 내용 (없으면 None)
+        """
+        with self._lock:
+            op = self._pending_writes.get(str(path))
+            return op.data if op is not None else None
+
+    def is_pending(self, path: Path) -> bool:
+        """
+        경로에 아직 기록되지 않은 쓰기가 있는지 확인합니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            bool: 대기 중인 쓰기 존재 여부
+        """
+        with self._lock:
+            return self._pending_counts[str(path)] > 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        기록 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 기록한 쓰기 수, 묶음 수, 최대 묶음 크기, 실패 수, 대기 중인 쓰기 수
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+    # ------------------------------------------------------------------
+    # 기록 스레드
+    # ------------------------------------------------------------------
+    def _run(self):
+        """대기열에서 쓰기를 모아 묶음 단위로 기록합니다."""
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            batch = [op]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and op.kind != 'barrier':
+                timeout = deadline - time.monotonic()
+                try:
+                    op = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    stop = True
+                    break
+                batch.append(op)
+            self._commit(batch)
+            if stop:
+                # 종료 표시와 거의 동시에 들어온 쓰기까지 기록
+                while True:
+                    try:
+                        op = self._queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    if op is not None:
+                        self._commit([op])
+
+    def _commit(self, batch: List[_WriteOp]):
+        """묶음을 기록합니다. 같은 경로의 write()는 마지막 것만, append()는 이어서 한 번에 기록합니다."""
+        durable = self.durability != 'buffered'
+        writes: Dict[str, _WriteOp] = {}
+        fsync_requested: Set[str] = set()
+        appends: Dict[str, List[_WriteOp]] = {}
+        for op in batch:
+            if op.kind == 'write':
+                writes[op.path] = op
+                if op.fsync:
+                    fsync_requested.add(op.path)
+            elif op.kind == 'append':
+                appends.setdefault(op.path, []).append(op)
+
+        synced_dirs: Set[str] = set()
+        errors: Dict[str, Exception] = {}
+        for path, op in writes.items():
+            need_fsync = durable or path in fsync_requested
+            try:
+                self._write_file(Path(path), op.data, need_fsync)
+                if need_fsync:
+                    synced_dirs.add(os.path.dirname(path))
+            except Exception as e:
+                errors[path] = e
+                print(f"⚠️ 파일 기록 실패: {path} ({e})")
+
+        for path, ops in appends.items():
+            need_fsync = durable or any(o.fsync for o in ops)
+            try:
+                with open(path, 'ab') as f:
+                    f.write(b''.join(o.data for o in ops))
+                    f.flush()
+                    if need_fsync:
+                        os.fsync(f.fileno())
+            except Exception as e:
+                errors[path] = e
+                print(f"⚠️ 파일 추가 기록 실패: {path} ({e})")
+
+        for dir_path in synced_dirs:
+            self._fsync_dir(dir_path)
+
+        with self._lock:
+            committed = 0
+            for op in batch:
+                if op.kind == 'barrier':
+                    continue
+                committed += 1
+                if self._pending_writes.get(op.path) is op:
+                    del self._pending_writes[op.path]
+                self._pending_counts[op.path] -= 1
+                if self._pending_counts[op.path] <= 0:
+                    del self._pending_counts[op.path]
+            if committed:
+                self._stats['ops'] += committed
+                self._stats['commits'] += 1
+                self._stats['max_batch'] = max(self._stats['max_batch'], committed)
+            self._stats['errors'] += len(errors)
+
+        for op in batch:
+            op.error = errors.get(op.path)
+            if op.done is not None:
+                op.done.set()
+            elif op.error is not None:
+                with self._lock:
+                    if not any(path == op.path for path, _ in self._failed):
+                        self._failed.append((op.path, op.error))
+
+    @staticmethod
+    def _write_file(path: Path, data: bytes, fsync: bool):
+        """임시 파일에 쓴 뒤 교체합니다. (중단되어도 깨진 파일이 남지 않음)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _fsync_dir(dir_path: str):
+        """파일 교체가 디스크에 남도록 디렉토리를 fsync합니다. (지원하지 않는 OS는 생략)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
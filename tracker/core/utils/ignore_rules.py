@@ -0,0 +1,351 @@
+"""
+gitignore 스타일 제외 규칙 엔진
+- glob/부정(!)/디렉토리 전용(/) 패턴 지원
+- 규칙 묶음을 하나의 정규식으로 컴파일
+- 하위 디렉토리의 .gitignore 적용
+- 디렉토리별 판정 결과 캐시
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    gitignore glob 패턴을 정규식 문자열로 변환합니다.
+
+    Args:
+        pattern: 앞뒤 '/'가 제거된 glob 패턴
+
+    Returns:
+        str: 정규식 문자열 (앵커 제외)
+    """
+    result = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                at_segment_start = i == 0 or pattern[i - 1] == '/'
+                if at_segment_start and pattern.startswith('**/', i):
+                    # '**/' : 0개 이상의 디렉토리
+                    result.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if at_segment_start and i + 2 == n:
+                    # 끝의 '**' : 하위 모든 경로
+                    result.append('.*')
+                    i += 2
+                    continue
+                # 그 밖의 '**'는 '*'와 같음
+                result.append('[^/]*')
+                i += 2
+                continue
+            result.append('[^/]*')
+        elif c == '?':
+            result.append('[^/]')
+        elif c == '[':
+            start = i + 1
+            if start < n and pattern[start] in '!^':
+                start += 1
+            if start < n and pattern[start] == ']':
+                start += 1
+            end = pattern.find(']', start)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[0] in '!^':
+                    body = '^' + body[1:]
+                result.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(c))
+        i += 1
+    return ''.join(result)
+
+
+class IgnoreRule:
+    """gitignore 규칙 한 줄"""
+
+    __slots__ = ('pattern', 'negated', 'dir_only', 'regex')
+
+    def __init__(self, pattern: str, negated: bool, dir_only: bool, regex: str):
+        self.pattern = pattern
+        self.negated = negated
+        self.dir_only = dir_only
+        self.regex = regex
+
+    @classmethod
+    def parse(cls, line: str) -> Optional['IgnoreRule']:
+        """
+        .gitignore 한 줄을 규칙으로 변환합니다.
+
+        Args:
+            line: .gitignore 한 줄
+
+        Returns:
+            Optional[IgnoreRule]: 규칙 (빈 줄/주석이거나 잘못된 패턴이면 None)
+        """
+        line = line.rstrip('\n').rstrip('\r')
+        # 이스케이프되지 않은 끝 공백 제거
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        if not line or line.startswith('#'):
+            return None
+
+        negated = False
+        if line.startswith('!'):
+            negated = True
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        # 중간에 '/'가 있으면 .gitignore 위치 기준, 없으면 모든 깊이에서 이름으로 비교
+        anchored = '/' in line
+        body = _translate_glob(line.lstrip('/'))
+        regex = body if anchored else '(?:.*/)?' + body
+        try:
+            # 잘못된 규칙 하나 때문에 규칙 묶음 전체가 컴파일되지 않도록 먼저 확인
+            re.compile(regex)
+        except re.error as e:
+            print(f"⚠️ 잘못된 제외 패턴을 건너뜁니다: {line} ({e})")
+            return None
+        return cls(line, negated, dir_only, regex)
+
+
+class IgnoreRuleSet:
+    """
+    한 디렉토리 기준의 규칙 묶음
+    - 나중 규칙이 우선하도록 역순 alternation 정규식 하나로 컴파일
+    """
+
+    def __init__(self, rules: Sequence[IgnoreRule]):
+        self.rules = list(rules)
+        self._file_matcher = self._compile([r for r in self.rules if not r.dir_only])
+        self._dir_matcher = self._compile(self.rules)
+
+    @staticmethod
+    def _compile(rules: Sequence[IgnoreRule]) -> Optional[Tuple['re.Pattern', Dict[str, bool]]]:
+        """규칙 목록을 하나의 정규식으로 컴파일합니다."""
+        if not rules:
+            return None
+        groups = []
+        negations = {}
+        # alternation은 앞쪽이 먼저 일치하므로 마지막 규칙을 맨 앞에 둠
+        for index, rule in enumerate(reversed(rules)):
+            name = f"r{index}"
+            groups.append(f"(?P<{name}>{rule.regex})")
+            negations[name] = rule.negated
+        return re.compile('^(?:' + '|'.join(groups) + ')$'), negations
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[str]) -> 'IgnoreRuleSet':
+        """
+        패턴 문자열 목록으로 규칙 묶음을 만듭니다.
+
+        Args:
+            lines: gitignore 형식 패턴 목록
+
+        Returns:
+            IgnoreRuleSet: 규칙 묶음
+        """
+        rules = [rule for rule in (IgnoreRule.parse(line) for line in lines) if rule]
+        return cls(rules)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        상대 경로에 대한 판정을 반환합니다.
+
+        Args:
+            rel_path: 규칙 기준 디렉토리로부터의 상대 경로 ('/' 구분)
+            is_dir: 디렉토리 여부
+
+        Returns:
+            Optional[bool]: 제외면 True, 부정 규칙으로 포함이면 False, 일치하는 규칙이 없으면 None
+        """
+        compiled = self._dir_matcher if is_dir else self._file_matcher
+        if compiled is None:
+            return None
+        regex, negations = compiled
+        m = regex.match(rel_path)
+        if not m:
+            return None
+        return not negations[m.lastgroup]
+
+
+class _DirState:
+    """디렉토리별 캐시 항목"""
+
+    __slots__ = ('excluded', 'chain')
+
+    def __init__(self, excluded: bool, chain: Tuple[Tuple[str, IgnoreRuleSet], ...]):
+        self.excluded = excluded
+        # (규칙 기준 디렉토리 상대 경로, 규칙 묶음) - 깊은 디렉토리가 앞
+        self.chain = chain
+
+
+class IgnoreRuleEngine:
+    """
+    설정 규칙과 .gitignore 규칙을 함께 적용하는 판정 엔진
+    - 설정 규칙(EXCLUDE_DIRS, IGNORE_PATTERNS)이 가장 우선
+    - .gitignore는 깊은 디렉토리의 규칙이 우선
+    - 상위 디렉토리가 제외되면 하위는 규칙 평가 없이 제외
+    """
+
+    GITIGNORE_FILENAME = '.gitignore'
+
+    def __init__(self,
+                 root_dir: Optional[Path],
+                 patterns: Sequence[str],
+                 use_gitignore: bool = True):
+        """
+        Args:
+            root_dir: 규칙 기준 루트 디렉토리 (감시 디렉토리)
+            patterns: 설정에서 지정한 gitignore 형식 패턴 목록
+            use_gitignore: 하위 디렉토리의 .gitignore 적용 여부
+        """
+        self.root_dir = root_dir
+        self.global_rules = IgnoreRuleSet.from_lines(patterns)
+        self.use_gitignore = use_gitignore and root_dir is not None
+        self._dir_cache: Dict[Tuple[str, ...], _DirState] = {}
+        self._lock = threading.Lock()
+
+    def _relative_parts(self, path: Path) -> Tuple[Tuple[str, ...], bool]:
+        """
+        루트 기준 경로 구성 요소를 반환합니다.
+
+        Returns:
+            Tuple[Tuple[str, ...], bool]: (경로 구성 요소, 루트 하위 여부)
+        """
+        if self.root_dir is not None:
+            try:
+                return path.relative_to(self.root_dir).parts, True
+            except ValueError:
+                pass
+        parts = path.parts
+        if path.anchor:
+            parts = parts[1:]
+        return parts, False
+
+    def _evaluate(self, parts: Tuple[str, ...], is_dir: bool, chain) -> bool:
+        """경로 구성 요소에 규칙을 적용하여 제외 여부를 판정합니다."""
+        rel_path = '/'.join(parts)
+        verdict = self.global_rules.match(rel_path, is_dir)
+        if verdict is not None:
+            return verdict
+        for base, rule_set in chain:
+            sub_path = '/'.join(parts[len(base):])
+            verdict = rule_set.match(sub_path, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+    def _load_gitignore(self, dir_parts: Tuple[str, ...]) -> Optional[IgnoreRuleSet]:
+        """디렉토리의 .gitignore를 읽어 규칙 묶음을 만듭니다."""
+        gitignore = self.root_dir.joinpath(*dir_parts, self.GITIGNORE_FILENAME)
+        try:
+            with open(gitignore, 'r', encoding='utf-8', errors='replace') as f:
+                rule_set = IgnoreRuleSet.from_lines(f.readlines())
+        except OSError:
+            return None
+        return rule_set if rule_set.rules else None
+
+    def _dir_state(self, dir_parts: Tuple[str, ...], under_root: bool) -> _DirState:
+        """디렉토리 판정 결과를 캐시에서 찾거나 계산합니다."""
+        key = dir_parts if under_root else ('',) + dir_parts
+        state = self._dir_cache.get(key)
+        if state is not None:
+            return state
+
+        if not dir_parts:
+            chain = ()
+            excluded = False
+        else:
+            parent = self._dir_state(dir_parts[:-1], under_root)
+            chain = parent.chain
+            excluded = parent.excluded or self._evaluate(dir_parts, True, chain)
+
+        if not excluded and under_root and self.use_gitignore:
+            rule_set = self._load_gitignore(dir_parts)
+            if rule_set is not None:
+                chain = ((dir_parts, rule_set),) + chain
+
+        state = _DirState(excluded, chain)
+        self._dir_cache[key] = state
+        return state
+
+    def is_dir_ignored(self, dir_path: Path) -> bool:
+        """
+        디렉토리가 제외 대상인지 확인합니다.
+
+        Args:
+            dir_path: 디렉토리 경로
+
+        Returns:
+            bool: 제외 여부
+        """
+        parts, under_root = self._relative_parts(dir_path)
+        return self._dir_state(parts, under_root).excluded
+
+    def is_file_ignored(self, file_path: Path) -> bool:
+        """
+        파일이 제외 대상인지 확인합니다.
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            bool: 제외 여부
+        """
+        parts, under_root = self._relative_parts(file_path)
+        if not parts:
+            return False
+        state = self._dir_state(parts[:-1], under_root)
+        if state.excluded:
+            return True
+        return self._evaluate(parts, False, state.chain)
+
+    def invalidate(self, dir_path: Optional[Path] = None):
+        """
+        디렉토리 판정 캐시를 비웁니다. (.gitignore 변경 시 호출)
+
+        Args:
+            dir_path: 해당 디렉토리와 하위 항목만 비움 (None이면 전체)
+        """
+        with self._lock:
+            if dir_path is None:
+                self._dir_cache.clear()
+                return
+            parts, under_root = self._relative_parts(dir_path)
+            prefix = parts if under_root else ('',) + parts
+            stale = [key for key in self._dir_cache if key[:len(prefix)] == prefix]
+            for key in stale:
+                del self._dir_cache[key]
+
+
+def build_exclude_patterns(exclude_dirs: Sequence[str], ignore_patterns: Sequence[str] = ()) -> List[str]:
+    """
+    EXCLUDE_DIRS와 IGNORE_PATTERNS 설정을 gitignore 형식 패턴 목록으로 변환합니다.
+
+    Args:
+        exclude_dirs: 제외할 디렉토리 이름 목록
+        ignore_patterns: gitignore 형식 추가 패턴 목록
+
+    Returns:
+        List[str]: 패턴 목록
+    """
+    patterns = [f"{name}/" for name in sorted(exclude_dirs)]
+    patterns.extend(ignore_patterns)
+    return patterns
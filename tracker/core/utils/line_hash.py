@@ -0,0 +1,133 @@
+"""
+줄 해시 배열
+- 줄마다 64비트 해시를 계산해 array('Q')로 보관
+- 공통 접두/접미 길이를 배열 슬라이스 비교로 계산
+- 백업 옆에 저장할 수 있도록 바이트 변환 (리틀 엔디언 고정)
+"""
+
+import hashlib
+import sys
+from array import array
+from typing import Sequence
+
+LINE_HASH_DIGEST_SIZE = 8
+# 슬라이스 비교 단위 (처음에는 이만큼씩 비교하고 다른 구간은 이분 탐색)
+_COMPARE_CHUNK = 4096
+
+
+def compute_line_hashes(lines: Sequence[str]) -> array:
+    """
+    줄 목록의 해시 배열을 계산합니다.
+
+    Args:
+        lines: 줄 목록 (splitlines(keepends=True) 결과)
+
+    Returns:
+        array: 줄별 64비트 해시 (array('Q'))
+    """
+    digests = b''.join(
+        hashlib.blake2b(line.encode('utf-8', 'surrogatepass'), digest_size=LINE_HASH_DIGEST_SIZE).digest()
+        for line in lines
+    )
+    hashes = array('Q')
+    hashes.frombytes(digests)
+    return hashes
+
+
+def common_prefix_length(a: array, b: array) -> int:
+    """
+    두 해시 배열의 공통 접두 길이를 반환합니다.
+
+    Args:
+        a: 해시 배열
+        b: 해시 배열
+
+    Returns:
+        int: 앞에서부터 같은 원소 수
+    """
+    limit = min(len(a), len(b))
+    start = 0
+    # 큰 단위로 건너뛴 뒤 처음 다른 구간만 이분 탐색
+    while start < limit:
+        end = min(start + _COMPARE_CHUNK, limit)
+        if a[start:end] != b[start:end]:
+            break
+        start = end
+    else:
+        return limit
+
+    low, high = start, min(start + _COMPARE_CHUNK, limit)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[start:mid] == b[start:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def common_suffix_length(a: array, b: array, limit: int) -> int:
+    """
+    두 해시 배열의 공통 접미 길이를 반환합니다.
+
+    Args:
+        a: 해시 배열
+        b: 해시 배열
+        limit: 최대 길이 (접두와 겹치지 않도록 제한)
+
+    Returns:
+        int: 뒤에서부터 같은 원소 수
+    """
+    len_a = len(a)
+    len_b = len(b)
+    count = 0
+    while count < limit:
+        step = min(_COMPARE_CHUNK, limit - count)
+        if a[len_a - count - step:len_a - count] != b[len_b - count - step:len_b - count]:
+            break
+        count += step
+    else:
+        return limit
+
+    low, high = 0, min(_COMPARE_CHUNK, limit - count)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len_a - count - mid:len_a - count] == b[len_b - count - mid:len_b - count]:
+            low = mid
+        else:
+            high = mid - 1
+    return count + low
+
+
+def line_hashes_to_bytes(hashes: array) -> bytes:
+    """
+    해시 배열을 저장용 바이트로 변환합니다.
+
+    Args:
+        hashes: 해시 배열
+
+    Returns:
+        bytes: 리틀 엔디언 바이트
+    """
+    if sys.byteorder == 'little':
+        return hashes.tobytes()
+    swapped = array('Q', hashes)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def line_hashes_from_bytes(data: bytes) -> array:
+    """
+    저장된 바이트를 해시 배열로 복원합니다.
+
+    Args:
+        data: line_hashes_to_bytes()로 만든 바이트
+
+    Returns:
+        array: 해시 배열
+    """
+    hashes = array('Q')
+    hashes.frombytes(data)
+    if sys.byteorder != 'little':
+        hashes.byteswap()
+    return hashes
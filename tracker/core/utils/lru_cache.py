@@ -0,0 +1,130 @@
+"""
+LRU 캐시
+- 항목 수 또는 바이트 크기 기준 용량 제한
+- 적중/실패/제거 횟수 집계
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    스레드 안전한 LRU 캐시
+    - max_entries, max_bytes 중 설정된 제한을 모두 지키도록 오래된 항목부터 제거
+    - 크기 계산 함수(sizeof)가 없으면 모든 항목의 크기를 1로 간주
+    """
+
+    def __init__(self,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        """
+        Args:
+            max_entries: 최대 항목 수 (None이면 제한 없음)
+            max_bytes: 최대 바이트 크기 (None이면 제한 없음)
+            sizeof: 값의 바이트 크기를 계산하는 함수
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 1)
+
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        값을 조회하고 최근 사용 항목으로 표시합니다.
+
+        Args:
+            key: 키
+            default: 없을 때 반환할 값
+
+        Returns:
+            Any: 캐시된 값 (없으면 default)
+        """
+        with self._lock:
+            if key not in self._items:
+                self._misses += 1
+                return default
+            self._items.move_to_end(key)
+            self._hits += 1
+            return self._items[key]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """
+        값을 저장합니다. 단일 항목이 최대 크기보다 크면 저장하지 않습니다.
+
+        Args:
+            key: 키
+            value: 값
+
+        Returns:
+            bool: 저장 여부
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return False
+
+            self._items[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            while self._items and self._over_capacity():
+                oldest = next(iter(self._items))
+                self._discard(oldest)
+                self._evictions += 1
+            return True
+
+    def pop(self, key: Hashable) -> None:
+        """항목을 제거합니다."""
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def _discard(self, key: Hashable):
+        """잠금을 잡은 상태에서 항목을 제거합니다."""
+        if key in self._items:
+            del self._items[key]
+            self._total_bytes -= self._sizes.pop(key)
+
+    def _over_capacity(self) -> bool:
+        """용량 제한을 넘었는지 확인합니다."""
+        if self.max_entries is not None and len(self._items) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._total_bytes > self.max_bytes
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 항목 수, 사용 바이트, 적중/실패/제거 횟수
+        """
+        with self._lock:
+            return {
+                'entries': len(self._items),
+                'bytes': self._total_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,304 @@
+"""
+패치(hunk) 기반 diff 기록
+- 편집 명령으로 unified hunk 생성
+- hunk 적용/역적용으로 이전/새 내용 복원
+- 저장소 공통 diff 기록 생성 (패치/추가 형식)
+- 저장된 diff 기록을 감싸 필요할 때만 전체 내용을 복원하는 DiffRecord
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from .diff_engine import Opcode, compute_opcodes, group_opcodes
+from .content_hash import compute_content_hash
+
+PATCH_FORMAT_VERSION = 1
+
+# (파일 경로, 내용 해시) -> 내용
+ContentResolver = Callable[[str, str], Optional[str]]
+
+
+def content_digest(content: str) -> str:
+    """
+    백업 저장소와 같은 방식으로 내용 해시를 계산합니다.
+
+    Args:
+        content: 텍스트 내용
+
+    Returns:
+        str: 내용 해시
+    """
+    return compute_content_hash(content.encode('utf-8'))
+
+
+def make_hunks(old_lines: Sequence[str],
+               new_lines: Sequence[str],
+               opcodes: List[Opcode],
+               context: int = 3) -> List[Dict[str, Any]]:
+    """
+    편집 명령으로 unified diff hunk 목록을 만듭니다.
+
+    Args:
+        old_lines: 이전 줄 목록 (줄바꿈 포함)
+        new_lines: 새 줄 목록 (줄바꿈 포함)
+        opcodes: compute_opcodes() 결과
+        context: 문맥 줄 수
+
+    Returns:
+        List[Dict[str, Any]]: [{old_start, old_count, new_start, new_count, lines}]
+        (start는 0부터, lines는 ' '/'-'/'+' 접두가 붙은 줄)
+    """
+    hunks = []
+    for group in group_opcodes(opcodes, context):
+        lines = []
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                lines.extend(' ' + line for line in old_lines[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                lines.extend('-' + line for line in old_lines[i1:i2])
+            if tag in ('replace', 'insert'):
+                lines.extend('+' + line for line in new_lines[j1:j2])
+        first, last = group[0], group[-1]
+        hunks.append({
+            'old_start': first[1],
+            'old_count': last[2] - first[1],
+            'new_start': first[3],
+            'new_count': last[4] - first[3],
+            'lines': lines
+        })
+    return hunks
+
+
+def _apply(base_lines: Sequence[str], hunks: List[Dict[str, Any]], reverse: bool) -> List[str]:
+    """hunk를 정방향(이전 -> 새) 또는 역방향(새 -> 이전)으로 적용합니다."""
+    start_key = 'new_start' if reverse else 'old_start'
+    count_key = 'new_count' if reverse else 'old_count'
+    base_only, result_only = ('+', '-') if reverse else ('-', '+')
+
+    result: List[str] = []
+    position = 0
+    for hunk in hunks:
+        start = hunk[start_key]
+        result.extend(base_lines[position:start])
+        expected = []
+        for line in hunk['lines']:
+            if line[0] == ' ':
+                expected.append(line[1:])
+                result.append(line[1:])
+            elif line[0] == base_only:
+                expected.append(line[1:])
+            elif line[0] == result_only:
+                result.append(line[1:])
+        if list(base_lines[start:start + hunk[count_key]]) != expected:
+            raise ValueError(f"패치가 내용과 맞지 않습니다: hunk@{start}")
+        position = start + hunk[count_key]
+    result.extend(base_lines[position:])
+    return result
+
+
+def apply_hunks(old_content: str, hunks: List[Dict[str, Any]]) -> str:
+    """
+    이전 내용에 hunk를 적용해 새 내용을 만듭니다.
+
+    Args:
+        old_content: 이전 내용
+        hunks: make_hunks() 결과
+
+    Returns:
+        str: 새 내용
+
+    Raises:
+        ValueError: 이전 내용이 hunk와 맞지 않는 경우
+    """
+    return ''.join(_apply(old_content.splitlines(keepends=True), hunks, reverse=False))
+
+
+def revert_hunks(new_content: str, hunks: List[Dict[str, Any]]) -> str:
+    """
+    새 내용에서 hunk를 되돌려 이전 내용을 만듭니다.
+
+    Args:
+        new_content: 새 내용
+        hunks: make_hunks() 결과
+
+    Returns:
+        str: 이전 내용
+
+    Raises:
+        ValueError: 새 내용이 hunk와 맞지 않는 경우
+    """
+    return ''.join(_apply(new_content.splitlines(keepends=True), hunks, reverse=True))
+
+
+def format_patch(hunks: List[Dict[str, Any]], file_path: str = '') -> str:
+    """
+    hunk 목록을 unified diff 텍스트로 만듭니다.
+
+    Args:
+        hunks: make_hunks() 결과
+        file_path: 헤더에 표시할 파일 경로
+
+    Returns:
+        str: unified diff 텍스트
+    """
+    if not hunks:
+        return ''
+    out = [f"--- {file_path}\n", f"+++ {file_path}\n"]
+    for hunk in hunks:
+        out.append(f"@@ -{_format_range(hunk['old_start'], hunk['old_count'])} "
+                   f"+{_format_range(hunk['new_start'], hunk['new_count'])} @@\n")
+        for line in hunk['lines']:
+            out.append(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n')
+    return ''.join(out)
+
+
+def build_patch_record(file_path: Path,
+                       old_content: str,
+                       new_content: str,
+                       opcodes: Optional[List[Opcode]] = None,
+                       context: int = 3) -> Dict[str, Any]:
+    """
+    패치 형식의 diff 기록을 만듭니다. (전체 내용 대신 hunk와 이전/새 내용 해시)
+
+    Args:
+        file_path: 변경된 파일 경로
+        old_content: 이전 파일 내용
+        new_content: 새로운 파일 내용
+        opcodes: 이미 계산한 편집 명령 (없으면 계산)
+        context: hunk 문맥 줄 수
+
+    Returns:
+        Dict[str, Any]: diff 기록
+    """
+    old_lines = old_content.splitlines(keepends=True)
+    new_lines = new_content.splitlines(keepends=True)
+    if opcodes is None:
+        opcodes = compute_opcodes(old_lines, new_lines)
+    return {
+        'file_path': str(file_path),
+        'type': 'patch',
+        'format': PATCH_FORMAT_VERSION,
+        'old_hash': content_digest(old_content),
+        'new_hash': content_digest(new_content),
+        'old_lines': len(old_lines),
+        'new_lines': len(new_lines),
+        'hunks': make_hunks(old_lines, new_lines, opcodes, context),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def build_append_record(file_path: Path, offset: int, appended_content: str) -> Dict[str, Any]:
+    """
+    추가 형식의 diff 기록을 만듭니다. (추가된 내용만)
+
+    Args:
+        file_path: 변경된 파일 경로
+        offset: 추가가 시작된 위치 (원본 파일의 바이트 오프셋)
+        appended_content: 추가된 내용
+
+    Returns:
+        Dict[str, Any]: diff 기록
+    """
+    return {
+        'file_path': str(file_path),
+        'type': 'append',
+        'offset': offset,
+        'appended_content': appended_content,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _format_range(start: int, count: int) -> str:
+    """unified diff 범위 표기를 만듭니다."""
+    if count == 1:
+        return str(start + 1)
+    return f"{start + 1 if count else start},{count}"
+
+
+class DiffRecord:
+    """
+    저장된 diff 기록
+    - 패치 형식: hunk와 이전/새 내용 해시만 저장되어 있으며, 전체 내용은 요청 시 복원
+    - 추가 형식: 추가된 내용과 오프셋
+    - 이전 형식: old_content/new_content 전체
+    """
+
+    def __init__(self, record: Dict[str, Any], resolver: Optional[ContentResolver] = None):
+        """
+        Args:
+            record: 저장소에서 읽은 diff 기록
+            resolver: (파일 경로, 내용 해시)로 백업 내용을 찾는 함수
+        """
+        self.record = record
+        self.resolver = resolver
+        self._old_content: Optional[str] = record.get('old_content')
+        self._new_content: Optional[str] = record.get('new_content')
+
+    @property
+    def kind(self) -> str:
+        """기록 종류 ('patch', 'append', 'full')"""
+        return self.record.get('type', 'full')
+
+    @property
+    def file_path(self) -> str:
+        return self.record['file_path']
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        return self.record.get('timestamp')
+
+    @property
+    def hunks(self) -> List[Dict[str, Any]]:
+        """hunk 목록 (이전 형식은 전체 내용으로 계산)"""
+        if self.kind == 'patch':
+            return self.record['hunks']
+        if self.kind == 'append':
+            lines = self.record['appended_content'].splitlines(keepends=True)
+            return [{'old_start': 0, 'old_count': 0, 'new_start': 0, 'new_count': len(lines),
+                     'lines': ['+' + line for line in lines]}] if lines else []
+        old_lines = (self._old_content or '').splitlines(keepends=True)
+        new_lines = (self._new_content or '').splitlines(keepends=True)
+        return make_hunks(old_lines, new_lines, compute_opcodes(old_lines, new_lines))
+
+    def patch_text(self) -> str:
+        """
+        unified diff 텍스트를 반환합니다. (전체 내용을 복원하지 않음)
+
+        Returns:
+            str: unified diff 텍스트
+        """
+        return format_patch(self.hunks, self.file_path)
+
+    @property
+    def old_content(self) -> Optional[str]:
+        """이전 내용 (필요할 때 백업 저장소 또는 새 내용에서 복원)"""
+        if self._old_content is None and self.kind == 'patch':
+            self._old_content = self._resolve(self.record.get('old_hash'))
+            if self._old_content is None:
+                new_content = self._resolve(self.record.get('new_hash'))
+                if new_content is not None:
+                    self._new_content = new_content
+                    self._old_content = revert_hunks(new_content, self.hunks)
+        return self._old_content
+
+    @property
+    def new_content(self) -> Optional[str]:
+        """새 내용 (필요할 때 백업 저장소 또는 이전 내용에서 복원)"""
+        if self._new_content is None and self.kind == 'patch':
+            self._new_content = self._resolve(self.record.get('new_hash'))
+            if self._new_content is None:
+                old_content = self._resolve(self.record.get('old_hash'))
+                if old_content is not None:
+                    self._old_content = old_content
+                    self._new_content = apply_hunks(old_content, self.hunks)
+        return self._new_content
+
+    def _resolve(self, content_hash: Optional[str]) -> Optional[str]:
+        """해시로 백업 내용을 찾고, 해시가 맞는지 확인합니다."""
+        if not content_hash or self.resolver is None:
+            return None
+        content = self.resolver(self.file_path, content_hash)
+        if content is None or content_digest(content) != content_hash:
+            return None
+        return content
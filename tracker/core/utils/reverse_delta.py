@@ -0,0 +1,94 @@
+"""
+역방향 delta 인코딩
+- 새 버전을 기준으로 이전 버전을 복원하는 줄 단위 delta 생성
+- delta 적용
+"""
+
+import json
+import struct
+from typing import List
+from .diff_engine import compute_opcodes
+
+DELTA_MAGIC = b'RDLT1'
+
+
+def _common_affix(base: List[bytes], target: List[bytes]):
+    """공통 접두/접미 줄 수를 반환합니다."""
+    limit = min(len(base), len(target))
+    prefix = 0
+    while prefix < limit and base[prefix] == target[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and base[-1 - suffix] == target[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def encode_delta(target: bytes, base: bytes) -> bytes:
+    """
+    base에 적용하면 target이 되는 delta를 생성합니다.
+
+    Args:
+        target: 복원할 내용 (이전 버전)
+        base: 기준 내용 (새 버전)
+
+    Returns:
+        bytes: delta (MAGIC + 헤더 길이 + JSON 명령 목록 + 삽입 데이터)
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    prefix, suffix = _common_affix(base_lines, target_lines)
+
+    ops = []
+    payload = []
+    if prefix:
+        ops.append(['c', 0, prefix])
+
+    base_mid = base_lines[prefix:len(base_lines) - suffix]
+    target_mid = target_lines[prefix:len(target_lines) - suffix]
+    for tag, i1, i2, j1, j2 in compute_opcodes(base_mid, target_mid, 'histogram'):
+        if tag == 'equal':
+            ops.append(['c', prefix + i1, prefix + i2])
+        elif j2 > j1:
+            chunk = b''.join(target_mid[j1:j2])
+            ops.append(['i', len(chunk)])
+            payload.append(chunk)
+
+    if suffix:
+        ops.append(['c', len(base_lines) - suffix, len(base_lines)])
+
+    header = json.dumps(ops, separators=(',', ':')).encode('utf-8')
+    return DELTA_MAGIC + struct.pack('>I', len(header)) + header + b''.join(payload)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    base에 delta를 적용하여 이전 버전을 복원합니다.
+
+    Args:
+        base: 기준 내용 (새 버전)
+        delta: encode_delta()로 만든 delta
+
+    Returns:
+        bytes: 복원된 내용
+
+    Raises:
+        ValueError: delta 형식이 올바르지 않은 경우
+    """
+    if not delta.startswith(DELTA_MAGIC):
+        raise ValueError("올바른 delta 형식이 아닙니다.")
+    offset = len(DELTA_MAGIC)
+    (header_len,) = struct.unpack('>I', delta[offset:offset + 4])
+    offset += 4
+    ops = json.loads(delta[offset:offset + header_len])
+    offset += header_len
+
+    base_lines = base.splitlines(keepends=True)
+    result = []
+    for op in ops:
+        if op[0] == 'c':
+            result.extend(base_lines[op[1]:op[2]])
+        else:
+            result.append(delta[offset:offset + op[1]])
+            offset += op[1]
+    return b''.join(result)
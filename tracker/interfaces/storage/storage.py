@@ -7,7 +7,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable
 from datetime import datetime
 
 class StorageInterface(ABC):
@@ -53,7 +53,7 @@ class StorageInterface(ABC):
         pass
     
     @abstractmethod
-    def get_activities(self, date: datetime) -> List[Dict[str, Any]]:
+    def get_activities(self, date: datetime) -> Iterable[Dict[str, Any]]:
         """
         특정 날짜의 활동 로그를 반환합니다.
         
@@ -61,7 +61,7 @@ class StorageInterface(ABC):
             date: 날짜
             
         Returns:
-            List[Dict[str, Any]]: 활동 로그 목록
+            Iterable[Dict[str, Any]]: 활동 로그 (오래된 순서)
         """
         pass
     